@@ -7,9 +7,146 @@ Course: ITAI 2376 - Boomer Health Summary Project
 """
 
 import re
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 import json
 
+from knowledge_snapshot import load_tables
+from records import Extraction, Medication, ScopedFinding, TestResult, text_preview, to_plain
+from renderer import SummaryRenderer
+from text_normalizer import NormalizedText, normalize_text
+
+# Guided-form field names (lowercased) -> extraction schema category
+FORM_FIELD_ALIASES = {
+    'diagnosis': 'diagnoses', 'diagnoses': 'diagnoses',
+    'medication': 'medications', 'medications': 'medications',
+    'instruction': 'instructions', 'instructions': 'instructions',
+    'follow-up': 'followups', 'follow up': 'followups', 'follow_up': 'followups',
+    'followup': 'followups', 'followups': 'followups',
+    'symptom': 'symptoms', 'symptoms': 'symptoms',
+    'test results': 'test_results', 'test_results': 'test_results',
+    'tests': 'test_results', 'vitals': 'test_results'
+}
+
+# Separators between entries typed into one form field
+FORM_ENTRY_SPLIT = re.compile(r'[\n;,]+')
+FORM_SENTENCE_SPLIT = re.compile(r'[.!?\n]+')
+# Common medical abbreviations, in the order they are reported
+MEDICAL_ABBREVIATIONS = [
+    'BP', 'HR', 'RR', 'O2', 'SpO2', 'CHF', 'COPD', 'CAD', 'MI',
+    'CVA', 'TIA', 'DM', 'HTN', 'CKD', 'GERD', 'AFIB', 'UTI',
+    'SOB', 'DOE', 'CP', 'HA', 'N/V', 'BM', 'PRN', 'QD', 'BID', 'TID'
+]
+# Each abbreviation as a whole word
+ABBREVIATION_PATTERN = re.compile(r'\b(' + '|'.join(re.escape(a) for a in MEDICAL_ABBREVIATIONS) + r')\b')
+
+# Every extraction pattern keeps matching linear in the document length: a match
+# may only start at the first character of a word or digit run (\b, (?<!\d)),
+# so each run is scanned and backtracked over once, never once per character
+DOSAGE_PATTERN = re.compile(r'(?<!\d)(\d+\s*mg|\d+\s*mcg|\d+\s*units?)', re.IGNORECASE)
+# "lisinopril: 20mg" - a word and the dosage right after it, matched against the lowercased cleaned view
+DOSE_MENTION_PATTERN = re.compile(r'\b([a-z]+)[:\s]+(\d+\s*mg|\d+\s*mcg|\d+\s*units?)')
+
+# Test-result patterns, matched against the lowercased cleaned view
+BP_PATTERN = re.compile(r'\b(?:bp|blood pressure)[:\s]+(\d{2,3}/\d{2,3})')
+A1C_PATTERN = re.compile(r'\b(?:a1c|hba1c)[:\s]+(\d+\.?\d*)\s*%?')
+WEIGHT_PATTERN = re.compile(r'\b(?:weight|wt)[:\s]+(\d+)\s*(?:lbs?|pounds?)')
+
+# Cues that change what a diagnosis/symptom mention means: cue -> (context, direction).
+# "before" cues scope the findings after them ("denies chest pain"), "after" cues the
+# ones just before them ("chest pain resolved"); "either" cues go back when a finding
+# is waiting in the clause, else forward ("resolved pneumonia").
+SCOPE_CUES = {
+    'no': ('negated', 'before'), 'denies': ('negated', 'before'), 'denied': ('negated', 'either'),
+    'without': ('negated', 'before'), 'negative for': ('negated', 'before'), 'free of': ('negated', 'before'),
+    'absence of': ('negated', 'before'), 'no evidence of': ('negated', 'before'),
+    'no signs of': ('negated', 'before'), 'no history of': ('negated', 'before'),
+    'ruled out': ('negated', 'either'), 'absent': ('negated', 'after'),
+    'resolved': ('resolved', 'either'), 'has resolved': ('resolved', 'after'), 'subsided': ('resolved', 'after'),
+    'no longer': ('resolved', 'before'), 'recovered from': ('resolved', 'before'),
+    'resolution of': ('resolved', 'before'),
+    'family history of': ('family_history', 'before'), 'family history': ('family_history', 'before'),
+    'mother': ('family_history', 'before'), 'father': ('family_history', 'before'),
+    'brother': ('family_history', 'before'), 'sister': ('family_history', 'before'),
+    'grandmother': ('family_history', 'before'), 'grandfather': ('family_history', 'before'),
+    'if': ('conditional', 'before'), 'watch for': ('conditional', 'before'), 'in case of': ('conditional', 'before'),
+    'seek care': ('conditional', 'before'), 'seek immediate care': ('conditional', 'before'),
+    'seek emergency care': ('conditional', 'before'), 'seek medical attention': ('conditional', 'before'),
+    'call 911': ('conditional', 'before'), 'warning signs': ('conditional', 'before'),
+    'emergency signs': ('conditional', 'before'),
+}
+# Contexts that describe someone else or a "what if", not the patient's current state
+OTHER_CONTEXTS = ('family_history', 'conditional')
+# Words that end a cue's scope inside a sentence ("no fever but chest pain")
+SCOPE_TERMINATORS = ('but', 'however', 'although', 'though', 'except', 'aside from')
+# Sentence ends: no cue reaches across one. Neither does a blank line or a new list
+# item - unless the cue's clause ended in ':', then it covers the list below up to a
+# blank line ("CALL YOUR DOCTOR IF YOU EXPERIENCE:" / "- Chest pain" / "- Dizziness").
+# Other line breaks are wrapped sentences and do not end a scope.
+SCOPE_BOUNDARIES = '.!?;'
+BLANK_LINE = re.compile(r'\n[ \t]*\n')
+LIST_ITEM = re.compile(r'\n[ \t]*(?:[-•*]|\d+[.)])')
+# Words allowed between a cue and its finding, and between findings in one list
+SCOPE_WINDOW = 5
+
+
+def _build_knowledge() -> Dict:
+    """Build Agent 1's keyword and pattern tables from literals (cached by knowledge_snapshot)"""
+    tables = {}
+    
+    # Common diagnoses that appear in discharge papers
+    tables['diagnosis_keywords'] = [
+        'hypertension', 'high blood pressure', 'diabetes', 'type 2 diabetes',
+        'hyperlipidemia', 'high cholesterol', 'copd', 'asthma', 'arthritis',
+        'depression', 'anxiety', 'heart disease', 'coronary artery disease', 'cad',
+        'chronic kidney disease', 'ckd', 'obesity', 'anemia', 'pneumonia',
+        'congestive heart failure', 'chf', 'atrial fibrillation', 'afib',
+        'stroke', 'heart attack', 'myocardial infarction', 'bronchitis',
+        'infection', 'fracture', 'osteoporosis', 'gerd', 'reflux'
+    ]
+
+    # Medication name patterns
+    tables['medication_patterns'] = [
+        # Common medications by name
+        r'\b(metformin|lisinopril|atorvastatin|amlodipine|metoprolol)\b',
+        r'\b(omeprazole|levothyroxine|albuterol|gabapentin|losartan)\b',
+        r'\b(hydrochlorothiazide|sertraline|ibuprofen|aspirin|warfarin)\b',
+        r'\b(furosemide|lasix|prednisone|insulin|lantus|humalog)\b',
+        # Pattern: "drugname dosage" (e.g., "Lisinopril 10mg")
+        r'\b([A-Z][a-z]+)\s+\d+\s*mg\b',
+        # Pattern: "drugname tablet/capsule"
+        r'\b([A-Z][a-z]+)\s+(tablet|capsule|pill)\b',
+    ]
+
+    # Symptom keywords
+    tables['symptom_keywords'] = [
+        'pain', 'chest pain', 'back pain', 'abdominal pain',
+        'fever', 'cough', 'fatigue', 'weakness', 'tired',
+        'shortness of breath', 'sob', 'difficulty breathing',
+        'headache', 'dizziness', 'nausea', 'vomiting',
+        'swelling', 'edema', 'rash', 'confusion', 'bleeding',
+        'numbness', 'tingling', 'constipation', 'diarrhea'
+    ]
+
+    # Instruction indicators (what patient should DO)
+    tables['instruction_indicators'] = [
+        'take', 'continue', 'stop', 'discontinue', 'increase', 'decrease',
+        'monitor', 'check', 'measure', 'weigh', 'record',
+        'follow up', 'return', 'call', 'contact',
+        'avoid', 'limit', 'reduce', 'restrict',
+        'exercise', 'walk', 'diet', 'eat', 'drink', 'rest', 'elevate'
+    ]
+
+    # Follow-up and appointment indicators
+    tables['followup_indicators'] = [
+        'follow up', 'follow-up', 'return', 'appointment', 'see doctor',
+        'see your doctor', 'visit', 'schedule', 'recheck', 'monitor',
+        'call if', 'contact if', 'seek care', 'emergency', 'urgent',
+        'in 1 week', 'in 2 weeks', 'in one month', 'next week'
+    ]
+    
+    return tables
+
+
 class MedicalExtractor:
     """
     Agent 1: Extracts diagnoses, medications, symptoms, instructions, 
@@ -20,59 +157,52 @@ class MedicalExtractor:
     
     def __init__(self):
         """Initialize the extractor with medical keyword patterns"""
-        
-        # Common diagnoses that appear in discharge papers
-        self.diagnosis_keywords = [
-            'hypertension', 'high blood pressure', 'diabetes', 'type 2 diabetes',
-            'hyperlipidemia', 'high cholesterol', 'copd', 'asthma', 'arthritis',
-            'depression', 'anxiety', 'heart disease', 'coronary artery disease', 'cad',
-            'chronic kidney disease', 'ckd', 'obesity', 'anemia', 'pneumonia',
-            'congestive heart failure', 'chf', 'atrial fibrillation', 'afib',
-            'stroke', 'heart attack', 'myocardial infarction', 'bronchitis',
-            'infection', 'fracture', 'osteoporosis', 'gerd', 'reflux'
-        ]
-        
-        # Medication name patterns
-        self.medication_patterns = [
-            # Common medications by name
-            r'\b(metformin|lisinopril|atorvastatin|amlodipine|metoprolol)\b',
-            r'\b(omeprazole|levothyroxine|albuterol|gabapentin|losartan)\b',
-            r'\b(hydrochlorothiazide|sertraline|ibuprofen|aspirin|warfarin)\b',
-            r'\b(furosemide|lasix|prednisone|insulin|lantus|humalog)\b',
-            # Pattern: "drugname dosage" (e.g., "Lisinopril 10mg")
-            r'\b([A-Z][a-z]+)\s+\d+\s*mg\b',
-            # Pattern: "drugname tablet/capsule"
-            r'\b([A-Z][a-z]+)\s+(tablet|capsule|pill)\b',
-        ]
-        
-        # Symptom keywords
-        self.symptom_keywords = [
-            'pain', 'chest pain', 'back pain', 'abdominal pain',
-            'fever', 'cough', 'fatigue', 'weakness', 'tired',
-            'shortness of breath', 'sob', 'difficulty breathing',
-            'headache', 'dizziness', 'nausea', 'vomiting',
-            'swelling', 'edema', 'rash', 'confusion', 'bleeding',
-            'numbness', 'tingling', 'constipation', 'diarrhea'
-        ]
-        
-        # Instruction indicators (what patient should DO)
-        self.instruction_indicators = [
-            'take', 'continue', 'stop', 'discontinue', 'increase', 'decrease',
-            'monitor', 'check', 'measure', 'weigh', 'record',
-            'follow up', 'return', 'call', 'contact',
-            'avoid', 'limit', 'reduce', 'restrict',
-            'exercise', 'walk', 'diet', 'eat', 'drink', 'rest', 'elevate'
-        ]
-        
-        # Follow-up and appointment indicators
-        self.followup_indicators = [
-            'follow up', 'follow-up', 'return', 'appointment', 'see doctor',
-            'see your doctor', 'visit', 'schedule', 'recheck', 'monitor',
-            'call if', 'contact if', 'seek care', 'emergency', 'urgent',
-            'in 1 week', 'in 2 weeks', 'in one month', 'next week'
-        ]
-    
-    def extract_all(self, document_text: str, input_method: str = "unknown") -> Dict:
+        tables = load_tables('agent1', __file__, _build_knowledge)
+        self.diagnosis_keywords = tables['diagnosis_keywords']
+        self.medication_patterns = tables['medication_patterns']
+        self.symptom_keywords = tables['symptom_keywords']
+        self.instruction_indicators = tables['instruction_indicators']
+        self.followup_indicators = tables['followup_indicators']
+        # The name patterns run on lowercased text; IGNORECASE keeps "[A-Z][a-z]+" matching there
+        self._medication_regexes = [re.compile(pattern, re.IGNORECASE) for pattern in self.medication_patterns]
+        self._build_finding_scanner()
+    
+    def _build_finding_scanner(self):
+        """
+        One alternation over every diagnosis/symptom keyword, scope cue and
+        boundary, so extract_findings() reads the text once. Matched text is
+        classified by dictionary lookup, not by group.
+        """
+        terms = {}
+        for category, keywords in (('diagnosis', self.diagnosis_keywords), ('symptom', self.symptom_keywords)):
+            for keyword in keywords:
+                terms.setdefault(keyword, ('finding', []))[1].append(category)
+        words = [(keyword, re.escape(keyword)) for keyword in terms]
+        for cue, (context, direction) in SCOPE_CUES.items():
+            terms[cue] = ('cue', context, direction)
+            words.append((cue, re.escape(cue) + r'\b'))
+        for word in SCOPE_TERMINATORS:
+            terms[word] = ('end',)
+            words.append((word, re.escape(word) + r'\b'))
+        for char in SCOPE_BOUNDARIES:
+            terms[char] = ('end',)
+        terms[':'] = ('colon',)
+        # Longest first, so "chest pain" wins over "pain" and "no longer" over "no".
+        # Every word starts at \b: mid-word positions fail on one check instead of
+        # trying each alternative, which keeps the pass fast on long documents.
+        words.sort(key=lambda item: -len(item[0]))
+        self._finding_pattern = re.compile(
+            r'\b(?:' + '|'.join(pattern for _, pattern in words) + r')'
+            + '|[' + re.escape(SCOPE_BOUNDARIES) + ':]|' + BLANK_LINE.pattern + '|' + LIST_ITEM.pattern
+        )
+        self._finding_terms = terms
+        # Keywords inside another keyword ("pain" in "chest pain") share its mention
+        self._contained = {
+            keyword: [other for other in terms if terms[other][0] == 'finding' and other != keyword and other in keyword]
+            for keyword, term in terms.items() if term[0] == 'finding'
+        }
+    
+    def extract_all(self, document_text: str, input_method: str = "unknown") -> Extraction:
         """
         Main extraction method - extracts all medical information
         
@@ -81,84 +211,284 @@ class MedicalExtractor:
             input_method: "photo_ocr", "free_text", or "guided_form"
             
         Returns:
-            Dictionary with extracted information ready for Agent 2
+            Extraction record ready for Agent 2
         """
         
-        # Clean the document
-        text_lower = document_text.lower()
+        # Clean the document once (OCR breaks, ligatures, quotes, pipes); every extractor reads this view
+        document = normalize_text(document_text)
+        text_lower = document.lower
         
         # Extract each category
-        extracted_data = {
-            'input_method': input_method,
-            'diagnoses': self.extract_diagnoses(text_lower),
-            'medications': self.extract_medications(document_text),
-            'symptoms': self.extract_symptoms(text_lower),
-            'instructions': self.extract_instructions(text_lower),
-            'followups': self.extract_followups(text_lower),
-            'test_results': self.extract_test_results(document_text),
-            'flagged_terms': self.flag_medical_abbreviations(document_text),
-            'raw_text_preview': document_text[:200] + "..." if len(document_text) > 200 else document_text
-        }
+        diagnoses, symptoms, scoped = self.extract_findings(text_lower)
+        extracted_data = Extraction(
+            input_method=input_method,
+            diagnoses=diagnoses,
+            medications=self.extract_medications(document),
+            symptoms=symptoms,
+            instructions=self.extract_instructions(text_lower),
+            followups=self.extract_followups(text_lower),
+            test_results=self.extract_test_results(document),
+            flagged_terms=self.flag_medical_abbreviations(document.text),
+            raw_text_preview=text_preview(document_text),
+            scoped_findings=scoped or None
+        )
         
         # Add quality score
-        extracted_data['extraction_quality'] = self.assess_extraction_quality(extracted_data)
+        extracted_data.extraction_quality = self.assess_extraction_quality(extracted_data)
         
         return extracted_data
     
-    def extract_diagnoses(self, text: str) -> List[str]:
-        """Extract diagnoses from document"""
+    def extract_batch(self, documents: Iterable[str], input_method: str = "unknown") -> Iterator[Extraction]:
+        """
+        Extract many documents lazily, one result per input document
+        
+        Args:
+            documents: Any iterable of document texts (list, generator, DataFrame column)
+            input_method: Applied to every document
+            
+        Returns:
+            Generator of extract_all() results, in input order
+        """
+        for document_text in documents:
+            yield self.extract_all(document_text or "", input_method)
+    
+    def extract_structured(self, form_fields: Dict) -> Extraction:
+        """
+        Fast path for guided-form input: map each field straight into the
+        extraction schema and run only the normalizer that field needs,
+        instead of scanning one flattened document with every pattern.
+        
+        Args:
+            form_fields: e.g. {"Diagnosis": "...", "Medications": "...",
+                         "Instructions": "...", "Follow-up": "..."}
+                         (values may be strings or lists of strings)
+            
+        Returns:
+            Extraction in the same shape as extract_all()
+        """
+        fields = {category: [] for category in dict.fromkeys(FORM_FIELD_ALIASES.values())}
+        for name, value in form_fields.items():
+            category = FORM_FIELD_ALIASES.get(name.strip().lower())
+            if category is None or not value:
+                continue
+            fields[category].extend([value] if isinstance(value, str) else value)
+        
+        joined_text = "\n".join(entry for entries in fields.values() for entry in entries)
+        
+        extracted_data = Extraction(
+            input_method='guided_form',
+            diagnoses=self.structure_diagnoses(fields['diagnoses']),
+            medications=self.structure_medications(fields['medications']),
+            symptoms=self.extract_symptoms("\n".join(fields['symptoms']).lower()),
+            instructions=self.structure_sentences(fields['instructions']),
+            followups=self.structure_sentences(fields['followups']),
+            test_results=self.extract_test_results("\n".join(fields['test_results'])),
+            flagged_terms=self.flag_medical_abbreviations(joined_text),
+            raw_text_preview=text_preview(joined_text)
+        )
+        
+        extracted_data.extraction_quality = self.assess_extraction_quality(extracted_data)
+        
+        return extracted_data
+    
+    def structure_diagnoses(self, entries: List[str]) -> List[str]:
+        """Diagnosis field: exact keyword match, else keyword scan, else keep as typed"""
         diagnoses = []
         
-        for diagnosis in self.diagnosis_keywords:
-            if diagnosis in text:
-                # Capitalize for readability
-                diagnoses.append(diagnosis.title())
+        for entry in entries:
+            for item in FORM_ENTRY_SPLIT.split(entry):
+                item = item.strip(' -•*\t')
+                if not item:
+                    continue
+                if item.lower() in self.diagnosis_keywords:
+                    diagnoses.append(item.lower().title())
+                else:
+                    found = self.extract_diagnoses(item.lower())
+                    diagnoses.extend(found or [item.title()])
         
-        # Remove duplicates while preserving order
         return list(dict.fromkeys(diagnoses))
     
-    def extract_medications(self, text: str) -> List[Dict[str, str]]:
+    def structure_medications(self, entries: List[str]) -> List[Medication]:
+        """Medications field: one medication per entry, dosage parsed from the entry"""
+        medications = []
+        seen = set()
+        
+        for entry in entries:
+            for item in re.split(r'[\n;]+', entry):
+                item = item.strip(' -•*\t')
+                if not item:
+                    continue
+                dosage_match = DOSAGE_PATTERN.search(item)
+                name = item[:dosage_match.start()] if dosage_match else item.split(' - ')[0]
+                name = name.strip(' -:,').title()
+                if len(name) <= 2 or name.lower() in seen:
+                    continue
+                seen.add(name.lower())
+                medications.append(Medication(
+                    name,
+                    dosage_match.group(1) if dosage_match else "See prescription"
+                ))
+        
+        return medications
+    
+    def structure_sentences(self, entries: List[str]) -> List[str]:
+        """Instruction/follow-up fields: every typed sentence is kept, capitalized"""
+        sentences = []
+        
+        for entry in entries:
+            for sentence in FORM_SENTENCE_SPLIT.split(entry):
+                sentence = sentence.strip(' -•*\t')
+                if sentence:
+                    sentences.append(sentence[0].upper() + sentence[1:])
+        
+        return list(dict.fromkeys(sentences))
+    
+    def extract_diagnoses(self, text: str) -> List[str]:
+        """Extract diagnoses from document (current ones - see extract_findings)"""
+        return self.extract_findings(text)[0]
+    
+    def extract_findings(self, text: str):
+        """
+        Diagnoses and symptoms in one pass, with negation, resolution,
+        family-history and "call if" cues scoped to their sentence
+        
+        A cue covers the findings within SCOPE_WINDOW words of it (and of
+        each other, so "denies fever, chills or cough" covers all three)
+        up to a sentence end or a word like "but"; a cue heading a list
+        ("Call your doctor if:") covers the list. When a finding is
+        mentioned more than once, its last mention about the patient's own
+        state decides.
+        
+        Args:
+            text: Lowercased document text
+            
+        Returns:
+            (diagnoses, symptoms, scoped): current findings in keyword order,
+            and ScopedFinding records for the rest
+        """
+        terms = self._finding_terms
+        mentions = []      # [keyword, start, end, context, cue]
+        scope = None       # open "before" cue: [context, cue, end of last covered word, covers a list]
+        pending = []       # unscoped mentions in this clause, for "after" cues
+        
+        for match in self._finding_pattern.finditer(text):
+            start, end = match.span()
+            term = terms.get(match.group())
+            if term is None:
+                # A blank line, or a line starting a list item
+                term = ('line',) if match.group().strip() else ('end',)
+            kind = term[0]
+            
+            if kind == 'end' or (kind == 'line' and not (scope and scope[3])):
+                scope = None
+                pending = []
+            elif kind == 'line':
+                pending = []
+            elif kind == 'colon':
+                if scope is not None and not scope[3]:
+                    # A cue just before the colon heads a list; one further back has lapsed
+                    if _words_between(text, scope[2], start) <= SCOPE_WINDOW:
+                        scope[3] = True
+                    else:
+                        scope = None
+            elif kind == 'finding':
+                mention = [match.group(), start, end, 'affirmed', None]
+                if scope is not None and (scope[3] or _words_between(text, scope[2], start) <= SCOPE_WINDOW):
+                    mention[3], mention[4] = scope[0], scope[1]
+                    scope[2] = end
+                else:
+                    scope = None
+                    pending.append(mention)
+                mentions.append(mention)
+            else:
+                _, context, direction = term
+                cue = match.group()
+                if pending and _words_between(text, pending[-1][2], start) > SCOPE_WINDOW:
+                    # Out of reach of this cue and of any later one, so never counted again
+                    pending = []
+                if direction != 'before' and pending:
+                    # Walk back through the list of findings just before the cue
+                    edge = start
+                    for mention in reversed(pending):
+                        if _words_between(text, mention[2], edge) > SCOPE_WINDOW:
+                            break
+                        mention[3], mention[4] = context, cue
+                        edge = mention[1]
+                    pending = []
+                elif direction != 'after':
+                    scope = [context, cue, end, False]
+                    pending = []
+        
+        # Final context per keyword: the last mention about the patient's own state,
+        # else the first family-history / conditional one
+        status = {}
+        other = {}
+        for keyword, _, _, context, cue in mentions:
+            for name in [keyword] + self._contained[keyword]:
+                if context in OTHER_CONTEXTS:
+                    other.setdefault(name, (context, cue))
+                else:
+                    status[name] = (context, cue)
+        for name, value in other.items():
+            status.setdefault(name, value)
+        
+        results = []
+        scoped = []
+        for category, keywords in (('diagnosis', self.diagnosis_keywords), ('symptom', self.symptom_keywords)):
+            found = []
+            for keyword in keywords:
+                if keyword not in status:
+                    continue
+                context, cue = status[keyword]
+                if context == 'affirmed':
+                    found.append(keyword.title())
+                else:
+                    scoped.append(ScopedFinding(keyword.title(), category, context, cue))
+            results.append(list(dict.fromkeys(found)))
+        
+        return results[0], results[1], list({(f.finding, f.category): f for f in scoped}.values())
+    
+    def extract_medications(self, text) -> List[Medication]:
         """
         Extract medications with dosages
-        Returns list of dicts with 'name' and 'dosage' keys
+        Returns list of Medication records (name, dosage, span in the original text)
+        
+        Args:
+            text: Document text, or the NormalizedText extract_all() already built
         """
+        document = text if isinstance(text, NormalizedText) else normalize_text(text)
+        text_lower = document.lower
         medications = []
-        text_lower = text.lower()
+        
+        # First dosage written after each word, in one pass (not one search per mention)
+        dosages = {}
+        for match in DOSE_MENTION_PATTERN.finditer(text_lower):
+            dosages.setdefault(match.group(1), match.group(2))
         
         # Find medication names and dosages
-        for pattern in self.medication_patterns:
-            matches = re.findall(pattern, text_lower, re.IGNORECASE)
-            
-            for match in matches:
-                if isinstance(match, tuple):
-                    med_name = match[0] if match[0] else match
-                else:
-                    med_name = match
-                
-                # Try to find dosage near this medication
-                dosage = self.find_dosage_for_medication(med_name, text)
-                
-                medications.append({
-                    'name': med_name.strip().title(),
-                    'dosage': dosage
-                })
+        for regex in self._medication_regexes:
+            for match in regex.finditer(text_lower):
+                med_name = match.group(1)
+                dosage = dosages.get(med_name, "See prescription")
+                medications.append(Medication(med_name.strip().title(), dosage,
+                                              document.span(*match.span(1))))
         
         # Remove duplicates
         seen = set()
         unique_meds = []
         for med in medications:
-            med_key = med['name'].lower()
-            if med_key not in seen and len(med['name']) > 2:
+            med_key = med.name.lower()
+            if med_key not in seen and len(med.name) > 2:
                 seen.add(med_key)
                 unique_meds.append(med)
         
         return unique_meds
     
     def find_dosage_for_medication(self, med_name: str, text: str) -> str:
-        """Try to find dosage information for a medication"""
-        # Look for dosage pattern near the medication name
-        pattern = rf'{med_name}[:\s]+(\d+\s*mg|\d+\s*mcg|\d+\s*units?)'
-        match = re.search(pattern, text, re.IGNORECASE)
+        """Try to find dosage information for a medication (text: lowercased cleaned view)"""
+        # Look for dosage pattern near the medication name (escaped - names can come from OCR text)
+        pattern = rf'\b{re.escape(med_name.lower())}[:\s]+(\d+\s*mg|\d+\s*mcg|\d+\s*units?)'
+        match = re.search(pattern, text)
         
         if match:
             return match.group(1)
@@ -166,14 +496,8 @@ class MedicalExtractor:
         return "See prescription"
     
     def extract_symptoms(self, text: str) -> List[str]:
-        """Extract symptoms patient experienced"""
-        symptoms = []
-        
-        for symptom in self.symptom_keywords:
-            if symptom in text:
-                symptoms.append(symptom.title())
-        
-        return list(dict.fromkeys(symptoms))
+        """Extract symptoms patient experienced (current ones - see extract_findings)"""
+        return self.extract_findings(text)[1]
     
     def extract_instructions(self, text: str) -> List[str]:
         """Extract patient instructions from document"""
@@ -188,8 +512,9 @@ class MedicalExtractor:
             if len(sentence) < 10:  # Skip very short fragments
                 continue
                 
+            sentence_lower = sentence.lower()
             for indicator in self.instruction_indicators:
-                if indicator in sentence.lower():
+                if indicator in sentence_lower:
                     # Capitalize first letter
                     cleaned = sentence[0].upper() + sentence[1:] if sentence else sentence
                     instructions.append(cleaned)
@@ -210,37 +535,37 @@ class MedicalExtractor:
             if len(sentence) < 10:
                 continue
                 
+            sentence_lower = sentence.lower()
             for indicator in self.followup_indicators:
-                if indicator in sentence.lower():
+                if indicator in sentence_lower:
                     cleaned = sentence[0].upper() + sentence[1:] if sentence else sentence
                     followups.append(cleaned)
                     break
         
         return list(dict.fromkeys(followups))
     
-    def extract_test_results(self, text: str) -> List[Dict[str, str]]:
+    def extract_test_results(self, text) -> List[TestResult]:
         """
         Extract test results (blood pressure, lab values, etc.)
+        
+        Args:
+            text: Document text, or the NormalizedText extract_all() already built
         """
+        document = text if isinstance(text, NormalizedText) else normalize_text(text)
+        text_lower = document.lower
         results = []
         
         # Blood pressure pattern (e.g., "BP: 140/90" or "Blood pressure 130/85")
-        bp_pattern = r'(?:BP|blood pressure)[:\s]+(\d{2,3}/\d{2,3})'
-        bp_matches = re.findall(bp_pattern, text, re.IGNORECASE)
-        for bp in bp_matches:
-            results.append({'test': 'Blood Pressure', 'value': bp})
+        for match in BP_PATTERN.finditer(text_lower):
+            results.append(TestResult('Blood Pressure', match.group(1), document.span(*match.span())))
         
         # A1C pattern (e.g., "A1C: 7.5%" or "HbA1c 6.8")
-        a1c_pattern = r'(?:A1C|HbA1c)[:\s]+(\d+\.?\d*)\s*%?'
-        a1c_matches = re.findall(a1c_pattern, text, re.IGNORECASE)
-        for a1c in a1c_matches:
-            results.append({'test': 'A1C (Diabetes)', 'value': f"{a1c}%"})
+        for match in A1C_PATTERN.finditer(text_lower):
+            results.append(TestResult('A1C (Diabetes)', f"{match.group(1)}%", document.span(*match.span())))
         
         # Weight pattern
-        weight_pattern = r'(?:weight|wt)[:\s]+(\d+)\s*(?:lbs?|pounds?)'
-        weight_matches = re.findall(weight_pattern, text, re.IGNORECASE)
-        for weight in weight_matches:
-            results.append({'test': 'Weight', 'value': f"{weight} lbs"})
+        for match in WEIGHT_PATTERN.finditer(text_lower):
+            results.append(TestResult('Weight', f"{match.group(1)} lbs", document.span(*match.span())))
         
         return results
     
@@ -248,23 +573,13 @@ class MedicalExtractor:
         """
         Flag medical abbreviations that Agent 2 should explain
         """
-        # Common medical abbreviations
-        abbreviations = [
-            'BP', 'HR', 'RR', 'O2', 'SpO2', 'CHF', 'COPD', 'CAD', 'MI', 
-            'CVA', 'TIA', 'DM', 'HTN', 'CKD', 'GERD', 'AFIB', 'UTI',
-            'SOB', 'DOE', 'CP', 'HA', 'N/V', 'BM', 'PRN', 'QD', 'BID', 'TID'
-        ]
-        
-        found = []
-        for abbrev in abbreviations:
-            # Look for abbreviation as whole word
-            pattern = rf'\b{abbrev}\b'
-            if re.search(pattern, text):
-                found.append(abbrev)
+        # One pass over the text instead of one regex search per abbreviation
+        present = set(ABBREVIATION_PATTERN.findall(text))
+        found = [abbrev for abbrev in MEDICAL_ABBREVIATIONS if abbrev in present]
         
         return found[:8]  # Limit to top 8
     
-    def assess_extraction_quality(self, extracted_data: Dict) -> str:
+    def assess_extraction_quality(self, extracted_data: Extraction) -> str:
         """
         Assess how complete the extraction was
         Returns: "high", "medium", or "low"
@@ -272,13 +587,13 @@ class MedicalExtractor:
         score = 0
         
         # Check what we found
-        if extracted_data['diagnoses']:
+        if extracted_data.diagnoses:
             score += 2
-        if extracted_data['medications']:
+        if extracted_data.medications:
             score += 2
-        if extracted_data['instructions']:
+        if extracted_data.instructions:
             score += 1
-        if extracted_data['followups']:
+        if extracted_data.followups:
             score += 1
         
         if score >= 5:
@@ -290,73 +605,25 @@ class MedicalExtractor:
     
     def to_json(self, extracted_data: Dict) -> str:
         """Convert extracted data to JSON for Agent 2"""
-        return json.dumps(extracted_data, indent=2)
+        return json.dumps(to_plain(extracted_data), indent=2)
     
     def format_for_display(self, extracted_data: Dict) -> str:
         """
         Format extracted data for human-readable display
         """
-        output = []
-        output.append("=" * 60)
-        output.append("AGENT 1: MEDICAL INFORMATION EXTRACTED")
-        output.append("=" * 60)
-        output.append(f"Input Method: {extracted_data['input_method']}")
-        output.append(f"Extraction Quality: {extracted_data['extraction_quality'].upper()}")
-        output.append("")
-        
-        # Diagnoses
-        if extracted_data['diagnoses']:
-            output.append("📋 DIAGNOSES FOUND:")
-            for dx in extracted_data['diagnoses']:
-                output.append(f"   • {dx}")
-            output.append("")
-        
-        # Medications
-        if extracted_data['medications']:
-            output.append("💊 MEDICATIONS:")
-            for med in extracted_data['medications']:
-                output.append(f"   • {med['name']} - {med['dosage']}")
-            output.append("")
-        
-        # Test Results
-        if extracted_data['test_results']:
-            output.append("🔬 TEST RESULTS:")
-            for test in extracted_data['test_results']:
-                output.append(f"   • {test['test']}: {test['value']}")
-            output.append("")
-        
-        # Symptoms
-        if extracted_data['symptoms']:
-            output.append("🤒 SYMPTOMS NOTED:")
-            for symptom in extracted_data['symptoms']:
-                output.append(f"   • {symptom}")
-            output.append("")
-        
-        # Instructions
-        if extracted_data['instructions']:
-            output.append("📝 INSTRUCTIONS:")
-            for instruction in extracted_data['instructions'][:5]:  # Limit to 5
-                output.append(f"   • {instruction}")
-            output.append("")
-        
-        # Follow-ups
-        if extracted_data['followups']:
-            output.append("📅 FOLLOW-UP NEEDED:")
-            for followup in extracted_data['followups']:
-                output.append(f"   • {followup}")
-            output.append("")
-        
-        # Flagged abbreviations
-        if extracted_data['flagged_terms']:
-            output.append("⚠️  MEDICAL TERMS TO EXPLAIN (for Agent 2):")
-            output.append(f"   {', '.join(extracted_data['flagged_terms'])}")
-            output.append("")
-        
-        output.append("=" * 60)
-        output.append("Ready to send to Agent 2 (Health Explainer)")
-        output.append("=" * 60)
-        
-        return "\n".join(output)
+        return "".join(self.stream_for_display(extracted_data))
+    
+    def stream_for_display(self, extracted_data: Dict, fmt: str = "text") -> Iterator[str]:
+        """
+        Yield the display output chunk by chunk ("text" or "html")
+        """
+        renderer = SummaryRenderer(fmt)
+        return renderer.stream(renderer.extraction_events(extracted_data))
+
+
+def _words_between(text: str, start: int, end: int) -> int:
+    """Number of words in text[start:end]"""
+    return len(text[start:end].split())
 
 
 # Example usage and testing
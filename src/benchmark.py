@@ -0,0 +1,584 @@
+"""
+Benchmark Suite - Per-agent throughput and latency measurements
+Runs every extract_*, explain_*, compile_* step and the whole pipeline on synthetic documents
+
+Team: Oyinade Balogun, Hilary C Bruton, Glen Sam, Kaleb
+Course: ITAI 2376 - Boomer Health Summary Project
+
+Usage:
+    python benchmark.py                                 # run and print the report
+    python benchmark.py --save-baseline                 # record the repo baseline
+    python benchmark.py --compare                       # fail if ops/sec regressed
+    python benchmark.py --import-budget                 # fail if cold start regressed
+    python benchmark.py --summary-memory                # memory per 10k summaries
+    python benchmark.py --threads 1,2,4,8               # shared-pipeline thread scaling
+    python benchmark.py --columnar                      # batch tables vs per-row dicts
+    python benchmark.py --stress                        # fail if pathological inputs exceed the p99.9 ceiling
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from agent1_extractor import MedicalExtractor
+from agent2_educator import HealthExplainer
+from agent3_organizer import LifestyleCoach
+from document_generator import DischargeDocumentGenerator
+from pipeline import BoomerHealthPipeline, gil_enabled
+from records import Record
+
+DEFAULT_SIZES = [1024, 64 * 1024, 1024 * 1024]
+
+# Cold-start budget: fresh interpreter importing the pipeline and building it
+IMPORT_BUDGET_MS = 60.0
+
+# Latency ceiling for triage + extraction on the pathological stress corpus (16 KB inputs)
+STRESS_CEILING_MS = 50.0
+STRESS_BYTES = 16 * 1024
+
+# Measured in a clean subprocess so nothing is already imported
+COLD_START_SCRIPT = """
+import contextlib, io, sys, time
+started = time.perf_counter()
+import pipeline
+with contextlib.redirect_stdout(io.StringIO()):
+    pipeline.BoomerHealthPipeline()
+elapsed = time.perf_counter() - started
+eager = [m for m in ('agent1_extractor', 'agent2_educator', 'agent3_organizer') if m in sys.modules]
+print(elapsed * 1000, ','.join(eager))
+"""
+
+# Baseline checked into the repo for regression comparisons
+BASELINE_PATH = os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'sample_outputs', 'benchmark_baseline.json'
+))
+
+
+def parse_size(value: str) -> int:
+    """Parse sizes like '1KB', '256kb', '10MB' or plain byte counts"""
+    value = value.strip().upper()
+    for suffix, factor in (('KB', 1024), ('MB', 1024 * 1024), ('B', 1)):
+        if value.endswith(suffix):
+            return int(float(value[:-len(suffix)]) * factor)
+    return int(value)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+class AgentBenchmark:
+    """
+    Times each agent step on seeded synthetic documents.
+
+    For every (step, document size) pair it reports ops/sec, p50/p95/p99
+    latency and peak traced allocation for one call.
+    """
+
+    def __init__(self, seed: int = 2376, min_time: float = 0.2, max_repeats: int = 1000):
+        """
+        Args:
+            seed: Generator seed - keep fixed when comparing against a baseline
+            min_time: Minimum seconds spent timing each case
+            max_repeats: Upper bound on timed calls per case
+        """
+        self.seed = seed
+        self.min_time = min_time
+        self.max_repeats = max_repeats
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.pipeline = BoomerHealthPipeline()
+        self.extractor = MedicalExtractor()
+        self.explainer = HealthExplainer()
+        self.coach = LifestyleCoach()
+
+    def build_cases(self, document: str) -> List[Tuple[str, Callable]]:
+        """All benchmarked steps, bound to inputs derived from one document"""
+        text_lower = document.lower()
+        extracted = self.extractor.extract_all(document, "free_text")
+        explained = self.explainer.explain_all(extracted)
+        diagnoses = extracted['diagnoses']
+        medications = extracted['medications']
+        ex, ed, lc = self.extractor, self.explainer, self.coach
+        form_fields = {
+            'Diagnosis': ', '.join(diagnoses),
+            'Medications': '\n'.join(f"{m['name']} {m['dosage']}" for m in medications),
+            'Instructions': '\n'.join(extracted['instructions']),
+            'Follow-up': '\n'.join(extracted['followups'])
+        }
+
+        def run_pipeline():
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.pipeline.process_document(document, "free_text")
+            self.pipeline.clear_history()
+
+        return [
+            ('triage_scan', lambda: self.pipeline.triage(document)),
+            ('extract_diagnoses', lambda: ex.extract_diagnoses(text_lower)),
+            ('extract_medications', lambda: ex.extract_medications(document)),
+            ('extract_symptoms', lambda: ex.extract_symptoms(text_lower)),
+            ('extract_instructions', lambda: ex.extract_instructions(text_lower)),
+            ('extract_followups', lambda: ex.extract_followups(text_lower)),
+            ('extract_test_results', lambda: ex.extract_test_results(document)),
+            ('extract_all', lambda: ex.extract_all(document, "free_text")),
+            ('extract_structured', lambda: ex.extract_structured(form_fields)),
+            ('explain_diagnoses', lambda: ed.explain_diagnoses(diagnoses)),
+            ('explain_medications', lambda: ed.explain_medications(medications)),
+            ('explain_abbreviations', lambda: ed.explain_abbreviations(extracted['flagged_terms'])),
+            ('explain_test_results', lambda: ed.explain_test_results(extracted['test_results'])),
+            ('explain_all', lambda: ed.explain_all(extracted)),
+            ('compile_diet_tips', lambda: lc.compile_diet_tips(diagnoses)),
+            ('compile_exercise_tips', lambda: lc.compile_exercise_tips(diagnoses)),
+            ('compile_daily_habits', lambda: lc.compile_daily_habits(diagnoses)),
+            ('compile_warning_signs', lambda: lc.compile_warning_signs(diagnoses)),
+            ('generate_action_plan', lambda: lc.generate_action_plan(explained)),
+            ('pipeline', run_pipeline),
+        ]
+
+    def measure(self, func: Callable) -> Dict:
+        """Time one step, then measure its allocations in a separate traced call"""
+        latencies = []
+        started = time.perf_counter()
+        while len(latencies) < self.max_repeats:
+            t0 = time.perf_counter()
+            func()
+            latencies.append(time.perf_counter() - t0)
+            if len(latencies) >= 3 and time.perf_counter() - started >= self.min_time:
+                break
+
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        latencies.sort()
+        total = sum(latencies)
+        return {
+            'calls': len(latencies),
+            'ops_per_sec': len(latencies) / total if total else 0.0,
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p95_ms': percentile(latencies, 95) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000,
+            'peak_alloc_kb': peak / 1024
+        }
+
+    def run(self, sizes: List[int] = None, only: List[str] = None, **generator_options) -> Dict:
+        """
+        Run every case at every document size
+
+        Returns:
+            {"<step>@<bytes>": metrics, ...} plus a "_config" entry
+        """
+        sizes = sizes or DEFAULT_SIZES
+        results = {'_config': {'seed': self.seed, 'sizes': sizes, 'generator': generator_options}}
+
+        for size in sizes:
+            generator = DischargeDocumentGenerator(self.seed)
+            document = generator.generate(target_bytes=size, **generator_options)
+            for name, func in self.build_cases(document):
+                if only and name not in only:
+                    continue
+                results[f"{name}@{size}"] = self.measure(func)
+
+        return results
+
+    def format_report(self, results: Dict) -> str:
+        """Human-readable results table"""
+        output = []
+        output.append("=" * 92)
+        output.append("BENCHMARK RESULTS")
+        output.append("=" * 92)
+        output.append(f"{'step':<34}{'ops/sec':>12}{'p50 ms':>11}{'p95 ms':>11}{'p99 ms':>11}{'peak KB':>12}")
+        output.append("-" * 92)
+        for case, m in results.items():
+            if case.startswith('_'):
+                continue
+            output.append(
+                f"{case:<34}{m['ops_per_sec']:>12,.1f}{m['p50_ms']:>11.3f}"
+                f"{m['p95_ms']:>11.3f}{m['p99_ms']:>11.3f}{m['peak_alloc_kb']:>12,.1f}"
+            )
+        return "\n".join(output)
+
+    def compare(self, results: Dict, baseline: Dict, tolerance: float = 0.2) -> List[str]:
+        """
+        Compare ops/sec against a saved baseline
+
+        Returns:
+            Lines describing every case slower than the baseline by more than tolerance
+        """
+        regressions = []
+        for case, m in results.items():
+            if case.startswith('_') or case not in baseline:
+                continue
+            before = baseline[case]['ops_per_sec']
+            if before and m['ops_per_sec'] < before * (1 - tolerance):
+                regressions.append(
+                    f"{case}: {m['ops_per_sec']:,.1f} ops/sec vs baseline {before:,.1f} "
+                    f"({m['ops_per_sec'] / before - 1:+.0%})"
+                )
+        return regressions
+
+
+def measure_cold_start(runs: int = 5) -> Dict:
+    """
+    Time "import pipeline + BoomerHealthPipeline()" in fresh interpreters
+
+    Returns:
+        {'best_ms': fastest run, 'eager_modules': agent modules loaded before first use}
+    """
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    timings, eager = [], ''
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-c', COLD_START_SCRIPT], cwd=src_dir,
+                                capture_output=True, text=True, check=True)
+        elapsed, _, eager = result.stdout.strip().partition(' ')
+        timings.append(float(elapsed))
+    return {'best_ms': min(timings), 'eager_modules': [m for m in eager.split(',') if m]}
+
+
+def check_import_budget(budget_ms: float = IMPORT_BUDGET_MS) -> List[str]:
+    """Problems with cold start: over budget, or agents imported eagerly"""
+    cold = measure_cold_start()
+    problems = []
+    if cold['best_ms'] > budget_ms:
+        problems.append(f"cold start {cold['best_ms']:.1f} ms exceeds budget {budget_ms:.1f} ms")
+    if cold['eager_modules']:
+        problems.append(f"agents imported before first use: {', '.join(cold['eager_modules'])}")
+    print(f"⏱️  Cold start: {cold['best_ms']:.1f} ms (budget {budget_ms:.1f} ms)")
+    return problems
+
+
+def build_stress_corpus(target_bytes: int = STRESS_BYTES) -> Dict[str, str]:
+    """
+    Garbage OCR and adversarial inputs that drive regexes toward
+    backtracking or repeated scans, each about target_bytes long
+    """
+    n = target_bytes
+
+    def repeat(unit: str) -> str:
+        return (unit * (n // len(unit) + 1))[:n]
+
+    def distinct_doses() -> str:
+        words = []
+        for i in range(n // 12):
+            letters = "".join(chr(97 + i // 26 ** k % 26) for k in range(3))
+            words.append(f"Drug{letters} 5mg")
+        return " ".join(words)
+
+    return {
+        'digit_run': "1" * n,                              # dosage patterns with no unit
+        'whitespace_after_bp': "BP" + " " * n + "x",      # [:\s]+ with nothing after
+        'colons_after_name': "Lisinopril" + ":" * n,
+        'unterminated_weight': "Weight: " + "9" * n,
+        'repeated_a1c': repeat("A1C " + "7" * 50 + ". "),
+        'repeated_mentions': repeat("Aspirin tablet "),   # one dosage lookup per mention
+        'distinct_doses': distinct_doses(),
+        'name_then_gap': repeat("Metformin" + " " * 50),
+        'one_long_word': "A" + "a" * n + " 10",
+        'one_long_sentence': repeat("take the pills and call the doctor "),
+        'emergency_phrases': repeat("severe chest pain confusion "),
+        'negated_emergencies': repeat("no chest pain, no confusion, denies fainting; "),
+        'lapsed_after_cues': "fever " + repeat("x x x x x x absent "),   # cue past the scope window
+        'hyphen_breaks': repeat("a-\n"),
+        'stray_pipes': repeat(" | "),
+        'regex_metacharacters': repeat("Lisinopril(+* [x]? 10mg "),
+    }
+
+
+def measure_stress(target_bytes: int = STRESS_BYTES, samples: int = 1000) -> Dict:
+    """
+    Latency of triage + extract_all across the stress corpus
+
+    Cases run round-robin until samples calls are timed, so the
+    p99.9 has enough calls behind it.
+
+    Returns:
+        {'samples', 'p50_ms', 'p99_ms', 'p999_ms', 'max_ms', 'worst': {case: max ms}}
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        pipeline = BoomerHealthPipeline()
+    extractor = MedicalExtractor()
+    corpus = build_stress_corpus(target_bytes)
+
+    timings, worst = [], {name: 0.0 for name in corpus}
+    while len(timings) < samples:
+        for name, text in corpus.items():
+            started = time.perf_counter()
+            pipeline.triage(text)
+            extractor.extract_all(text, "photo_ocr")
+            elapsed = (time.perf_counter() - started) * 1000
+            timings.append(elapsed)
+            worst[name] = max(worst[name], elapsed)
+
+    timings.sort()
+    return {
+        'samples': len(timings),
+        'p50_ms': percentile(timings, 50),
+        'p99_ms': percentile(timings, 99),
+        'p999_ms': percentile(timings, 99.9),
+        'max_ms': timings[-1],
+        'worst': worst
+    }
+
+
+def deep_size(root) -> int:
+    """Bytes held by an object graph (each object counted once, like real memory)"""
+    seen, stack, total = set(), [root], 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple)):
+            stack.extend(obj)
+        elif isinstance(obj, Record):
+            stack.extend(getattr(obj, name) for name in obj.__slots__)
+    return total
+
+
+def measure_summary_memory(count: int = 10000, target_bytes: int = 1024, seed: int = 2376) -> Dict:
+    """
+    Memory held by count summaries (extraction + explanation + action plan each),
+    as slotted records versus the equivalent plain dicts
+
+    Returns:
+        {'count', 'record_bytes', 'dict_bytes', 'saved_pct'}
+    """
+    generator = DischargeDocumentGenerator(seed=seed)
+    extractor, explainer, coach = MedicalExtractor(), HealthExplainer(), LifestyleCoach()
+
+    records, dicts = [], []
+    for _ in range(count):
+        extracted = extractor.extract_all(generator.generate(target_bytes=target_bytes), "free_text")
+        explained = explainer.explain_all(extracted)
+        plan = coach.generate_action_plan(explained)
+        records.append((extracted, explained, plan))
+
+        # The pre-record shape: explanation shares the extraction dict, as the pipeline did
+        extracted_dict = extracted.to_dict()
+        explained_dict = dict(explained.to_dict(), original_extraction=extracted_dict)
+        dicts.append((extracted_dict, explained_dict, plan.to_dict()))
+
+    record_bytes, dict_bytes = deep_size(records), deep_size(dicts)
+    return {
+        'count': count,
+        'record_bytes': record_bytes,
+        'dict_bytes': dict_bytes,
+        'saved_pct': round(100 * (1 - record_bytes / dict_bytes), 1)
+    }
+
+
+def measure_thread_scaling(workers: List[int], count: int = 200, target_bytes: int = 4096,
+                           seed: int = 2376) -> Dict:
+    """
+    Documents/sec through one shared pipeline's process_batch at each thread count
+
+    Returns:
+        {'gil_enabled': bool, 'runs': {threads: {'docs_per_sec', 'speedup'}}}
+    """
+    documents = DischargeDocumentGenerator(seed=seed).generate_corpus(count, target_bytes=target_bytes)
+    pipeline = BoomerHealthPipeline(verbose=False)
+    pipeline.process_document(documents[0])  # build the agents outside the timings
+
+    runs = {}
+    for threads in workers:
+        started = time.perf_counter()
+        pipeline.process_batch(documents, max_workers=threads)
+        rate = count / (time.perf_counter() - started)
+        runs[threads] = {'docs_per_sec': rate, 'speedup': rate / runs[workers[0]]['docs_per_sec'] if runs else 1.0}
+    return {'gil_enabled': gil_enabled(), 'runs': runs}
+
+
+def measure_columnar_export(count: int = 5000, target_bytes: int = 2048, seed: int = 2376) -> Dict:
+    """
+    Time and memory to turn count summaries into per-entity DataFrames,
+    per-row dicts + pd.DataFrame vs columnar_export.BatchTables
+
+    Returns:
+        {'count', 'dict_seconds', 'columnar_seconds', 'dict_bytes', 'columnar_bytes'}
+    """
+    import pandas as pd
+    from columnar_export import BatchTables, parse_dose
+
+    documents = DischargeDocumentGenerator(seed=seed).generate_corpus(count, target_bytes=target_bytes)
+    summaries = BoomerHealthPipeline(verbose=False).process_batch(documents)
+
+    def by_hand() -> Dict:
+        rows = {'diagnoses': [], 'medications': [], 'test_results': []}
+        for document_id, summary in enumerate(summaries):
+            for dx in summary['section_1_diagnoses']['diagnoses']:
+                rows['diagnoses'].append(dict(dx, document_id=document_id))
+            for med in summary['section_2_medications']['medications']:
+                value, unit = parse_dose(med['dosage'])
+                rows['medications'].append(dict(med, document_id=document_id, dose_value=value, dose_unit=unit))
+            for result in summary['section_1_diagnoses']['test_results']:
+                rows['test_results'].append(dict(result, document_id=document_id))
+        return {table: pd.DataFrame(table_rows) for table, table_rows in rows.items()}
+
+    def columnar() -> Dict:
+        return BatchTables.from_summaries(summaries).frames()
+
+    results = {'count': count}
+    for name, build in (('dict', by_hand), ('columnar', columnar)):
+        tracemalloc.start()
+        started = time.perf_counter()
+        frames = build()
+        results[f'{name}_seconds'] = time.perf_counter() - started
+        results[f'{name}_peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results[f'{name}_bytes'] = sum(int(frame.memory_usage(deep=True).sum()) for frame in frames.values())
+    return results
+
+
+def measure_prefork_memory(workers: List[int], count: int = 200, target_bytes: int = 4096,
+                           seed: int = 2376) -> Dict:
+    """
+    Pool footprint (summed PSS) after processing count documents, at each
+    worker count, for forked workers sharing the master's tables vs spawned
+    workers building their own
+
+    Returns:
+        {start_method: {workers: {'total_pss', 'worker_private'}}} in bytes
+    """
+    from worker_pool import PreforkPool
+
+    documents = DischargeDocumentGenerator(seed=seed).generate_corpus(count, target_bytes=target_bytes)
+    results = {}
+    for start_method in ('fork', 'spawn'):
+        results[start_method] = {}
+        for size in workers:
+            with PreforkPool(max_workers=size, start_method=start_method) as pool:
+                pool.process_batch(documents)
+                usage = pool.memory_usage()
+            private = [u.get('Private_Clean', 0) + u.get('Private_Dirty', 0) for u in usage['workers']]
+            results[start_method][size] = {'total_pss': usage['total_pss'],
+                                           'worker_private': sum(private) / len(private)}
+    return results
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Boomer Health Summary agents")
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help="Comma-separated document sizes, e.g. 1KB,256KB,10MB")
+    parser.add_argument('--only', default='', help="Comma-separated step names to run")
+    parser.add_argument('--seed', type=int, default=2376)
+    parser.add_argument('--ocr-noise', type=float, default=0.0)
+    parser.add_argument('--layout', default='sectioned')
+    parser.add_argument('--min-time', type=float, default=0.2)
+    parser.add_argument('--save-baseline', metavar='PATH', nargs='?', const=BASELINE_PATH)
+    parser.add_argument('--compare', metavar='PATH', nargs='?', const=BASELINE_PATH)
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Allowed ops/sec drop before a case counts as regressed")
+    parser.add_argument('--import-budget', metavar='MS', type=float, nargs='?', const=IMPORT_BUDGET_MS,
+                        help="Only check cold-start time against a budget (default %(const)s ms)")
+    parser.add_argument('--summary-memory', metavar='N', type=int, nargs='?', const=10000,
+                        help="Only report memory held by N summaries, records vs dicts (default %(const)s)")
+    parser.add_argument('--threads', metavar='N,N,...',
+                        help="Only measure process_batch scaling at these thread counts, e.g. 1,2,4,8")
+    parser.add_argument('--prefork', metavar='N,N,...',
+                        help="Only measure pre-forked pool memory (summed PSS) at these worker counts, e.g. 1,2,4,8")
+    parser.add_argument('--columnar', metavar='N', type=int, nargs='?', const=5000,
+                        help="Only compare building tables for N summaries, dicts vs columnar (default %(const)s)")
+    parser.add_argument('--stress', metavar='MS', type=float, nargs='?', const=STRESS_CEILING_MS,
+                        help="Only check triage + extraction p99.9 on pathological inputs against a ceiling "
+                             "(default %(const)s ms)")
+    args = parser.parse_args(argv)
+
+    if args.stress is not None:
+        stress = measure_stress()
+        print(f"🧨 Stress corpus ({stress['samples']:,} calls, {STRESS_BYTES // 1024} KB inputs): "
+              f"p50 {stress['p50_ms']:.1f} ms, p99 {stress['p99_ms']:.1f} ms, "
+              f"p99.9 {stress['p999_ms']:.1f} ms, max {stress['max_ms']:.1f} ms")
+        for name, worst in sorted(stress['worst'].items(), key=lambda item: -item[1])[:5]:
+            print(f"   • {name:<22} worst {worst:.1f} ms")
+        if stress['p999_ms'] > args.stress:
+            print(f"❌ p99.9 {stress['p999_ms']:.1f} ms exceeds ceiling {args.stress:.1f} ms")
+            return 1
+        print(f"✅ p99.9 within ceiling {args.stress:.1f} ms")
+        return 0
+
+    if args.prefork:
+        footprint = measure_prefork_memory([int(n) for n in args.prefork.split(',') if n], seed=args.seed)
+        print("🧠 WORKER POOL FOOTPRINT (summed PSS after the batch):")
+        for start_method, runs in footprint.items():
+            for size, run in runs.items():
+                print(f"   • {start_method:<5} {size:>3} workers: {run['total_pss'] / 2**20:,.1f} MB total, "
+                      f"{run['worker_private'] / 2**20:,.1f} MB private per worker")
+        return 0
+
+    if args.columnar:
+        export = measure_columnar_export(args.columnar, seed=args.seed)
+        print(f"📊 Tables for {export['count']:,} summaries:")
+        for name in ('dict', 'columnar'):
+            print(f"   • {name:<8}: {export[f'{name}_seconds'] * 1000:,.0f} ms, "
+                  f"peak {export[f'{name}_peak_bytes'] / 2**20:,.1f} MB, "
+                  f"frames {export[f'{name}_bytes'] / 2**20:,.1f} MB")
+        return 0
+
+    if args.threads:
+        scaling = measure_thread_scaling([int(n) for n in args.threads.split(',') if n], seed=args.seed)
+        print(f"🧵 THREAD SCALING (GIL {'enabled' if scaling['gil_enabled'] else 'disabled'}):")
+        for threads, run in scaling['runs'].items():
+            print(f"   • {threads:>3} threads: {run['docs_per_sec']:,.1f} docs/sec ({run['speedup']:.2f}x)")
+        return 0
+
+    if args.summary_memory:
+        memory = measure_summary_memory(args.summary_memory, seed=args.seed)
+        print(f"🧠 Memory for {memory['count']:,} summaries: "
+              f"{memory['record_bytes'] / 2**20:,.1f} MB as records vs "
+              f"{memory['dict_bytes'] / 2**20:,.1f} MB as dicts ({memory['saved_pct']}% less)")
+        return 0
+
+    if args.import_budget is not None:
+        problems = check_import_budget(args.import_budget)
+        for problem in problems:
+            print(f"❌ {problem}")
+        return 1 if problems else 0
+
+    bench = AgentBenchmark(seed=args.seed, min_time=args.min_time)
+    results = bench.run(
+        sizes=[parse_size(s) for s in args.sizes.split(',') if s],
+        only=[s for s in args.only.split(',') if s],
+        ocr_noise=args.ocr_noise,
+        layout=args.layout
+    )
+    print(bench.format_report(results))
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Baseline saved to: {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = bench.compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\n❌ REGRESSIONS:")
+            for line in regressions:
+                print(f"   • {line}")
+            return 1
+        print("\n✅ No regressions against baseline")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""
+Columnar Export - Batch results as per-entity NumPy/pandas tables
+Turns many health summaries into diagnoses / medications / test results / follow-up tables
+
+Team: Oyinade Balogun, Hilary C Bruton, Glen Sam, Kaleb
+Course: ITAI 2376 - Boomer Health Summary Project
+
+Usage:
+    tables = pipeline.process_batch(documents, columnar=True)
+    tables.frame('medications').groupby('medication')['dose_value'].median()
+    tables.save('../data/processed/batch_tables')           # Parquet (needs pyarrow)
+    tables.save('../data/processed/batch_tables', 'npz')    # compressed NumPy archive
+"""
+
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# "40mg", "0.5 mg", "10 units", "75mcg"
+DOSE_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*(mg|mcg|g|ml|units?|iu|meq|%)\b', re.IGNORECASE)
+# "152/94", "185 lbs", "7.2%" -> first number, optional second number, trailing unit
+VALUE_PATTERN = re.compile(r'(-?\d+(?:\.\d+)?)(?:\s*/\s*(\d+(?:\.\d+)?))?\s*([a-zA-Z%/]*)')
+
+# table -> (column, dtype) in column order; dtype object columns hold strings
+TABLE_COLUMNS = {
+    'documents': [('document_id', np.int64), ('summary_id', np.int64), ('patient_name', object),
+                  ('input_method', object), ('extraction_quality', object)],
+    'diagnoses': [('document_id', np.int64), ('diagnosis', object), ('simple_name', object)],
+    'medications': [('document_id', np.int64), ('medication', object), ('dosage', object),
+                    ('dose_value', np.float64), ('dose_unit', object)],
+    'test_results': [('document_id', np.int64), ('test', object), ('your_value', object),
+                     ('value', np.float64), ('value_2', np.float64), ('unit', object),
+                     ('normal_range', object)],
+    'followups': [('document_id', np.int64), ('followup', object)],
+}
+
+# Repetitive string columns stored as pandas categoricals
+CATEGORICAL_COLUMNS = {'input_method', 'extraction_quality', 'diagnosis', 'simple_name',
+                       'medication', 'dose_unit', 'test', 'unit', 'normal_range'}
+
+
+# Dose and value strings repeat across a batch as much as names do, so parses are memoized
+@lru_cache(maxsize=4096)
+def parse_dose(dosage: str) -> Tuple[float, str]:
+    """("40mg") -> (40.0, "mg"); NaN and "" when there is no numeric dose"""
+    match = DOSE_PATTERN.search(dosage or "")
+    if match is None:
+        return np.nan, ""
+    unit = match.group(2).lower()
+    return float(match.group(1)), 'units' if unit == 'unit' else unit
+
+
+@lru_cache(maxsize=4096)
+def parse_value(value: str) -> Tuple[float, float, str]:
+    """("152/94") -> (152.0, 94.0, ""); ("185 lbs") -> (185.0, NaN, "lbs")"""
+    match = VALUE_PATTERN.search(value or "")
+    if match is None:
+        return np.nan, np.nan, ""
+    second = match.group(2)
+    return float(match.group(1)), float(second) if second else np.nan, match.group(3).lower()
+
+
+class BatchTables:
+    """
+    One table per entity, joined on document_id (the summary's position in the batch).
+
+    Every column is a NumPy array - no per-row dicts. from_summaries() fills
+    preallocated arrays from summaries already in hand; BatchTableBuilder
+    takes them one at a time instead, so a batch never holds every summary.
+    frame() wraps the arrays in a DataFrame, with repetitive strings as categoricals.
+    """
+
+    def __init__(self, arrays: Dict[str, Dict[str, np.ndarray]]):
+        """
+        Args:
+            arrays: {table: {column: 1-D array}} with equal-length columns per table
+        """
+        self.arrays = arrays
+
+    @classmethod
+    def from_summaries(cls, summaries: Iterable[Dict]) -> 'BatchTables':
+        """Build the tables from final summaries (as returned by process_batch/process_document)"""
+        summaries = list(summaries)
+        per_summary = [_entities(summary) for summary in summaries]
+        entity_lists = {table: [entities[table] for entities in per_summary] for table in TABLE_COLUMNS
+                        if table != 'documents'}
+
+        arrays = {'documents': cls._allocate('documents', len(summaries))}
+        documents = arrays['documents']
+        for i, summary in enumerate(summaries):
+            documents['document_id'][i] = i
+            cls._fill_documents(documents, i, summary)
+
+        for table, per_document in entity_lists.items():
+            columns = arrays[table] = cls._allocate(table, sum(len(items) for items in per_document))
+            fill = getattr(cls, f"_fill_{table}")
+            row = 0
+            for document_id, items in enumerate(per_document):
+                for item in items:
+                    columns['document_id'][row] = document_id
+                    fill(columns, row, item)
+                    row += 1
+
+        return cls(arrays)
+
+    @staticmethod
+    def _fill_documents(columns: Dict[str, np.ndarray], row: int, summary: Dict):
+        metadata = summary.get('metadata', {})
+        columns['summary_id'][row] = metadata.get('summary_id', -1)
+        columns['patient_name'][row] = summary.get('patient_name', "")
+        columns['input_method'][row] = metadata.get('input_method', "")
+        columns['extraction_quality'][row] = metadata.get('extraction_quality', "")
+
+    @staticmethod
+    def _allocate(table: str, rows: int) -> Dict[str, np.ndarray]:
+        return {column: np.empty(rows, dtype=dtype) for column, dtype in TABLE_COLUMNS[table]}
+
+    @staticmethod
+    def _fill_diagnoses(columns: Dict[str, np.ndarray], row: int, item: Dict):
+        columns['diagnosis'][row] = item['diagnosis']
+        columns['simple_name'][row] = item['simple_name']
+
+    @staticmethod
+    def _fill_medications(columns: Dict[str, np.ndarray], row: int, item: Dict):
+        columns['medication'][row] = item['medication']
+        columns['dosage'][row] = item['dosage']
+        columns['dose_value'][row], columns['dose_unit'][row] = parse_dose(item['dosage'])
+
+    @staticmethod
+    def _fill_test_results(columns: Dict[str, np.ndarray], row: int, item: Dict):
+        columns['test'][row] = item['test']
+        columns['your_value'][row] = item['your_value']
+        columns['value'][row], columns['value_2'][row], columns['unit'][row] = parse_value(item['your_value'])
+        columns['normal_range'][row] = item['normal_range']
+
+    @staticmethod
+    def _fill_followups(columns: Dict[str, np.ndarray], row: int, item: str):
+        columns['followup'][row] = item
+
+    @property
+    def table_names(self) -> List[str]:
+        return list(self.arrays)
+
+    def frame(self, table: str) -> pd.DataFrame:
+        """The table as a DataFrame (numeric columns share memory with the arrays)"""
+        columns = {}
+        for column, values in self.arrays[table].items():
+            columns[column] = pd.Categorical(values) if column in CATEGORICAL_COLUMNS else values
+        return pd.DataFrame(columns, copy=False)
+
+    def frames(self) -> Dict[str, pd.DataFrame]:
+        return {table: self.frame(table) for table in self.arrays}
+
+    def save(self, directory: str, fmt: str = "parquet") -> List[str]:
+        """
+        Write every table to directory
+
+        Args:
+            directory: Output folder (created if needed)
+            fmt: "parquet" (one <table>.parquet each, needs pyarrow) or
+                 "npz" (one compressed tables.npz, NumPy only)
+
+        Returns:
+            Paths written
+        """
+        os.makedirs(directory, exist_ok=True)
+        if fmt == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError as exc:
+                raise ImportError("Writing Parquet needs 'pyarrow' (pip install pyarrow), or use fmt='npz'") from exc
+            paths = []
+            for table in self.arrays:
+                path = os.path.join(directory, f"{table}.parquet")
+                self.frame(table).to_parquet(path, index=False)
+                paths.append(path)
+            return paths
+        if fmt == "npz":
+            path = os.path.join(directory, "tables.npz")
+            flat = {f"{table}/{column}": values.astype(str) if values.dtype == object else values
+                    for table, columns in self.arrays.items() for column, values in columns.items()}
+            np.savez_compressed(path, **flat)
+            return [path]
+        raise ValueError(f"Unknown format: {fmt}")
+
+    @classmethod
+    def load(cls, directory: str) -> 'BatchTables':
+        """Read tables written by save() in either format"""
+        npz_path = os.path.join(directory, "tables.npz")
+        arrays: Dict[str, Dict[str, np.ndarray]] = {}
+        if os.path.exists(npz_path):
+            with np.load(npz_path) as data:
+                for key in data.files:
+                    table, column = key.split('/', 1)
+                    values = data[key]
+                    arrays.setdefault(table, {})[column] = values.astype(object) if values.dtype.kind == 'U' else values
+            return cls(arrays)
+
+        for table in TABLE_COLUMNS:
+            path = os.path.join(directory, f"{table}.parquet")
+            if os.path.exists(path):
+                frame = pd.read_parquet(path)
+                arrays[table] = {column: frame[column].to_numpy(dtype=dtype)
+                                 for column, dtype in TABLE_COLUMNS[table]}
+        return cls(arrays)
+
+    def format_report(self) -> str:
+        """Row counts per table"""
+        output = ["📊 BATCH TABLES", ""]
+        for table, columns in self.arrays.items():
+            rows = len(next(iter(columns.values()))) if columns else 0
+            output.append(f"   {table:<14} {rows:>9,} rows  ({', '.join(columns)})")
+        return "\n".join(output)
+
+
+def _entities(summary: Dict) -> Dict[str, List]:
+    """Rows each entity table gets from one summary"""
+    return {
+        'diagnoses': summary['section_1_diagnoses']['diagnoses'],
+        'medications': summary['section_2_medications']['medications'],
+        'test_results': summary['section_1_diagnoses']['test_results'],
+        'followups': summary['section_3_action_plan'].get('followups', []),
+    }
+
+
+class BatchTableBuilder:
+    """
+    Streams summaries into BatchTables as they finish.
+
+    add() copies a summary's rows into per-table chunks of NumPy arrays and
+    keeps no reference to the summary, so the caller can drop it at once.
+    Summaries may arrive in any order; build() sorts rows by document_id.
+    """
+
+    def __init__(self):
+        self._chunks: Dict[str, List[Dict[str, np.ndarray]]] = {table: [] for table in TABLE_COLUMNS}
+
+    def add(self, document_id: int, summary: Dict):
+        """Append one summary's rows (document_id: its position in the batch)"""
+        documents = BatchTables._allocate('documents', 1)
+        documents['document_id'][0] = document_id
+        BatchTables._fill_documents(documents, 0, summary)
+        self._chunks['documents'].append(documents)
+
+        for table, items in _entities(summary).items():
+            if not items:
+                continue
+            columns = BatchTables._allocate(table, len(items))
+            columns['document_id'][:] = document_id
+            fill = getattr(BatchTables, f"_fill_{table}")
+            for row, item in enumerate(items):
+                fill(columns, row, item)
+            self._chunks[table].append(columns)
+
+    def build(self) -> BatchTables:
+        """Join the chunks into one array per column, in document_id order"""
+        arrays = {}
+        for table, chunks in self._chunks.items():
+            if not chunks:
+                arrays[table] = BatchTables._allocate(table, 0)
+                continue
+            chunks.sort(key=lambda chunk: chunk['document_id'][0])
+            arrays[table] = {column: np.concatenate([chunk[column] for chunk in chunks])
+                             for column, _ in TABLE_COLUMNS[table]}
+        self._chunks = {table: [] for table in TABLE_COLUMNS}
+        return BatchTables(arrays)
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    import tempfile
+
+    from document_generator import DischargeDocumentGenerator
+    from pipeline import BoomerHealthPipeline
+
+    documents = DischargeDocumentGenerator(seed=7).generate_corpus(50, target_bytes=2048)
+    pipeline = BoomerHealthPipeline(verbose=False)
+    tables = pipeline.process_batch(documents, columnar=True)
+
+    print("Testing Columnar Export\n")
+    print(tables.format_report())
+    print()
+    print(tables.frame('medications').groupby('medication', observed=True)['dose_value'].median().head())
+
+    with tempfile.TemporaryDirectory() as directory:
+        tables.save(directory, 'npz')
+        reloaded = BatchTables.load(directory)
+        print(f"\nnpz round trip rows: {len(reloaded.frame('test_results')):,}")
@@ -0,0 +1,160 @@
+"""
+Corpus Loader - Chunked ingestion of large clinical-note exports from data/raw
+Streams CSV/Parquet notes through batch extraction and writes results to data/processed
+
+Team: Oyinade Balogun, Hilary C Bruton, Glen Sam, Kaleb
+Course: ITAI 2376 - Boomer Health Summary Project
+
+Usage:
+    python corpus_loader.py ../data/raw/notes.csv --text-column TEXT --id-column ROW_ID
+"""
+
+import argparse
+import json
+import os
+from typing import Dict, Iterator, Optional, Tuple
+
+import pandas as pd
+
+from agent1_extractor import MedicalExtractor
+
+DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data'))
+RAW_DIR = os.path.join(DATA_DIR, 'raw')
+PROCESSED_DIR = os.path.join(DATA_DIR, 'processed')
+
+
+class ClinicalNoteLoader:
+    """
+    Reads a clinical-note export a fixed number of rows at a time.
+
+    Only the configured text and ID columns are loaded, so memory stays
+    bounded by chunk_size no matter how large the file is.
+    """
+
+    def __init__(self,
+                 path: str,
+                 text_column: str = "text",
+                 id_column: Optional[str] = "note_id",
+                 chunk_size: int = 1000):
+        """
+        Args:
+            path: .csv / .csv.gz / .tsv or .parquet file
+            text_column: Column holding the note text
+            id_column: Column holding a stable note ID (None = use the row number)
+            chunk_size: Rows per chunk
+        """
+        self.path = path
+        self.text_column = text_column
+        self.id_column = id_column
+        self.chunk_size = chunk_size
+
+    def _columns(self):
+        return [self.text_column] + ([self.id_column] if self.id_column else [])
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """Yield DataFrames of at most chunk_size rows with 'note_id' and 'text' columns"""
+        lower = self.path.lower()
+        if lower.endswith('.parquet'):
+            chunks = self._iter_parquet()
+        else:
+            sep = '\t' if lower.endswith(('.tsv', '.tsv.gz')) else ','
+            chunks = pd.read_csv(self.path, sep=sep, usecols=self._columns(),
+                                 chunksize=self.chunk_size, dtype=str)
+
+        row_offset = 0
+        for chunk in chunks:
+            if self.id_column:
+                ids = chunk[self.id_column].astype(str)
+            else:
+                ids = pd.Series(range(row_offset, row_offset + len(chunk)), index=chunk.index).astype(str)
+            row_offset += len(chunk)
+            yield pd.DataFrame({'note_id': ids, 'text': chunk[self.text_column].fillna("").astype(str)})
+
+    def _iter_parquet(self) -> Iterator[pd.DataFrame]:
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError("Reading Parquet needs 'pyarrow' (pip install pyarrow)") from exc
+        parquet_file = pq.ParquetFile(self.path)
+        for batch in parquet_file.iter_batches(batch_size=self.chunk_size, columns=self._columns()):
+            yield batch.to_pandas()
+
+    def iter_notes(self) -> Iterator[Tuple[str, str]]:
+        """Yield (note_id, text) pairs across all chunks"""
+        for chunk in self.iter_chunks():
+            yield from zip(chunk['note_id'], chunk['text'])
+
+
+def process_corpus(loader: ClinicalNoteLoader,
+                   output_path: Optional[str] = None,
+                   extractor: Optional[MedicalExtractor] = None,
+                   input_method: str = "free_text",
+                   max_chunks: Optional[int] = None) -> Dict:
+    """
+    Run batch extraction over a corpus chunk by chunk, appending one JSON
+    line per note to output_path as each chunk finishes.
+
+    Args:
+        loader: Configured ClinicalNoteLoader
+        output_path: JSONL destination (default: data/processed/<input name>.extracted.jsonl)
+        extractor: Agent 1 instance to reuse (built if None)
+        input_method: Recorded on every extraction
+        max_chunks: Stop early after this many chunks (for sampling a corpus)
+
+    Returns:
+        Run statistics: notes, chunks, output path and extraction-quality counts
+    """
+    extractor = extractor or MedicalExtractor()
+    if output_path is None:
+        base = os.path.basename(loader.path).split('.')[0]
+        output_path = os.path.join(PROCESSED_DIR, f"{base}.extracted.jsonl")
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+
+    stats = {'notes': 0, 'chunks': 0, 'output_path': output_path,
+             'quality': {'high': 0, 'medium': 0, 'low': 0}}
+
+    with open(output_path, 'w', encoding='utf-8') as out:
+        for chunk in loader.iter_chunks():
+            results = extractor.extract_batch(chunk['text'], input_method)
+            for note_id, extracted in zip(chunk['note_id'], results):
+                record = extracted.to_dict()
+                record.pop('raw_text_preview', None)
+                out.write(json.dumps({'note_id': note_id, 'extraction': record}) + "\n")
+                stats['quality'][extracted.extraction_quality] += 1
+                stats['notes'] += 1
+            out.flush()
+
+            stats['chunks'] += 1
+            print(f"   ✅ Chunk {stats['chunks']}: {stats['notes']:,} notes extracted")
+            if max_chunks is not None and stats['chunks'] >= max_chunks:
+                break
+
+    return stats
+
+
+def download_kaggle_dataset(handle: str) -> str:
+    """Download a Kaggle dataset with kagglehub (uses KAGGLE_USERNAME/KAGGLE_KEY) and return its path"""
+    import kagglehub
+    return kagglehub.dataset_download(handle)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Extract a clinical-note corpus in constant memory")
+    parser.add_argument('path', help="CSV/TSV/Parquet file, e.g. data/raw/notes.csv")
+    parser.add_argument('--text-column', default='text')
+    parser.add_argument('--id-column', default='note_id', help="Use '' to number rows instead")
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--output', help="JSONL output path (default under data/processed)")
+    parser.add_argument('--max-chunks', type=int)
+    args = parser.parse_args(argv)
+
+    loader = ClinicalNoteLoader(args.path, args.text_column, args.id_column or None, args.chunk_size)
+    print(f"📚 Processing corpus: {args.path}")
+    stats = process_corpus(loader, args.output, max_chunks=args.max_chunks)
+    print(f"💾 {stats['notes']:,} extractions written to: {stats['output_path']}")
+    print(f"   Quality: {stats['quality']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,115 @@
+"""
+Deadline - A time budget for one document, split across the pipeline stages
+Lets late requests return a partial summary instead of timing out
+
+Team: Oyinade Balogun, Hilary C Bruton, Glen Sam, Kaleb
+Course: ITAI 2376 - Boomer Health Summary Project
+"""
+
+import time
+from typing import Callable, Dict, List, Optional
+
+# Share of the total budget each stage gets, in pipeline order
+STAGE_SHARES = (
+    ('extraction', 0.50),   # triage pre-scan + Agent 1 (never skipped)
+    ('explanation', 0.25),  # Agent 2 - the glossary is optional
+    ('action_plan', 0.20),  # Agent 3 - the lifestyle plan is optional
+    ('assembly', 0.05),     # final summary - long lists are truncated when late
+)
+
+# Optional work each stage drops when it starts behind schedule
+DEGRADATIONS = {
+    'explanation': 'glossary',
+    'action_plan': 'lifestyle_plan',
+    'assembly': 'long_lists',
+}
+
+# Items kept per list when assembly truncates long lists
+LATE_LIST_LIMIT = 5
+
+
+class Deadline:
+    """
+    Total time budget for one document.
+
+    The budget is split by STAGE_SHARES into a schedule: a stage is on time
+    if it starts before the earlier stages' shares have run out. A stage
+    that starts behind schedule (or after the whole budget is gone) skips
+    its optional work; the mandatory parts - extraction, diagnosis and
+    medication explanations, warning signs - always run. What was skipped
+    is recorded in degraded, for the summary metadata.
+    """
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.perf_counter):
+        """
+        Args:
+            seconds: Total budget for the document
+            clock: Monotonic clock (replaceable for simulations)
+        """
+        if seconds <= 0:
+            raise ValueError("Deadline must be positive")
+        self.seconds = seconds
+        self.clock = clock
+        self.started = clock()
+        self.degraded: List[str] = []
+
+        # stage -> elapsed seconds by which the stage should have started
+        self._starts: Dict[str, float] = {}
+        elapsed = 0.0
+        for stage, share in STAGE_SHARES:
+            self._starts[stage] = elapsed
+            elapsed += share * seconds
+
+    def elapsed(self) -> float:
+        return self.clock() - self.started
+
+    def remaining(self) -> float:
+        return max(0.0, self.seconds - self.elapsed())
+
+    def expired(self) -> bool:
+        return self.elapsed() >= self.seconds
+
+    def behind(self, stage: str) -> bool:
+        """True when stage is starting later than its slot in the schedule"""
+        return self.elapsed() > self._starts[stage]
+
+    def allow(self, stage: str) -> bool:
+        """
+        Whether stage may run its optional work
+
+        Returns False (and records the degradation) when the stage is behind schedule.
+        """
+        if not self.behind(stage):
+            return True
+        if DEGRADATIONS[stage] not in self.degraded:
+            self.degraded.append(DEGRADATIONS[stage])
+        return False
+
+    def metadata(self) -> Dict:
+        """Summary metadata: budget, time used and what was degraded"""
+        return {
+            'deadline_ms': round(self.seconds * 1000, 1),
+            'elapsed_ms': round(self.elapsed() * 1000, 1),
+            'degraded': list(self.degraded)
+        }
+
+
+def truncate(items: List, deadline: Optional[Deadline], limit: int = LATE_LIST_LIMIT) -> List:
+    """items, cut to limit when the assembly stage is running late"""
+    if deadline is None or len(items) <= limit or deadline.allow('assembly'):
+        return items
+    return items[:limit]
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    now = [0.0]
+    deadline = Deadline(0.200, clock=lambda: now[0])
+
+    print("Testing Deadline\n")
+    for stage, elapsed in (('extraction', 0.0), ('explanation', 0.140), ('action_plan', 0.145),
+                           ('assembly', 0.210)):
+        now[0] = elapsed
+        verdict = "optional work runs" if stage == 'extraction' or deadline.allow(stage) else "degraded"
+        print(f"   {stage:<12} starts at {elapsed * 1000:>4.0f} ms: {verdict}")
+    print(f"\nMetadata: {deadline.metadata()}")
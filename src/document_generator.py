@@ -0,0 +1,300 @@
+"""
+Synthetic Discharge Document Generator
+Produces seeded, realistic-looking discharge papers for benchmarks and testing
+
+Team: Oyinade Balogun, Hilary C Bruton, Glen Sam, Kaleb
+Course: ITAI 2376 - Boomer Health Summary Project
+"""
+
+import random
+from typing import Dict, List, Optional, Tuple
+
+# Vocabulary the generator draws from (overlaps Agent 1's keyword lists on purpose)
+DIAGNOSES = [
+    'Hypertension', 'Type 2 Diabetes', 'Hyperlipidemia', 'COPD', 'Asthma',
+    'Congestive Heart Failure (CHF)', 'Atrial Fibrillation', 'Chronic Kidney Disease',
+    'Osteoporosis', 'Arthritis', 'GERD', 'Pneumonia', 'Anemia', 'Depression',
+    'Coronary Artery Disease', 'Urinary tract infection', 'Hip fracture'
+]
+
+# What Agent 1 should report for each generated diagnosis (gold labels)
+DIAGNOSIS_LABELS = {
+    'Type 2 Diabetes': ['diabetes', 'type 2 diabetes'],
+    'Congestive Heart Failure (CHF)': ['congestive heart failure', 'chf'],
+    'Urinary tract infection': ['infection'],
+    'Hip fracture': ['fracture']
+}
+
+MEDICATIONS = [
+    ('Metformin', ['500mg', '1000mg']), ('Lisinopril', ['10mg', '20mg', '40mg']),
+    ('Atorvastatin', ['20mg', '40mg']), ('Amlodipine', ['5mg', '10mg']),
+    ('Metoprolol', ['25mg', '50mg']), ('Furosemide', ['20mg', '40mg']),
+    ('Omeprazole', ['20mg']), ('Levothyroxine', ['50mcg', '75mcg']),
+    ('Warfarin', ['2mg', '5mg']), ('Aspirin', ['81mg']), ('Gabapentin', ['300mg']),
+    ('Prednisone', ['10mg']), ('Insulin', ['10 units', '20 units']),
+    ('Losartan', ['50mg']), ('Sertraline', ['50mg'])
+]
+
+FREQUENCIES = [
+    'Take once daily', 'Take twice daily with meals', 'Take once daily in the morning',
+    'Take at bedtime', 'Take as needed for pain'
+]
+
+SYMPTOMS = [
+    'Shortness of breath', 'Swelling in legs', 'Fatigue', 'Chest pain', 'Dizziness',
+    'Cough', 'Nausea', 'Headache', 'Weakness', 'Fever', 'Confusion'
+]
+
+# What Agent 1 should report for each generated symptom (gold labels)
+SYMPTOM_LABELS = {
+    'Swelling in legs': ['swelling'],
+    'Chest pain': ['pain', 'chest pain']
+}
+
+INSTRUCTIONS = [
+    'Weigh yourself every morning before breakfast',
+    'Call doctor if weight increases by 3 pounds in one day',
+    'Limit sodium to 2000mg per day',
+    'Avoid salty foods like chips, canned soup, deli meats',
+    'Walk 10-15 minutes daily if able',
+    'Monitor blood pressure at home daily',
+    'Check blood sugar before meals and at bedtime',
+    'Drink plenty of fluids unless told otherwise',
+    'Elevate your legs when sitting',
+    'Rest and avoid heavy lifting for two weeks'
+]
+
+FOLLOWUPS = [
+    'Schedule appointment with cardiologist within 1 week',
+    'Return to primary care in 2 weeks',
+    'Follow up with endocrinology in one month',
+    'Recheck labs next week',
+    'Call office if shortness of breath worsens'
+]
+
+NARRATIVE = [
+    'Patient tolerated the hospital stay well and is ambulating independently',
+    'Family was present for discharge teaching and verbalized understanding',
+    'Patient was seen by physical therapy prior to discharge',
+    'Labs were reviewed with the patient at bedside',
+    'Patient reports improved appetite and sleep'
+]
+
+# How each vital is written in the document
+VITAL_LINES = {
+    'Blood Pressure': "Blood Pressure: {value}",
+    'Weight': "Weight: {value}",
+    'A1C (Diabetes)': "A1C: {value}"
+}
+
+SECTION_ORDER = ['diagnoses', 'vitals', 'medications', 'symptoms', 'instructions', 'followups']
+
+SECTION_HEADERS = {
+    'diagnoses': 'DIAGNOSES:',
+    'vitals': 'VITAL SIGNS:',
+    'medications': 'MEDICATIONS PRESCRIBED:',
+    'symptoms': 'SYMPTOMS ON ADMISSION:',
+    'instructions': 'INSTRUCTIONS:',
+    'followups': 'FOLLOW-UP:'
+}
+
+# Characters OCR commonly confuses
+OCR_CONFUSIONS = {
+    'l': '1', 'I': 'l', 'O': '0', 'o': '0', 'S': '5', 'B': '8', 'e': 'c', 'm': 'rn'
+}
+
+LAYOUTS = ('sectioned', 'narrative', 'shuffled')
+
+
+class DischargeDocumentGenerator:
+    """
+    Seeded generator for synthetic discharge documents.
+
+    The same seed and settings always give the same text, so benchmark runs
+    are comparable across commits.
+    """
+
+    def __init__(self, seed: int = 2376):
+        """Create a generator with its own random stream"""
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self._labels = None  # filled in while generate_labeled() runs
+
+    def generate(self,
+                 target_bytes: int = 1024,
+                 diagnosis_density: float = 0.5,
+                 medication_density: float = 0.5,
+                 ocr_noise: float = 0.0,
+                 layout: str = "sectioned",
+                 patient_name: Optional[str] = None,
+                 truncate: bool = True) -> str:
+        """
+        Generate one document of roughly target_bytes (UTF-8) bytes
+
+        Args:
+            target_bytes: Desired size - anything from 1 KB to 10 MB
+            diagnosis_density: 0-1, how many diagnosis lines each visit block carries
+            medication_density: 0-1, how many medication lines each visit block carries
+            ocr_noise: 0-1, per-character probability of an OCR-style corruption
+            layout: "sectioned" (headed sections), "narrative" (running prose)
+                    or "shuffled" (sections in random order)
+            patient_name: Name for the header (random if None)
+            truncate: Cut the text to exactly target_bytes (at a line break)
+
+        Returns:
+            Document text
+        """
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown layout: {layout}")
+
+        name = patient_name or self.rng.choice(['John Smith', 'Mary Johnson', 'Linda Garcia', 'Robert Lee'])
+        parts = [
+            "DISCHARGE SUMMARY",
+            f"Patient: {name} | Age: {self.rng.randint(60, 90)} | Date: Nov {self.rng.randint(1, 28)}, 2025",
+            ""
+        ]
+        size = sum(len(part) + 1 for part in parts)
+
+        while size < target_bytes:
+            block = self._visit_block(diagnosis_density, medication_density, layout)
+            parts.append(block)
+            size += len(block.encode('utf-8')) + 1
+
+        text = "\n".join(parts)
+        if truncate:
+            text = self._truncate(text, target_bytes)
+
+        if ocr_noise > 0:
+            text = self._add_ocr_noise(text, ocr_noise)
+
+        return text
+
+    def generate_corpus(self, count: int, **kwargs) -> List[str]:
+        """Generate several documents with the same settings"""
+        return [self.generate(**kwargs) for _ in range(count)]
+
+    def generate_labeled(self, **kwargs) -> Tuple[str, Dict[str, List[str]]]:
+        """
+        Generate one document plus the gold labels Agent 1 should extract from it
+
+        The text is not truncated, so every labeled item is really in it
+        (OCR noise, if requested, is applied after labeling on purpose).
+
+        Returns:
+            (text, {'diagnoses': [...], 'medications': [...], 'symptoms': [...],
+                    'test_results': ["Test|value", ...]}) - labels lowercased
+        """
+        self._labels = {'diagnoses': {}, 'medications': {}, 'symptoms': {}, 'test_results': {}}
+        try:
+            text = self.generate(truncate=False, **kwargs)
+            labels = {category: list(items) for category, items in self._labels.items()}
+        finally:
+            self._labels = None
+        return text, labels
+
+    def _label(self, category: str, *items: str):
+        if self._labels is not None:
+            for item in items:
+                self._labels[category][item.lower()] = None
+
+    def _visit_block(self, diagnosis_density: float, medication_density: float, layout: str) -> str:
+        """One visit's worth of content, laid out as requested"""
+        diagnoses = self._sample(DIAGNOSES, self._count(diagnosis_density, 5))
+        vitals = self._vitals()
+        medications = [self._medication() for _ in range(self._count(medication_density, 6))]
+        symptoms = self._sample(SYMPTOMS, self.rng.randint(0, 3))
+
+        for dx in diagnoses:
+            self._label('diagnoses', *DIAGNOSIS_LABELS.get(dx, [dx]))
+        for name, _, _ in medications:
+            self._label('medications', name)
+        for symptom in symptoms:
+            self._label('symptoms', *SYMPTOM_LABELS.get(symptom, [symptom]))
+        for test, value in vitals:
+            self._label('test_results', f"{test}|{value}")
+
+        sections = {
+            'diagnoses': [f"{i}. {dx}" for i, dx in enumerate(diagnoses, 1)],
+            'vitals': [VITAL_LINES[test].format(value=value) for test, value in vitals],
+            'medications': [f"- {name} {dose} - {frequency}" for name, dose, frequency in medications],
+            'symptoms': [f"- {s}" for s in symptoms],
+            'instructions': [f"- {s}" for s in self._sample(INSTRUCTIONS, self.rng.randint(1, 4))],
+            'followups': [f"- {s}" for s in self._sample(FOLLOWUPS, self.rng.randint(0, 2))],
+        }
+
+        if layout == 'narrative':
+            sentences = [line.lstrip('-0123456789. ') for key in SECTION_ORDER for line in sections[key]]
+            sentences += self._sample(NARRATIVE, 2)
+            self.rng.shuffle(sentences)
+            return ". ".join(sentences) + ".\n"
+
+        order = list(SECTION_ORDER)
+        if layout == 'shuffled':
+            self.rng.shuffle(order)
+
+        lines = []
+        for key in order:
+            if not sections[key]:
+                continue
+            lines.append(SECTION_HEADERS[key])
+            lines.extend(sections[key])
+            lines.append("")
+        lines.append(self.rng.choice(NARRATIVE) + ".")
+        lines.append("")
+        return "\n".join(lines)
+
+    def _vitals(self) -> List[Tuple[str, str]]:
+        """(test name as Agent 1 reports it, value as Agent 1 reports it)"""
+        vitals = [('Blood Pressure', f"{self.rng.randint(105, 185)}/{self.rng.randint(65, 110)}")]
+        if self.rng.random() < 0.7:
+            vitals.append(('Weight', f"{self.rng.randint(110, 290)} lbs"))
+        if self.rng.random() < 0.5:
+            vitals.append(('A1C (Diabetes)', f"{self.rng.randint(50, 110) / 10}%"))
+        return vitals
+
+    def _medication(self) -> Tuple[str, str, str]:
+        name, doses = self.rng.choice(MEDICATIONS)
+        return name, self.rng.choice(doses), self.rng.choice(FREQUENCIES)
+
+    def _count(self, density: float, max_items: int) -> int:
+        """Number of items out of max_items, each kept with probability density"""
+        return sum(1 for _ in range(max_items) if self.rng.random() < density)
+
+    def _sample(self, population: List[str], k: int) -> List[str]:
+        return self.rng.sample(population, min(k, len(population)))
+
+    def _truncate(self, text: str, target_bytes: int) -> str:
+        """Cut at the last line break before target_bytes"""
+        data = text.encode('utf-8')
+        if len(data) <= target_bytes:
+            return text
+        cut = data[:target_bytes].decode('utf-8', errors='ignore')
+        newline = cut.rfind('\n')
+        return cut[:newline] if newline > 0 else cut
+
+    def _add_ocr_noise(self, text: str, noise: float) -> str:
+        """Character confusions, stray pipes and hyphenated line breaks"""
+        noisy = []
+        for char in text:
+            roll = self.rng.random()
+            if roll >= noise:
+                noisy.append(char)
+            elif char in OCR_CONFUSIONS and roll < noise * 0.6:
+                noisy.append(OCR_CONFUSIONS[char])
+            elif char == ' ' and roll < noise * 0.8:
+                noisy.append(' | ')
+            elif char.isalpha() and roll < noise * 0.9:
+                noisy.append(char + '-\n')
+            else:
+                noisy.append(char)
+        return "".join(noisy)
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    generator = DischargeDocumentGenerator(seed=42)
+
+    print("Testing Discharge Document Generator\n")
+    sample = generator.generate(target_bytes=1024, ocr_noise=0.01)
+    print(sample)
+    print(f"\nGenerated {len(sample.encode('utf-8'))} bytes")
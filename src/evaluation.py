@@ -0,0 +1,222 @@
+"""
+Extraction Evaluation - Precision / recall / F1 for Agent 1 against gold labels
+Runs batch extraction over labeled documents and scores every category with NumPy set overlap
+
+Team: Oyinade Balogun, Hilary C Bruton, Glen Sam, Kaleb
+Course: ITAI 2376 - Boomer Health Summary Project
+
+Usage:
+    python evaluation.py                                # 2,000 synthetic labeled documents
+    python evaluation.py --gold ../data/raw/gold.jsonl  # your own labeled notes
+    python evaluation.py --save-baseline                # record the repo baseline
+    python evaluation.py --compare                      # fail if F1 dropped
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from agent1_extractor import MedicalExtractor
+from document_generator import DischargeDocumentGenerator
+
+# Categories scored, in report order
+CATEGORIES = ('diagnoses', 'medications', 'symptoms', 'test_results')
+
+# Baseline checked into the repo for accuracy comparisons
+BASELINE_PATH = os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'sample_outputs', 'accuracy_baseline.json'
+))
+
+
+def extraction_labels(extracted: Dict) -> Dict[str, List[str]]:
+    """Turn Agent 1's output into comparable lowercase labels per category"""
+    return {
+        'diagnoses': [dx.lower() for dx in extracted.get('diagnoses', [])],
+        'medications': [med['name'].lower() for med in extracted.get('medications', [])],
+        'symptoms': [symptom.lower() for symptom in extracted.get('symptoms', [])],
+        'test_results': [f"{result['test']}|{result['value']}".lower()
+                         for result in extracted.get('test_results', [])]
+    }
+
+
+def load_gold(path: str) -> Iterable[Tuple[str, Dict[str, List[str]]]]:
+    """
+    Read labeled documents from JSONL, one {"text": ..., "labels": {category: [...]}} per line
+
+    Test results are labeled as "Test name|value", e.g. "Blood Pressure|152/94".
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                labels = record.get('labels', {})
+                yield record['text'], {category: [item.lower() for item in labels.get(category, [])]
+                                       for category in CATEGORIES}
+
+
+def generate_gold(count: int, seed: int = 2376, **generator_options) -> Iterable[Tuple[str, Dict[str, List[str]]]]:
+    """Synthetic labeled documents from the seeded document generator"""
+    generator = DischargeDocumentGenerator(seed=seed)
+    for _ in range(count):
+        yield generator.generate_labeled(**generator_options)
+
+
+class ExtractionEvaluator:
+    """
+    Scores Agent 1 against gold labels.
+
+    Every (document, label) pair is encoded as one int64 - doc_index * vocab_size
+    + label_id - so matching gold against predicted labels for the whole corpus
+    is a single np.intersect1d per category instead of per-document set loops.
+    """
+
+    def __init__(self, extractor: MedicalExtractor = None, input_method: str = "free_text"):
+        """
+        Args:
+            extractor: Agent 1 instance to evaluate (built if None)
+            input_method: Passed to extract_batch for every document
+        """
+        self.extractor = extractor or MedicalExtractor()
+        self.input_method = input_method
+
+    def evaluate(self, labeled_documents: Iterable[Tuple[str, Dict[str, List[str]]]]) -> Dict:
+        """
+        Run extraction over (text, labels) pairs and score each category
+
+        Returns:
+            {'documents': n, 'categories': {category: metrics}, 'overall': metrics}
+            where metrics holds tp/fp/fn counts, precision, recall, f1 and
+            perfect_documents (documents with no error in that category)
+        """
+        texts, gold = [], []
+        for text, labels in labeled_documents:
+            texts.append(text)
+            gold.append(labels)
+
+        predicted = [extraction_labels(extracted)
+                     for extracted in self.extractor.extract_batch(texts, self.input_method)]
+
+        categories = {category: self._score(category, gold, predicted) for category in CATEGORIES}
+        totals = {key: sum(m[key] for m in categories.values()) for key in ('tp', 'fp', 'fn')}
+        overall = dict(totals, **self._ratios(totals['tp'], totals['fp'], totals['fn']))
+        return {'documents': len(texts), 'categories': categories, 'overall': overall}
+
+    def _score(self, category: str, gold: List[Dict], predicted: List[Dict]) -> Dict:
+        vocab: Dict[str, int] = {}
+        gold_docs, gold_ids = self._encode(category, gold, vocab)
+        pred_docs, pred_ids = self._encode(category, predicted, vocab)
+
+        size = max(len(vocab), 1)
+        gold_keys = np.unique(gold_docs * size + gold_ids)
+        pred_keys = np.unique(pred_docs * size + pred_ids)
+        true_keys = np.intersect1d(gold_keys, pred_keys, assume_unique=True)
+
+        tp, fp, fn = len(true_keys), len(pred_keys) - len(true_keys), len(gold_keys) - len(true_keys)
+
+        # A document is perfect when its gold and predicted counts both equal its TP count
+        docs = len(gold)
+        per_doc_tp = np.bincount(true_keys // size, minlength=docs)
+        per_doc_gold = np.bincount(gold_keys // size, minlength=docs)
+        per_doc_pred = np.bincount(pred_keys // size, minlength=docs)
+        perfect = int(np.count_nonzero((per_doc_tp == per_doc_gold) & (per_doc_tp == per_doc_pred)))
+
+        return dict({'tp': tp, 'fp': fp, 'fn': fn}, **self._ratios(tp, fp, fn), perfect_documents=perfect)
+
+    def _encode(self, category: str, documents: List[Dict], vocab: Dict[str, int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Flatten one category's labels into parallel doc-index / label-id arrays"""
+        counts = np.fromiter((len(labels.get(category, [])) for labels in documents),
+                             dtype=np.int64, count=len(documents))
+        ids = np.fromiter(
+            (vocab.setdefault(item, len(vocab)) for labels in documents for item in labels.get(category, [])),
+            dtype=np.int64, count=int(counts.sum())
+        )
+        return np.repeat(np.arange(len(documents), dtype=np.int64), counts), ids
+
+    @staticmethod
+    def _ratios(tp: int, fp: int, fn: int) -> Dict[str, float]:
+        precision = tp / (tp + fp) if tp + fp else 1.0
+        recall = tp / (tp + fn) if tp + fn else 1.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        return {'precision': round(precision, 4), 'recall': round(recall, 4), 'f1': round(f1, 4)}
+
+    def format_report(self, results: Dict) -> str:
+        """Human-readable accuracy table"""
+        output = [f"🎯 EXTRACTION ACCURACY ({results['documents']:,} documents)", ""]
+        output.append(f"   {'category':<14} {'precision':>9} {'recall':>8} {'f1':>7} {'tp':>8} {'fp':>7} {'fn':>7}")
+        rows = list(results['categories'].items()) + [('overall', results['overall'])]
+        for name, m in rows:
+            output.append(
+                f"   {name:<14} {m['precision']:>9.1%} {m['recall']:>8.1%} {m['f1']:>7.3f} "
+                f"{m['tp']:>8,} {m['fp']:>7,} {m['fn']:>7,}"
+            )
+        return "\n".join(output)
+
+    def compare(self, results: Dict, baseline: Dict, tolerance: float = 0.005) -> List[str]:
+        """
+        Compare F1 against a saved baseline
+
+        Returns:
+            Lines describing every category whose F1 dropped by more than tolerance
+        """
+        regressions = []
+        current = dict(results['categories'], overall=results['overall'])
+        before_all = dict(baseline['categories'], overall=baseline['overall'])
+        for name, m in current.items():
+            if name not in before_all:
+                continue
+            before = before_all[name]['f1']
+            if m['f1'] < before - tolerance:
+                regressions.append(f"{name}: F1 {m['f1']:.3f} vs baseline {before:.3f} ({m['f1'] - before:+.3f})")
+        return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Score Agent 1 extraction against gold labels")
+    parser.add_argument('--gold', help="Labeled JSONL file (default: synthetic documents)")
+    parser.add_argument('--generate', type=int, default=2000, help="Synthetic documents to generate")
+    parser.add_argument('--seed', type=int, default=2376)
+    parser.add_argument('--size', type=int, default=2048, help="Approximate bytes per synthetic document")
+    parser.add_argument('--ocr-noise', type=float, default=0.0)
+    parser.add_argument('--layout', default='sectioned')
+    parser.add_argument('--input-method', default='free_text')
+    parser.add_argument('--save-baseline', metavar='PATH', nargs='?', const=BASELINE_PATH)
+    parser.add_argument('--compare', metavar='PATH', nargs='?', const=BASELINE_PATH)
+    parser.add_argument('--tolerance', type=float, default=0.005,
+                        help="Allowed F1 drop before a category counts as regressed")
+    args = parser.parse_args(argv)
+
+    if args.gold:
+        labeled = load_gold(args.gold)
+    else:
+        labeled = generate_gold(args.generate, seed=args.seed, target_bytes=args.size,
+                                ocr_noise=args.ocr_noise, layout=args.layout)
+
+    evaluator = ExtractionEvaluator(input_method=args.input_method)
+    results = evaluator.evaluate(labeled)
+    print(evaluator.format_report(results))
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Baseline saved to: {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = evaluator.compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\n❌ ACCURACY REGRESSIONS:")
+            for line in regressions:
+                print(f"   • {line}")
+            return 1
+        print("\n✅ No accuracy regressions against baseline")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""
+Feedback Store - Incremental reward aggregation across users
+Running counts and mean rewards per explanation, tip and diagnosis, in compact arrays
+
+Team: Oyinade Balogun, Hilary C Bruton, Glen Sam, Kaleb
+Course: ITAI 2376 - Boomer Health Summary Project
+"""
+
+import hashlib
+import os
+import threading
+from array import array
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# What a rating is credited to
+FEEDBACK_KINDS = ('explanation', 'tip', 'diagnosis')
+
+# Action-plan lists whose tips are credited with a summary's reward
+TIP_SECTIONS = ('diet', 'exercise', 'daily_habits', 'medication_reminders')
+
+# Variants are ranked by a mean shrunk toward PRIOR_MEAN, as if each had
+# PRIOR_WEIGHT extra ratings - one 5-star rating should not beat a hundred 4.8s
+PRIOR_MEAN = 3.0
+PRIOR_WEIGHT = 5.0
+
+def variant_id(text: str) -> str:
+    """Stable short ID for one wording of an explanation or tip"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]
+
+
+class FeedbackStore:
+    """
+    Aggregates collect_feedback rewards by (kind, subject, variant).
+
+    e.g. ('explanation', 'high blood pressure', <id of one wording>),
+    ('tip', 'diet', <id of one tip>) or ('diagnosis', 'hypertension', '').
+
+    Counts and running means live in typed arrays (8 bytes per value, not a
+    Python object each) indexed by a key -> row dict, so a rating is one
+    dict lookup and two array writes. Each subject keeps its best-ranked
+    variant row, so best_variant() is a lookup too.
+    """
+
+    def __init__(self, path: Optional[str] = None, autosave_every: int = 10000):
+        """
+        Args:
+            path: .npz file to load from and save to (None = memory only)
+            autosave_every: Save to path after this many new ratings (0 = only on save())
+        """
+        self.path = path
+        self.autosave_every = autosave_every
+        self._lock = threading.Lock()
+        self._unsaved = 0
+
+        self._rows: Dict[tuple, int] = {}       # (kind, subject, variant) -> row
+        self._keys: List[tuple] = []            # row -> (kind, subject, variant)
+        self._labels: List[str] = []            # row -> text of the variant
+        self._subjects: Dict[tuple, int] = {}   # (kind, subject) -> subject id
+        self._subject_rows: List[List[int]] = []  # subject id -> its rows
+        self._best = array('q')                 # subject id -> best row
+        self.counts = array('q')                # row -> ratings
+        self.means = array('d')                 # row -> running mean reward
+        self._row_subject = array('q')          # row -> subject id
+
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def record(self, kind: str, subject: str, variant: str, reward: float, label: str = ""):
+        """Add one rating"""
+        if kind not in FEEDBACK_KINDS:
+            raise ValueError(f"Unknown feedback kind: {kind}")
+        with self._lock:
+            self._record(kind, subject.lower(), variant, reward, label)
+            self._after_update(1)
+
+    def record_summary(self, summary: Dict, reward: float, previous_reward: Optional[float] = None) -> int:
+        """
+        Credit a summary's reward to every explanation, tip and diagnosis it showed
+
+        Args:
+            previous_reward: The reward this summary was credited with before, if
+                             any - it is replaced instead of counted a second time
+
+        Returns:
+            Number of ratings added (or replaced)
+        """
+        ratings = []
+        for dx in summary['section_1_diagnoses']['diagnoses']:
+            ratings.append(('diagnosis', dx['diagnosis'].lower(), '', dx['diagnosis']))
+            ratings.append(('explanation', dx['simple_name'].lower(), variant_id(dx['explanation']),
+                            dx['explanation']))
+        plan = summary['section_3_action_plan']
+        for section in TIP_SECTIONS:
+            for tip in plan.get(section, []):
+                ratings.append(('tip', section, variant_id(tip), tip))
+
+        with self._lock:
+            for kind, subject, variant, label in ratings:
+                if previous_reward is None:
+                    self._record(kind, subject, variant, reward, label)
+                else:
+                    self._replace(kind, subject, variant, previous_reward, reward, label)
+            self._after_update(len(ratings))
+        return len(ratings)
+
+    def best_variant(self, kind: str, subject: str) -> Optional[Dict]:
+        """
+        Best-ranked variant for a subject, e.g. best_variant('explanation', 'high blood pressure')
+
+        Returns:
+            {'variant', 'label', 'count', 'mean', 'score'} or None if never rated
+        """
+        with self._lock:
+            subject_id = self._subjects.get((kind, subject.lower()))
+            if subject_id is None:
+                return None
+            return self._describe(self._best[subject_id])
+
+    def stats(self, kind: str, subject: str, variant: str = "") -> Optional[Dict]:
+        """Count and mean for one variant (None if never rated)"""
+        with self._lock:
+            row = self._rows.get((kind, subject.lower(), variant))
+            return None if row is None else self._describe(row)
+
+    def top(self, kind: str, limit: int = 10, min_count: int = 1) -> List[Dict]:
+        """Highest-scoring variants of one kind (a full scan - for reports, not per request)"""
+        with self._lock:
+            rows = [row for key, row in self._rows.items()
+                    if key[0] == kind and self.counts[row] >= min_count]
+            if not rows:
+                return []
+            rows.sort(key=self._score, reverse=True)
+            return [self._describe(row) for row in rows[:limit]]
+
+    def save(self, path: Optional[str] = None) -> str:
+        """Write the store to an .npz file (atomically replaces the old one)"""
+        path = path or self.path
+        if not path:
+            raise ValueError("No path to save the feedback store to")
+        with self._lock:
+            self._save(path)
+        return path
+
+    # ------------------------------------------------------------------
+    # Internals (called under self._lock)
+    # ------------------------------------------------------------------
+
+    def _record(self, kind: str, subject: str, variant: str, reward: float, label: str):
+        key = (kind, subject, variant)
+        row = self._rows.get(key)
+        if row is None:
+            row = self._add_row(key, label)
+
+        subject_id = self._row_subject[row]
+        best = self._best[subject_id]
+        leader_drops = best == row and reward < self._score(row)
+
+        count = self.counts[row] + 1
+        self.counts[row] = count
+        self.means[row] += (reward - self.means[row]) / count
+
+        # Keep the subject's leader current
+        if leader_drops:
+            # Re-rank this subject's variants (a handful of wordings)
+            self._best[subject_id] = max(self._subject_rows[subject_id], key=self._score)
+        elif best != row and self._score(row) > self._score(best):
+            self._best[subject_id] = row
+
+    def _replace(self, kind: str, subject: str, variant: str, old: float, reward: float, label: str):
+        """Swap one earlier rating of old for reward (the count stays the same)"""
+        row = self._rows.get((kind, subject, variant))
+        if row is None or self.counts[row] == 0:
+            self._record(kind, subject, variant, reward, label)
+            return
+        self.means[row] += (reward - old) / self.counts[row]
+        subject_id = self._row_subject[row]
+        self._best[subject_id] = max(self._subject_rows[subject_id], key=self._score)
+
+    def _add_row(self, key: tuple, label: str) -> int:
+        """New zero-count row (arrays grow by append, amortized O(1))"""
+        row = len(self._keys)
+        self._rows[key] = row
+        self._keys.append(key)
+        self._labels.append(label)
+        self.counts.append(0)
+        self.means.append(0.0)
+
+        subject_key = key[:2]
+        subject_id = self._subjects.get(subject_key)
+        if subject_id is None:
+            subject_id = len(self._subject_rows)
+            self._subjects[subject_key] = subject_id
+            self._subject_rows.append([])
+            self._best.append(row)
+        self._subject_rows[subject_id].append(row)
+        self._row_subject.append(subject_id)
+        return row
+
+    def _score(self, row: int) -> float:
+        count = self.counts[row]
+        return (self.means[row] * count + PRIOR_MEAN * PRIOR_WEIGHT) / (count + PRIOR_WEIGHT)
+
+    def _describe(self, row: int) -> Dict:
+        return {
+            'variant': self._keys[row][2],
+            'label': self._labels[row],
+            'count': self.counts[row],
+            'mean': self.means[row],
+            'score': self._score(row)
+        }
+
+    def _after_update(self, added: int):
+        self._unsaved += added
+        if self.path and self.autosave_every and self._unsaved >= self.autosave_every:
+            self._save(self.path)
+
+    def _save(self, path: str):
+        keys = self._keys
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = path + ".tmp.npz"
+        np.savez_compressed(
+            temp_path,
+            kinds=np.array([key[0] for key in keys], dtype=str),
+            subjects=np.array([key[1] for key in keys], dtype=str),
+            variants=np.array([key[2] for key in keys], dtype=str),
+            labels=np.array(self._labels, dtype=str),
+            counts=np.frombuffer(self.counts, dtype=np.int64),
+            means=np.frombuffer(self.means, dtype=np.float64)
+        )
+        os.replace(temp_path, path)
+        self._unsaved = 0
+
+    def _load(self, path: str):
+        with np.load(path) as data:
+            keys = zip(data['kinds'].tolist(), data['subjects'].tolist(), data['variants'].tolist())
+            labels = data['labels'].tolist()
+            counts, means = data['counts'], data['means']
+        for row, key in enumerate(keys):
+            self._add_row(key, labels[row])
+        self.counts = array('q', counts.astype(np.int64).tobytes())
+        self.means = array('d', means.astype(np.float64).tobytes())
+        for subject_id, subject_rows in enumerate(self._subject_rows):
+            self._best[subject_id] = max(subject_rows, key=self._score)
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    import random
+    import time
+
+    store = FeedbackStore()
+    rng = random.Random(7)
+    wordings = {
+        'A': "Your blood pressure is higher than it should be.",
+        'B': "Your heart is pumping blood with more force than is healthy.",
+    }
+
+    print("Testing Feedback Store\n")
+    ids = {which: variant_id(text) for which, text in wordings.items()}
+    ratings = [(which, min(5.0, max(1.0, rng.gauss(4.2 if which == 'A' else 3.6, 0.8))))
+               for which in rng.choices('AB', k=1_000_000)]
+
+    started = time.perf_counter()
+    for which, reward in ratings:
+        store.record('explanation', 'High Blood Pressure', ids[which], reward, wordings[which])
+    elapsed = time.perf_counter() - started
+    print(f"1,000,000 ratings in {elapsed:.2f} s ({1e6 * elapsed / 1_000_000:.2f} µs each)")
+
+    best = store.best_variant('explanation', 'high blood pressure')
+    print(f"Best explanation: \"{best['label']}\" (mean {best['mean']:.2f} over {best['count']:,} ratings)")
@@ -0,0 +1,102 @@
+"""
+Knowledge Snapshot - Precompiled agent knowledge tables
+Loads keyword lists and explanation dicts from a marshal snapshot instead of rebuilding them
+
+Team: Oyinade Balogun, Hilary C Bruton, Glen Sam, Kaleb
+Course: ITAI 2376 - Boomer Health Summary Project
+"""
+
+import marshal
+import os
+import sys
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping
+
+# Snapshots live next to the bytecode cache Python already maintains
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '__pycache__')
+
+# Tables already loaded in this process, by snapshot name (frozen)
+_loaded: Dict[str, Mapping] = {}
+_load_lock = threading.Lock()
+
+
+def _source_stamp(source_file: str) -> tuple:
+    """Identifies the source revision a snapshot was built from"""
+    stat = os.stat(source_file)
+    return (stat.st_mtime_ns, stat.st_size, marshal.version, sys.version_info[:2])
+
+
+def freeze(value: Any) -> Any:
+    """Read-only deep copy: dicts become mapping proxies, lists become tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def load_tables(name: str, source_file: str, builder: Callable[[], Dict]) -> Mapping:
+    """
+    Return the knowledge tables for one agent.
+
+    Order of preference: tables already loaded in this process, then the
+    on-disk snapshot (if it matches the current source file), then
+    builder() - whose result is written back as the new snapshot.
+    The returned tables are frozen, so every agent instance and thread
+    can share them safely.
+
+    Args:
+        name: Snapshot name, e.g. "agent1"
+        source_file: Module that defines the literals (its mtime invalidates the snapshot)
+        builder: Function that builds the tables from literals
+    """
+    tables = _loaded.get(name)
+    if tables is not None:
+        return tables
+
+    with _load_lock:
+        if name not in _loaded:
+            _loaded[name] = freeze(_read_or_build(name, source_file, builder))
+        return _loaded[name]
+
+
+def _read_or_build(name: str, source_file: str, builder: Callable[[], Dict]) -> Dict:
+    """The matching on-disk snapshot, else freshly built tables (saved as the new snapshot)"""
+    tables = None
+    path = os.path.join(SNAPSHOT_DIR, f"{name}.knowledge.marshal")
+    try:
+        stamp = _source_stamp(source_file)
+    except OSError:
+        stamp = None
+
+    if stamp is not None:
+        try:
+            with open(path, 'rb') as f:
+                saved_stamp, saved_tables = marshal.load(f)
+            if tuple(saved_stamp) == stamp:
+                tables = saved_tables
+        except (OSError, EOFError, ValueError, TypeError):
+            tables = None
+
+    if tables is None:
+        tables = builder()
+        if stamp is not None:
+            _write_snapshot(path, stamp, tables)
+
+    return tables
+
+
+def _write_snapshot(path: str, stamp: tuple, tables: Dict):
+    """Best-effort atomic write - a read-only install just skips the snapshot"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            marshal.dump((stamp, tables), f)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
@@ -0,0 +1,323 @@
+"""
+Mapped Corpus - Concatenated text blob + offset index, read through mmap
+Lets batch workers decode only the documents they are handed, with no corpus load at startup
+
+Team: Oyinade Balogun, Hilary C Bruton, Glen Sam, Kaleb
+Course: ITAI 2376 - Boomer Health Summary Project
+
+Usage:
+    python mapped_corpus.py build ../data/raw/notes.csv ../data/processed/notes.corpus --text-column TEXT
+    python mapped_corpus.py extract ../data/processed/notes.corpus --workers 8
+"""
+
+import argparse
+import json
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Index row: where one document's UTF-8 bytes sit in the blob
+SPAN_DTYPE = np.dtype([('offset', np.int64), ('length', np.int64)])
+
+Span = Tuple[int, int]
+
+
+def index_path(corpus_path: str) -> str:
+    return corpus_path + ".idx.npy"
+
+
+def ids_path(corpus_path: str) -> str:
+    return corpus_path + ".ids"
+
+
+class _IndexWriter:
+    """Buffers (offset, length) rows, then writes them as <path>.idx.npy"""
+
+    def __init__(self, path: str, buffer_rows: int):
+        self.path = path
+        self._spans_path = path + ".spans.tmp"
+        self._spans = open(self._spans_path, 'wb')
+        self._rows = np.empty(buffer_rows, dtype=SPAN_DTYPE)
+        self.count = 0
+
+    def add(self, offset: int, length: int):
+        buffer_rows = len(self._rows)
+        self._rows[self.count % buffer_rows] = (offset, length)
+        self.count += 1
+        if self.count % buffer_rows == 0:
+            self._spans.write(self._rows.tobytes())
+
+    def finish(self):
+        self._spans.write(self._rows[:self.count % len(self._rows)].tobytes())
+        self._spans.close()
+        # Rewrite the raw rows as a .npy file so readers can np.load(mmap_mode='r') it
+        index = np.lib.format.open_memmap(index_path(self.path), mode='w+', dtype=SPAN_DTYPE, shape=(self.count,))
+        if self.count:
+            index[:] = np.fromfile(self._spans_path, dtype=SPAN_DTYPE)
+        index.flush()
+        del index
+        os.remove(self._spans_path)
+
+    def abort(self):
+        self._spans.close()
+        os.remove(self._spans_path)
+
+
+def write_corpus(documents: Iterable, corpus_path: str, buffer_rows: int = 65536) -> int:
+    """
+    Write documents as one blob plus an offset/length index
+
+    Args:
+        documents: Texts, or (note_id, text) pairs to also write an ID file -
+                   one or the other for every document
+        corpus_path: Blob path; the index goes to <path>.idx.npy, IDs to <path>.ids
+                     (one per line) with their own index <path>.ids.idx.npy
+        buffer_rows: Index rows kept in memory before they are flushed
+
+    Returns:
+        Number of documents written
+
+    Raises:
+        ValueError: some documents are (note_id, text) pairs and some are not
+    """
+    os.makedirs(os.path.dirname(corpus_path) or '.', exist_ok=True)
+    offset = id_offset = 0
+    keyed = None
+    ids_file = id_index = None
+    index = _IndexWriter(corpus_path, buffer_rows)
+
+    try:
+        with open(corpus_path, 'wb') as blob:
+            for document in documents:
+                if keyed is None:
+                    keyed = isinstance(document, tuple)
+                    if keyed:
+                        ids_file = open(ids_path(corpus_path), 'wb')
+                        id_index = _IndexWriter(ids_path(corpus_path), buffer_rows)
+                elif isinstance(document, tuple) != keyed:
+                    # An ID file covering only some rows would pair IDs with the wrong notes
+                    raise ValueError(f"Document {index.count} is {'not ' if keyed else ''}a (note_id, text) "
+                                     f"pair - pass all texts or all pairs")
+                if keyed:
+                    note_id, document = document
+                    data = str(note_id).replace("\n", " ").encode('utf-8')
+                    ids_file.write(data + b"\n")
+                    id_index.add(id_offset, len(data))
+                    id_offset += len(data) + 1
+                data = (document or "").encode('utf-8')
+                blob.write(data)
+                index.add(offset, len(data))
+                offset += len(data)
+    except BaseException:
+        index.abort()
+        if ids_file is not None:
+            ids_file.close()
+            id_index.abort()
+        # Leave no half-written corpus (or a stale index beside it)
+        _remove(corpus_path, index_path(corpus_path), ids_path(corpus_path), index_path(ids_path(corpus_path)))
+        raise
+    if ids_file is not None:
+        ids_file.close()
+
+    index.finish()
+    if id_index is not None:
+        id_index.finish()
+    else:
+        # IDs from an earlier corpus at this path would no longer match
+        _remove(ids_path(corpus_path), index_path(ids_path(corpus_path)))
+    return index.count
+
+
+def _remove(*paths: str):
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+class MappedCorpus:
+    """
+    Read-only view of a corpus written by write_corpus().
+
+    Opening maps the blob and the index without reading them, so startup
+    cost does not grow with the corpus; read(offset, length) decodes one
+    slice and the OS pages in only those bytes. Pickles as its path, so it
+    can be handed to worker processes, which map the files themselves.
+    """
+
+    def __init__(self, corpus_path: str):
+        """
+        Args:
+            corpus_path: Blob path given to write_corpus()
+        """
+        self.path = corpus_path
+        self.index = np.load(index_path(corpus_path), mmap_mode='r')
+        self._file = open(corpus_path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        # mmap cannot map an empty file
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._ids: Optional[MappedCorpus] = None
+
+    def __reduce__(self):
+        return (MappedCorpus, (self.path,))
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __getitem__(self, position: int) -> str:
+        offset, length = self.index[position]
+        return self.read(int(offset), int(length))
+
+    def __iter__(self) -> Iterator[str]:
+        for offset, length in self.spans():
+            yield self.read(offset, length)
+
+    def read(self, offset: int, length: int) -> str:
+        """Decode one document from its (offset, length) span"""
+        return self._map[offset:offset + length].decode('utf-8')
+
+    def spans(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Span]:
+        """(offset, length) pairs for documents start..stop"""
+        for offset, length in self.index[start:stop].tolist():
+            yield offset, length
+
+    def batches(self, batch_size: int) -> Iterator[List[Span]]:
+        """Span lists of batch_size documents - the unit of work handed to workers"""
+        for start in range(0, len(self), batch_size):
+            yield list(self.spans(start, start + batch_size))
+
+    def note_id(self, position: int) -> str:
+        """ID written alongside document position (its row number if there were none)"""
+        ids = self._id_corpus()
+        if ids is not None:
+            return ids[position]
+        row = range(len(self))[position]
+        return next(self.iter_note_ids(row, row + 1))
+
+    def iter_note_ids(self, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+        """IDs of documents start..stop, read as they are consumed"""
+        ids = self._id_corpus()
+        if ids is not None:
+            for offset, length in ids.spans(start, stop):
+                yield ids.read(offset, length)
+        elif os.path.exists(ids_path(self.path)):
+            # Corpus written before IDs had an index: stream the lines
+            with open(ids_path(self.path), encoding='utf-8') as f:
+                for line in islice(f, start, stop):
+                    yield line.rstrip("\n")
+        else:
+            yield from (str(i) for i in range(len(self))[start:stop])
+
+    def _id_corpus(self) -> Optional['MappedCorpus']:
+        """The ID file, mapped like a corpus (None if it has no index)"""
+        if self._ids is None and os.path.exists(index_path(ids_path(self.path))):
+            self._ids = MappedCorpus(ids_path(self.path))
+        return self._ids
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+        if self._ids is not None:
+            self._ids.close()
+
+    def __enter__(self) -> 'MappedCorpus':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Per-process state for extract_corpus workers (built on a worker's first batch)
+_worker_state: Dict = {}
+
+
+def _extract_spans(corpus_path: str, spans: List[Span], input_method: str) -> List[Dict]:
+    """Worker: decode the given spans from the mapped corpus and run Agent 1 on each"""
+    if _worker_state.get('path') != corpus_path:
+        from agent1_extractor import MedicalExtractor
+        _worker_state.update(path=corpus_path, corpus=MappedCorpus(corpus_path), extractor=MedicalExtractor())
+    corpus, extractor = _worker_state['corpus'], _worker_state['extractor']
+
+    results = []
+    for extracted in extractor.extract_batch((corpus.read(offset, length) for offset, length in spans), input_method):
+        record = extracted.to_dict()
+        record.pop('raw_text_preview', None)
+        results.append(record)
+    return results
+
+
+def extract_corpus(corpus_path: str,
+                   output_path: Optional[str] = None,
+                   max_workers: Optional[int] = None,
+                   batch_size: int = 256,
+                   input_method: str = "free_text") -> Dict:
+    """
+    Run Agent 1 over a mapped corpus in worker processes
+
+    Only (offset, length) spans cross the process boundary; each worker
+    maps the corpus itself and decodes just its batch.
+
+    Args:
+        corpus_path: Corpus written by write_corpus()
+        output_path: JSONL destination (default: <corpus>.extracted.jsonl)
+        max_workers: Worker processes (default: one per CPU)
+        batch_size: Documents per task
+        input_method: Recorded on every extraction
+
+    Returns:
+        {'notes', 'output_path', 'quality': {level: count}}
+    """
+    output_path = output_path or corpus_path + ".extracted.jsonl"
+    stats = {'notes': 0, 'output_path': output_path, 'quality': {'high': 0, 'medium': 0, 'low': 0}}
+
+    with MappedCorpus(corpus_path) as corpus, \
+            ProcessPoolExecutor(max_workers=max_workers) as pool, \
+            open(output_path, 'w', encoding='utf-8') as out:
+        note_ids = corpus.iter_note_ids()
+        work = partial(_extract_spans, corpus_path, input_method=input_method)
+        for results in pool.map(work, corpus.batches(batch_size)):
+            for record in results:
+                out.write(json.dumps({'note_id': next(note_ids), 'extraction': record}) + "\n")
+                stats['quality'][record['extraction_quality']] += 1
+                stats['notes'] += 1
+    return stats
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build or extract a memory-mapped note corpus")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help="Convert a CSV/TSV/Parquet export into a mapped corpus")
+    build.add_argument('source')
+    build.add_argument('corpus')
+    build.add_argument('--text-column', default='text')
+    build.add_argument('--id-column', default='note_id', help="Use '' to number rows instead")
+    build.add_argument('--chunk-size', type=int, default=1000)
+
+    extract = commands.add_parser('extract', help="Run Agent 1 over a mapped corpus")
+    extract.add_argument('corpus')
+    extract.add_argument('--output')
+    extract.add_argument('--workers', type=int)
+    extract.add_argument('--batch-size', type=int, default=256)
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        from corpus_loader import ClinicalNoteLoader
+        loader = ClinicalNoteLoader(args.source, args.text_column, args.id_column or None, args.chunk_size)
+        count = write_corpus(loader.iter_notes(), args.corpus)
+        print(f"📚 {count:,} notes written to: {args.corpus}")
+        return 0
+
+    stats = extract_corpus(args.corpus, args.output, args.workers, args.batch_size)
+    print(f"💾 {stats['notes']:,} extractions written to: {stats['output_path']}")
+    print(f"   Quality: {stats['quality']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
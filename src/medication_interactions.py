@@ -0,0 +1,254 @@
+"""
+Medication Interactions - Sparse pair index over a local interaction table
+Flags risky medication combinations with constant-time lookups per pair
+
+Team: Oyinade Balogun, Hilary C Bruton, Glen Sam, Kaleb
+Course: ITAI 2376 - Boomer Health Summary Project
+"""
+
+import csv
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from knowledge_snapshot import load_tables
+from records import MedicationInteraction
+
+# Canonical drug IDs fit in 20 bits, so a pair packs into one int key
+ID_BITS = 20
+
+
+def pair_key(first_id: int, second_id: int) -> int:
+    """Order-independent int key for a pair of canonical drug IDs"""
+    if first_id > second_id:
+        first_id, second_id = second_id, first_id
+    return (first_id << ID_BITS) | second_id
+
+
+def _build_knowledge() -> Dict:
+    """Compile the interaction table into ID lookups and a pair index (cached by knowledge_snapshot)"""
+    tables = {}
+
+    # Canonical drug name -> other names it appears under (brands, abbreviations)
+    drug_aliases = {
+        'aspirin': ['asa', 'acetylsalicylic acid', 'bayer', 'ecotrin'],
+        'warfarin': ['coumadin', 'jantoven'],
+        'ibuprofen': ['advil', 'motrin'],
+        'naproxen': ['aleve', 'naprosyn'],
+        'clopidogrel': ['plavix'],
+        'lisinopril': ['zestril', 'prinivil'],
+        'losartan': ['cozaar'],
+        'spironolactone': ['aldactone'],
+        'potassium chloride': ['potassium', 'klor-con', 'k-dur'],
+        'furosemide': ['lasix'],
+        'digoxin': ['lanoxin'],
+        'metoprolol': ['lopressor', 'toprol', 'toprol xl'],
+        'insulin': ['lantus', 'humalog', 'novolog'],
+        'metformin': ['glucophage'],
+        'prednisone': ['deltasone'],
+        'sertraline': ['zoloft'],
+        'tramadol': ['ultram'],
+        'gabapentin': ['neurontin'],
+        'oxycodone': ['oxycontin', 'percocet'],
+        'hydrocodone': ['norco', 'vicodin'],
+        'simvastatin': ['zocor'],
+        'atorvastatin': ['lipitor'],
+        'amlodipine': ['norvasc'],
+        'clarithromycin': ['biaxin'],
+        'amiodarone': ['cordarone', 'pacerone'],
+        'omeprazole': ['prilosec'],
+        'levothyroxine': ['synthroid', 'levoxyl'],
+        'calcium carbonate': ['calcium', 'tums'],
+    }
+
+    # (drug, drug, severity, what could happen) - educational wording only
+    interactions = [
+        ('warfarin', 'aspirin', 'major',
+         "Warfarin and aspirin together can raise the risk of serious bleeding"),
+        ('warfarin', 'ibuprofen', 'major',
+         "Warfarin and ibuprofen together can raise the risk of serious bleeding"),
+        ('warfarin', 'naproxen', 'major',
+         "Warfarin and naproxen together can raise the risk of serious bleeding"),
+        ('warfarin', 'sertraline', 'moderate',
+         "Sertraline can add to warfarin's blood-thinning effect and raise bleeding risk"),
+        ('warfarin', 'amiodarone', 'major',
+         "Amiodarone can make warfarin much stronger, raising bleeding risk"),
+        ('clopidogrel', 'aspirin', 'moderate',
+         "Clopidogrel and aspirin together raise bleeding risk (sometimes prescribed together on purpose)"),
+        ('clopidogrel', 'omeprazole', 'moderate',
+         "Omeprazole may make clopidogrel work less well"),
+        ('aspirin', 'ibuprofen', 'moderate',
+         "Ibuprofen can block aspirin's heart protection and both can irritate the stomach"),
+        ('aspirin', 'lisinopril', 'minor',
+         "Aspirin may slightly weaken lisinopril's blood pressure effect"),
+        ('aspirin', 'sertraline', 'moderate',
+         "Sertraline with aspirin can raise the risk of stomach bleeding"),
+        ('lisinopril', 'ibuprofen', 'moderate',
+         "Ibuprofen can weaken lisinopril and strain the kidneys"),
+        ('lisinopril', 'naproxen', 'moderate',
+         "Naproxen can weaken lisinopril and strain the kidneys"),
+        ('lisinopril', 'losartan', 'major',
+         "Taking lisinopril and losartan together can raise potassium and strain the kidneys"),
+        ('lisinopril', 'spironolactone', 'major',
+         "Lisinopril with spironolactone can raise potassium to unsafe levels"),
+        ('lisinopril', 'potassium chloride', 'major',
+         "Lisinopril with potassium supplements can raise potassium to unsafe levels"),
+        ('losartan', 'spironolactone', 'major',
+         "Losartan with spironolactone can raise potassium to unsafe levels"),
+        ('losartan', 'potassium chloride', 'major',
+         "Losartan with potassium supplements can raise potassium to unsafe levels"),
+        ('furosemide', 'lisinopril', 'moderate',
+         "Furosemide with lisinopril can make blood pressure drop too low, causing dizziness"),
+        ('furosemide', 'ibuprofen', 'moderate',
+         "Ibuprofen can make furosemide work less well and strain the kidneys"),
+        ('furosemide', 'digoxin', 'moderate',
+         "Furosemide can lower potassium, which makes digoxin side effects more likely"),
+        ('insulin', 'metoprolol', 'moderate',
+         "Metoprolol can hide the warning signs of low blood sugar"),
+        ('prednisone', 'insulin', 'moderate',
+         "Prednisone can raise blood sugar, so insulin needs may change"),
+        ('prednisone', 'metformin', 'moderate',
+         "Prednisone can raise blood sugar and work against metformin"),
+        ('prednisone', 'ibuprofen', 'moderate',
+         "Prednisone with ibuprofen raises the risk of stomach ulcers and bleeding"),
+        ('sertraline', 'tramadol', 'major',
+         "Sertraline with tramadol can cause serotonin syndrome or seizures"),
+        ('gabapentin', 'oxycodone', 'major',
+         "Gabapentin with oxycodone can cause heavy drowsiness and slowed breathing"),
+        ('gabapentin', 'hydrocodone', 'major',
+         "Gabapentin with hydrocodone can cause heavy drowsiness and slowed breathing"),
+        ('simvastatin', 'amlodipine', 'moderate',
+         "Amlodipine raises simvastatin levels - higher simvastatin doses can cause muscle problems"),
+        ('simvastatin', 'clarithromycin', 'major',
+         "Clarithromycin can raise simvastatin to levels that damage muscles"),
+        ('simvastatin', 'amiodarone', 'moderate',
+         "Amiodarone raises simvastatin levels and the risk of muscle problems"),
+        ('atorvastatin', 'clarithromycin', 'moderate',
+         "Clarithromycin can raise atorvastatin levels and the risk of muscle problems"),
+        ('levothyroxine', 'calcium carbonate', 'moderate',
+         "Calcium can block levothyroxine absorption if taken at the same time"),
+        ('levothyroxine', 'omeprazole', 'minor',
+         "Omeprazole may reduce how much levothyroxine your body absorbs"),
+    ]
+
+    tables['drug_names'], tables['drug_ids'] = _assign_ids(drug_aliases, interactions)
+    tables['interactions'] = [(tables['drug_ids'][a], tables['drug_ids'][b], severity, warning)
+                              for a, b, severity, warning in interactions]
+    tables['pair_index'] = {pair_key(a, b): i for i, (a, b, _, _) in enumerate(tables['interactions'])}
+
+    return tables
+
+
+def _assign_ids(drug_aliases: Mapping[str, Iterable[str]], interactions: Iterable) -> tuple:
+    """Canonical names get dense IDs; every alias maps to its drug's ID"""
+    ids = {name: i for i, name in enumerate(drug_aliases)}
+    for first, second, *_ in interactions:
+        for name in (first, second):
+            if name not in ids:
+                ids[name] = len(ids)
+    names = list(ids)
+    for name, aliases in drug_aliases.items():
+        for alias in aliases:
+            ids.setdefault(alias, ids[name])
+    return names, ids
+
+
+class MedicationInteractionIndex:
+    """
+    Sparse pair index over the interaction table.
+
+    Drug names (and brand names) resolve to canonical integer IDs, and each
+    known interacting pair is one entry in a dict keyed by the packed pair.
+    Checking k medications is k name lookups plus k*(k-1)/2 dict lookups,
+    however large the drug lexicon is.
+    """
+
+    SEVERITY_ORDER = {'major': 0, 'moderate': 1, 'minor': 2}
+
+    def __init__(self, tables: Optional[Mapping] = None):
+        """
+        Args:
+            tables: Compiled tables (defaults to the built-in table, loaded from its snapshot)
+        """
+        tables = tables if tables is not None else load_tables('interactions', __file__, _build_knowledge)
+        self.drug_names = tables['drug_names']
+        self.drug_ids = tables['drug_ids']
+        self.interactions = tables['interactions']
+        self.pair_index = tables['pair_index']
+
+    @classmethod
+    def from_csv(cls, interactions_path: str, aliases_path: Optional[str] = None) -> 'MedicationInteractionIndex':
+        """
+        Build an index from a larger local table
+
+        Args:
+            interactions_path: CSV with columns drug_a, drug_b, severity, warning
+            aliases_path: Optional CSV with columns drug, alias
+        """
+        aliases: Dict[str, List[str]] = {}
+        if aliases_path:
+            with open(aliases_path, newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    aliases.setdefault(row['drug'].strip().lower(), []).append(row['alias'].strip().lower())
+
+        with open(interactions_path, newline='', encoding='utf-8') as f:
+            rows = [(row['drug_a'].strip().lower(), row['drug_b'].strip().lower(),
+                     row['severity'].strip().lower(), row['warning'].strip())
+                    for row in csv.DictReader(f)]
+
+        names, ids = _assign_ids(aliases, rows)
+        interactions = [(ids[a], ids[b], severity, warning) for a, b, severity, warning in rows]
+        return cls({
+            'drug_names': names,
+            'drug_ids': ids,
+            'interactions': interactions,
+            'pair_index': {pair_key(a, b): i for i, (a, b, _, _) in enumerate(interactions)}
+        })
+
+    def resolve(self, medication_name: str) -> Optional[int]:
+        """Canonical ID for an extracted medication name ("Lisinopril", "Lasix 40mg", ...)"""
+        name = medication_name.strip().lower()
+        drug_id = self.drug_ids.get(name)
+        if drug_id is None and ' ' in name:
+            drug_id = self.drug_ids.get(name.split(' ', 1)[0])
+        return drug_id
+
+    def check(self, medications: Iterable) -> List[MedicationInteraction]:
+        """
+        Every known interaction among a document's medications, most severe first
+
+        Args:
+            medications: Medication records/dicts (with 'name') or plain names
+        """
+        found = {}  # canonical ID -> name as written in the document
+        for med in medications:
+            name = med if isinstance(med, str) else med.get('name', '')
+            drug_id = self.resolve(name)
+            if drug_id is not None and drug_id not in found:
+                found[drug_id] = name
+
+        ids = list(found)
+        hits = []
+        for i, first in enumerate(ids):
+            for second in ids[i + 1:]:
+                index = self.pair_index.get(pair_key(first, second))
+                if index is not None:
+                    _, _, severity, warning = self.interactions[index]
+                    hits.append(MedicationInteraction(
+                        medications=[found[first], found[second]],
+                        severity=severity,
+                        warning=warning,
+                        question=f"Is it safe for me to take {found[first]} and {found[second]} together?"
+                    ))
+
+        hits.sort(key=lambda hit: self.SEVERITY_ORDER.get(hit.severity, len(self.SEVERITY_ORDER)))
+        return hits
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    index = MedicationInteractionIndex()
+
+    print("Testing Medication Interaction Index\n")
+    print(f"{len(index.drug_names)} drugs, {len(index.interactions)} interacting pairs\n")
+    for hit in index.check(['Furosemide', 'Lisinopril', 'Metformin', 'Aspirin', 'Coumadin']):
+        print(f"   ⚠️  [{hit.severity}] {hit.warning}")
+        print(f"      Ask: {hit.question}")
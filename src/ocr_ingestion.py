@@ -0,0 +1,285 @@
+"""
+OCR Ingestion - Page-parallel OCR stage for the photo_ocr input method
+Splits uploads into pages, OCRs them on a worker pool and streams page text into Agent 1
+
+Team: Oyinade Balogun, Hilary C Bruton, Glen Sam, Kaleb
+Course: ITAI 2376 - Boomer Health Summary Project
+"""
+
+import hashlib
+import io
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from records import Extraction, Medication, TestResult
+
+# An upload is either one (possibly multi-page) file or a list of page images
+Upload = Union[bytes, Sequence[bytes]]
+
+
+class OCRError(Exception):
+    """Raised when no readable text could be recovered from an upload"""
+
+
+class OCRBackend:
+    """
+    Adapter interface for OCR engines.
+
+    Subclasses implement recognize(); split_pages() can be overridden for
+    formats that pack several pages into one file.
+    """
+
+    name = "base"
+
+    def split_pages(self, upload: bytes) -> List[bytes]:
+        """Split one uploaded file into page images (default: a single page)"""
+        return [upload]
+
+    def recognize(self, page_image: bytes) -> str:
+        """Return the text on one page image"""
+        raise NotImplementedError
+
+
+class TesseractBackend(OCRBackend):
+    """
+    Tesseract via pytesseract + Pillow (optional dependencies).
+
+    Multi-frame images (e.g. scanned TIFFs) are split into one page per frame.
+    """
+
+    name = "tesseract"
+
+    def __init__(self, lang: str = "eng", config: str = ""):
+        try:
+            import pytesseract
+            from PIL import Image, ImageSequence
+        except ImportError as exc:
+            raise ImportError(
+                "TesseractBackend needs 'pytesseract' and 'Pillow' "
+                "(pip install pytesseract pillow) plus the tesseract binary"
+            ) from exc
+        self._pytesseract = pytesseract
+        self._image = Image
+        self._image_sequence = ImageSequence
+        self.lang = lang
+        self.config = config
+
+    def split_pages(self, upload: bytes) -> List[bytes]:
+        image = self._image.open(io.BytesIO(upload))
+        pages = []
+        for frame in self._image_sequence.Iterator(image):
+            buffer = io.BytesIO()
+            frame.convert('RGB').save(buffer, format='PNG')
+            pages.append(buffer.getvalue())
+        return pages
+
+    def recognize(self, page_image: bytes) -> str:
+        image = self._image.open(io.BytesIO(page_image))
+        return self._pytesseract.image_to_string(image, lang=self.lang, config=self.config)
+
+
+class FakeOCRBackend(OCRBackend):
+    """
+    Deterministic offline backend for tests and demos.
+
+    A "page image" is just UTF-8 text; pages in one upload are separated by
+    form feeds. An optional per-page delay simulates OCR latency.
+    """
+
+    name = "fake"
+
+    def __init__(self, delay_per_page: float = 0.0):
+        self.delay_per_page = delay_per_page
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def split_pages(self, upload: bytes) -> List[bytes]:
+        return [page for page in upload.split(b'\f') if page.strip()]
+
+    def recognize(self, page_image: bytes) -> str:
+        with self._lock:
+            self.calls += 1
+        if self.delay_per_page:
+            time.sleep(self.delay_per_page)
+        return page_image.decode('utf-8', errors='replace')
+
+
+class OCRIngestion:
+    """
+    OCR stage in front of MedicalExtractor.
+
+    Pages are recognized in parallel, page text is cached by image hash,
+    and extraction runs on each page as soon as its text is ready.
+    """
+
+    def __init__(self,
+                 backend: Optional[OCRBackend] = None,
+                 max_workers: int = 4,
+                 cache_size: int = 256):
+        """
+        Args:
+            backend: OCR engine adapter (defaults to TesseractBackend)
+            max_workers: Pages OCR'd at the same time
+            cache_size: Page texts kept in the image-hash cache
+        """
+        self.backend = backend or TesseractBackend()
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+        self._page_cache = OrderedDict()  # sha256(image) -> text
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def split_pages(self, upload: Upload) -> List[bytes]:
+        """Normalize an upload into a list of page images"""
+        if isinstance(upload, (bytes, bytearray)):
+            return self.backend.split_pages(bytes(upload))
+        pages = []
+        for item in upload:
+            pages.extend(self.backend.split_pages(bytes(item)))
+        return pages
+
+    def recognize_page(self, page_image: bytes) -> str:
+        """OCR one page, served from the image-hash cache when possible"""
+        key = hashlib.sha256(page_image).hexdigest()
+        with self._cache_lock:
+            cached = self._page_cache.get(key)
+            if cached is not None:
+                self._page_cache.move_to_end(key)
+                self.cache_hits += 1
+                return cached
+            self.cache_misses += 1
+
+        text = self.backend.recognize(page_image)
+
+        with self._cache_lock:
+            self._page_cache[key] = text
+            while len(self._page_cache) > self.cache_size:
+                self._page_cache.popitem(last=False)
+        return text
+
+    def iter_page_texts(self, upload: Upload) -> Iterator[Tuple[int, str]]:
+        """Yield (page_index, text) in completion order as pages finish"""
+        pages = self.split_pages(upload)
+        if not pages:
+            raise OCRError("The upload contained no pages. Please re-upload or use text entry.")
+
+        if len(pages) == 1 or self.max_workers <= 1:
+            for index, page in enumerate(pages):
+                yield index, self.recognize_page(page)
+            return
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pages))) as pool:
+            futures = {pool.submit(self.recognize_page, page): index for index, page in enumerate(pages)}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def ingest(self, upload: Upload) -> str:
+        """OCR every page and return the document text in page order"""
+        texts = dict(self.iter_page_texts(upload))
+        document_text = "\n".join(texts[i] for i in sorted(texts))
+        if not document_text.strip():
+            raise OCRError("We couldn't read any text from this image. Please re-upload or use text entry.")
+        return document_text
+
+    def extract_streaming(self, upload: Upload, extractor,
+                          on_page_text: Optional[Callable[[int, str], None]] = None) -> Iterator[Extraction]:
+        """
+        Run Agent 1 on each page as its OCR finishes.
+
+        Yields the merged extraction after every page, so callers can show
+        partial results; the last value covers the whole upload.
+        on_page_text(index, text) is called with each page's text first.
+        """
+        page_texts: Dict[int, str] = {}
+        page_extractions: Dict[int, Extraction] = {}
+
+        for index, text in self.iter_page_texts(upload):
+            page_texts[index] = text
+            if on_page_text is not None:
+                on_page_text(index, text)
+            page_extractions[index] = extractor.extract_all(text, input_method="photo_ocr")
+            yield merge_extractions(extractor, page_texts, page_extractions)
+
+        if not any(text.strip() for text in page_texts.values()):
+            raise OCRError("We couldn't read any text from this image. Please re-upload or use text entry.")
+
+
+def merge_extractions(extractor, page_texts: Dict[int, str], page_extractions: Dict[int, Extraction]) -> Extraction:
+    """Combine per-page extractions (in page order) into one document extraction"""
+    order = sorted(page_extractions)
+    pages = [page_extractions[i] for i in order]
+
+    # Where each page starts in the joined document, so per-page spans can be shifted into it
+    page_starts = []
+    position = 0
+    for i in order:
+        page_starts.append(position)
+        position += len(page_texts[i]) + 1
+
+    merged = {}
+    for field in ('diagnoses', 'symptoms', 'instructions', 'followups'):
+        merged[field] = list(dict.fromkeys(value for page in pages for value in getattr(page, field)))
+    merged['test_results'] = [TestResult(result.test, result.value, _shift(result.span, start))
+                              for page, start in zip(pages, page_starts) for result in page.test_results]
+
+    seen = set()
+    medications = []
+    for page, start in zip(pages, page_starts):
+        for med in page.medications:
+            if med.name.lower() not in seen:
+                seen.add(med.name.lower())
+                medications.append(Medication(med.name, med.dosage, _shift(med.span, start)))
+
+    flagged = [term for page in pages for term in page.flagged_terms]
+
+    # Per-page scoping: a finding current on any page is not listed as scoped
+    current = set(merged['diagnoses']) | set(merged['symptoms'])
+    scoped = {}
+    for page in pages:
+        for finding in page.scoped_findings or ():
+            if finding.finding not in current:
+                scoped.setdefault((finding.finding, finding.category), finding)
+
+    document_text = "\n".join(page_texts[i] for i in order)
+    extraction = Extraction(
+        input_method='photo_ocr',
+        medications=medications,
+        flagged_terms=list(dict.fromkeys(flagged))[:8],
+        raw_text_preview=document_text[:200] + "..." if len(document_text) > 200 else document_text,
+        pages=len(order),
+        scoped_findings=list(scoped.values()) or None,
+        **merged
+    )
+    extraction.extraction_quality = extractor.assess_extraction_quality(extraction)
+    return extraction
+
+
+def _shift(span: Optional[List[int]], offset: int) -> Optional[List[int]]:
+    """A page-relative span as a span in the joined document"""
+    return None if span is None else [span[0] + offset, span[1] + offset]
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    from agent1_extractor import MedicalExtractor
+
+    upload = (
+        b"DISCHARGE SUMMARY\nDIAGNOSES:\n1. Hypertension\n2. Type 2 Diabetes\n"
+        b"\fMEDICATIONS:\n- Lisinopril 20mg - Take once daily\n- Metformin 500mg - Take twice daily\n"
+        b"\fFOLLOW-UP:\n- Return to primary care in 2 weeks\n"
+    )
+
+    ingestion = OCRIngestion(backend=FakeOCRBackend(delay_per_page=0.05), max_workers=3)
+    extractor = MedicalExtractor()
+
+    print("Testing OCR Ingestion (fake backend)\n")
+    for partial in ingestion.extract_streaming(upload, extractor):
+        print(f"   📄 {partial.pages} page(s) read: {len(partial.diagnoses)} diagnoses, "
+              f"{len(partial.medications)} medications")
+
+    ingestion.ingest(upload)
+    print(f"\nPage cache: {ingestion.cache_hits} hits, {ingestion.cache_misses} misses")
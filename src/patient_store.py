@@ -0,0 +1,462 @@
+"""
+Patient Record Store - Longitudinal, per-patient history across documents
+Merges medications (with dose changes), diagnoses and test-result time series
+
+Team: Oyinade Balogun, Hilary C Bruton, Glen Sam, Kaleb
+Course: ITAI 2376 - Boomer Health Summary Project
+"""
+
+import json
+import re
+import sqlite3
+import threading
+from array import array
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from summary_codec import SummaryCodec, blob_version, decode, default_codec
+from summary_delta import apply_delta, describe_changes, diff_summaries
+
+# Clustered (WITHOUT ROWID) tables: every query below is a B-tree seek + range scan
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS medications (
+    patient_id TEXT NOT NULL,
+    med_key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    dosage TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    active INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (patient_id, med_key)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS dose_changes (
+    patient_id TEXT NOT NULL,
+    med_key TEXT NOT NULL,
+    changed_at TEXT NOT NULL,
+    old_dosage TEXT NOT NULL,
+    new_dosage TEXT NOT NULL,
+    PRIMARY KEY (patient_id, med_key, changed_at, new_dosage)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS diagnoses (
+    patient_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    PRIMARY KEY (patient_id, name)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS test_results (
+    patient_id TEXT NOT NULL,
+    test TEXT NOT NULL,
+    recorded_at TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    value REAL NOT NULL,
+    value2 REAL,
+    raw TEXT NOT NULL,
+    PRIMARY KEY (patient_id, test, recorded_at, seq)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS summaries (
+    patient_id TEXT NOT NULL,
+    visit INTEGER NOT NULL,
+    recorded_at TEXT NOT NULL,
+    is_full INTEGER NOT NULL,
+    payload BLOB NOT NULL,
+    PRIMARY KEY (patient_id, visit)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS summary_codecs (
+    version TEXT PRIMARY KEY,
+    definition TEXT NOT NULL
+);
+"""
+
+UNKNOWN_DOSAGE = "See prescription"
+
+# Every Nth visit stores the full summary, so rebuilding one replays at most N-1 deltas
+FULL_SUMMARY_INTERVAL = 10
+
+# "Stop" instructions: the verb, a negation just before it ("do not stop", "never
+# suddenly discontinue"), a condition earlier in its clause ("if you stop") and
+# what ends the list of drugs it names
+STOP_VERB = re.compile(
+    r'\b(?:stop(?:s|ped|ping)?|discontinu(?:e|es|ed|ing)'
+    r'|no\s+longer\s+(?:need\s+to\s+)?(?:take|takes|taking|use|uses|using|needs?))\b'
+)
+# Past participles can also follow the drug they stop ("Aspirin was discontinued")
+PASSIVE_STOPS = ('stopped', 'discontinued')
+NEGATED_BEFORE = re.compile(r"(?:\b(?:not|never)|n['’]t)\s+(?:\w+\s+)?$")
+CONDITIONAL_BEFORE = re.compile(r'\b(?:if|when|whenever|unless|before|after|whether)\b')
+STOP_CLAUSE_END = re.compile(
+    r'[.;!?]|\b(?:but|then|continue|keep|take|start|resume|restart|until|unless|without|instead)\b'
+)
+# ... and what starts the part of a clause a passive stop looks back over
+PASSIVE_CLAUSE_START = re.compile(STOP_CLAUSE_END.pattern + '|,')
+
+
+def parse_test_value(test: str, value: str) -> Optional[Tuple[float, Optional[float]]]:
+    """Numeric value(s) of a test result: BP gives (systolic, diastolic), others one number"""
+    if '/' in value:
+        parts = value.split('/')
+        try:
+            return float(parts[0]), float(re.sub(r'[^\d.]', '', parts[1]))
+        except (ValueError, IndexError):
+            return None
+    match = re.search(r'\d+(?:\.\d+)?', value)
+    return (float(match.group(0)), None) if match else None
+
+
+def stopped_medications(instruction: str, med_keys: List[str]) -> List[str]:
+    """
+    Medications (by lowercased name) an instruction tells the patient to stop
+
+    Only a drug named in the stop clause itself counts ("Stop aspirin;
+    continue metformin" stops aspirin, as do "Aspirin discontinued" and
+    "No longer take aspirin"), and a negated or conditional stop
+    ("Do not stop taking lisinopril", "If you stop metformin, call us")
+    stops nothing.
+    """
+    text = instruction.lower()
+    stopped = []
+    for verb in STOP_VERB.finditer(text):
+        clause_start = max(text.rfind(mark, 0, verb.start()) for mark in '.;!?') + 1
+        if (NEGATED_BEFORE.search(text, clause_start, verb.start())
+                or CONDITIONAL_BEFORE.search(text, clause_start, verb.start())):
+            continue
+        end = STOP_CLAUSE_END.search(text, verb.end())
+        named = text[verb.end():end.start() if end else len(text)]
+        if verb.group() in PASSIVE_STOPS:
+            named_from = clause_start
+            for boundary in PASSIVE_CLAUSE_START.finditer(text, clause_start, verb.start()):
+                named_from = boundary.end()
+            named = text[named_from:verb.start()] + " " + named
+        stopped.extend(key for key in med_keys
+                       if key not in stopped and re.search(rf'\b{re.escape(key)}\b', named))
+    return stopped
+
+
+class PatientRecordStore:
+    """
+    Local per-patient store backed by SQLite (standard library).
+
+    Each processed document is merged in: medications are de-duplicated by
+    name with dose changes tracked, diagnoses keep first/last seen dates and
+    test results are appended to per-test time series. "Current meds" and
+    trend queries are index seeks, so they never re-read old summaries.
+    """
+
+    def __init__(self, path: str = ":memory:", codec: Optional[SummaryCodec] = None):
+        """
+        Args:
+            path: SQLite database file (":memory:" for a throwaway store)
+            codec: Encoding for stored summaries (default: summary_codec.default_codec())
+        """
+        self.path = path
+        self.codec = codec
+        self._codecs: Dict[str, SummaryCodec] = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Recording documents
+    # ------------------------------------------------------------------
+
+    def add_extraction(self, patient_id: str, extracted_data: Dict, recorded_at: Optional[str] = None):
+        """Merge Agent 1's output for one document into the patient's record"""
+        self._merge(
+            patient_id,
+            recorded_at or datetime.now().isoformat(),
+            extracted_data.get('diagnoses', []),
+            [(m['name'], m.get('dosage', UNKNOWN_DOSAGE)) for m in extracted_data.get('medications', [])],
+            [(t['test'], t['value']) for t in extracted_data.get('test_results', [])],
+            extracted_data.get('instructions', [])
+        )
+
+    def add_summary(self, patient_id: str, summary: Dict, recorded_at: Optional[str] = None):
+        """Merge a final summary (from assemble_final_summary) into the patient's record"""
+        section1 = summary['section_1_diagnoses']
+        self._merge(
+            patient_id,
+            recorded_at or datetime.now().isoformat(),
+            [dx['diagnosis'] for dx in section1['diagnoses']],
+            [(m['medication'], m['dosage']) for m in summary['section_2_medications']['medications']],
+            [(t['test'], t['your_value']) for t in section1['test_results']],
+            []
+        )
+
+    def _merge(self, patient_id: str, recorded_at: str, diagnoses: List[str],
+               medications: List[Tuple[str, str]], tests: List[Tuple[str, str]], instructions: List[str]):
+        with self._lock, self._conn:
+            cur = self._conn.cursor()
+
+            for name in diagnoses:
+                cur.execute(
+                    "INSERT INTO diagnoses VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(patient_id, name) DO UPDATE SET "
+                    "first_seen = min(first_seen, excluded.first_seen), "
+                    "last_seen = max(last_seen, excluded.last_seen)",
+                    (patient_id, name, recorded_at, recorded_at)
+                )
+
+            for name, dosage in medications:
+                self._merge_medication(cur, patient_id, recorded_at, name, dosage)
+
+            stop_instructions = [i for i in instructions if STOP_VERB.search(i.lower())]
+            if stop_instructions:
+                active = [med_key for (med_key,) in cur.execute(
+                    "SELECT med_key FROM medications WHERE patient_id = ? AND active = 1",
+                    (patient_id,)).fetchall()]
+                for instruction in stop_instructions:
+                    for med_key in stopped_medications(instruction, active):
+                        cur.execute("UPDATE medications SET active = 0 WHERE patient_id = ? AND med_key = ?",
+                                    (patient_id, med_key))
+
+            for test, value in tests:
+                parsed = parse_test_value(test, value)
+                if parsed is None:
+                    continue
+                (seq,) = cur.execute(
+                    "SELECT COALESCE(MAX(seq), -1) + 1 FROM test_results "
+                    "WHERE patient_id = ? AND test = ? AND recorded_at = ?",
+                    (patient_id, test, recorded_at)
+                ).fetchone()
+                cur.execute(
+                    "INSERT INTO test_results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (patient_id, test, recorded_at, seq, parsed[0], parsed[1], value)
+                )
+
+    def _merge_medication(self, cur, patient_id: str, recorded_at: str, name: str, dosage: str):
+        med_key = name.strip().lower()
+        row = cur.execute(
+            "SELECT dosage, last_seen FROM medications WHERE patient_id = ? AND med_key = ?",
+            (patient_id, med_key)
+        ).fetchone()
+
+        if row is None:
+            cur.execute("INSERT INTO medications VALUES (?, ?, ?, ?, ?, ?, 1)",
+                        (patient_id, med_key, name, dosage, recorded_at, recorded_at))
+            return
+
+        old_dosage, last_seen = row
+        newer = recorded_at >= last_seen
+        dose_changed = (dosage != UNKNOWN_DOSAGE and old_dosage != UNKNOWN_DOSAGE
+                        and dosage.replace(' ', '').lower() != old_dosage.replace(' ', '').lower())
+        if dose_changed and newer:
+            cur.execute("INSERT OR IGNORE INTO dose_changes VALUES (?, ?, ?, ?, ?)",
+                        (patient_id, med_key, recorded_at, old_dosage, dosage))
+
+        if newer:
+            new_dosage = old_dosage if dosage == UNKNOWN_DOSAGE else dosage
+            cur.execute(
+                "UPDATE medications SET name = ?, dosage = ?, last_seen = ?, active = 1 "
+                "WHERE patient_id = ? AND med_key = ?",
+                (name, new_dosage, recorded_at, patient_id, med_key)
+            )
+        else:
+            cur.execute("UPDATE medications SET first_seen = min(first_seen, ?) WHERE patient_id = ? AND med_key = ?",
+                        (recorded_at, patient_id, med_key))
+
+    def store_summary(self, patient_id: str, summary: Dict, recorded_at: Optional[str] = None) -> Dict:
+        """
+        Keep a summary as a delta against the patient's previous one
+
+        The first visit (and every FULL_SUMMARY_INTERVAL-th) is stored in
+        full; the others only hold what changed.
+
+        Returns:
+            {'visit', 'full': bool, 'bytes': stored size, 'delta': delta or None,
+             'changes': patient-facing change list (empty on a first visit)}
+        """
+        with self._lock, self._conn:
+            (visit,) = self._conn.execute(
+                "SELECT COALESCE(MAX(visit), -1) + 1 FROM summaries WHERE patient_id = ?", (patient_id,)
+            ).fetchone()
+            delta, changes = None, []
+            if visit % FULL_SUMMARY_INTERVAL:
+                previous = self._rebuild(patient_id, visit - 1)
+                delta = diff_summaries(previous, summary)
+                changes = describe_changes(previous, delta)
+            payload = self._encode(summary if delta is None else delta)
+            self._conn.execute("INSERT INTO summaries VALUES (?, ?, ?, ?, ?)",
+                               (patient_id, visit, recorded_at or datetime.now().isoformat(),
+                                int(delta is None), payload))
+        return {'visit': visit, 'full': delta is None, 'bytes': len(payload),
+                'delta': delta, 'changes': changes}
+
+    def _encode(self, payload: Dict) -> bytes:
+        """Encode with the store's codec, saving its definition so the blob stays readable (caller holds the lock)"""
+        if self.codec is None:
+            self.codec = default_codec()
+        if self.codec.version not in self._codecs:
+            self._conn.execute("INSERT OR IGNORE INTO summary_codecs VALUES (?, ?)",
+                               (self.codec.version, self.codec.to_json()))
+            self._codecs[self.codec.version] = self.codec
+        return self.codec.encode(payload)
+
+    def _decode(self, payload) -> Dict:
+        """Stored payload -> dict; plain JSON text is read as is (caller holds the lock)"""
+        if isinstance(payload, str):
+            return json.loads(payload)
+        version = blob_version(payload)
+        if version not in self._codecs:
+            row = self._conn.execute("SELECT definition FROM summary_codecs WHERE version = ?",
+                                     (version,)).fetchone()
+            if row is not None:
+                self._codecs[version] = SummaryCodec.from_json(row[0])
+        return decode(payload, self._codecs)
+
+    def discontinue_medication(self, patient_id: str, name: str):
+        """Mark a medication as no longer taken"""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE medications SET active = 0 WHERE patient_id = ? AND med_key = ?",
+                               (patient_id, name.strip().lower()))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def current_medications(self, patient_id: str) -> List[Dict[str, str]]:
+        """Active medications with their latest known dosage"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, dosage, first_seen, last_seen FROM medications "
+                "WHERE patient_id = ? AND active = 1 ORDER BY med_key",
+                (patient_id,)
+            ).fetchall()
+        return [{'name': n, 'dosage': d, 'first_seen': f, 'last_seen': l} for n, d, f, l in rows]
+
+    def dose_history(self, patient_id: str, name: str) -> List[Dict[str, str]]:
+        """Every recorded dose change for one medication, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT changed_at, old_dosage, new_dosage FROM dose_changes "
+                "WHERE patient_id = ? AND med_key = ? ORDER BY changed_at",
+                (patient_id, name.strip().lower())
+            ).fetchall()
+        return [{'changed_at': c, 'from': o, 'to': n} for c, o, n in rows]
+
+    def diagnoses(self, patient_id: str) -> List[Dict[str, str]]:
+        """Every diagnosis ever recorded for the patient"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, first_seen, last_seen FROM diagnoses WHERE patient_id = ? ORDER BY first_seen",
+                (patient_id,)
+            ).fetchall()
+        return [{'name': n, 'first_seen': f, 'last_seen': l} for n, f, l in rows]
+
+    def test_trend(self, patient_id: str, test: str,
+                   since: Optional[str] = None, until: Optional[str] = None) -> Dict:
+        """
+        Time series for one test as compact columns
+
+        Returns:
+            {'dates': [...], 'values': array('d'), 'values2': array('d') (BP diastolic, else empty)}
+        """
+        query = "SELECT recorded_at, value, value2 FROM test_results WHERE patient_id = ? AND test = ?"
+        params = [patient_id, test]
+        if since:
+            query += " AND recorded_at >= ?"
+            params.append(since)
+        if until:
+            query += " AND recorded_at <= ?"
+            params.append(until)
+        query += " ORDER BY recorded_at, seq"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        trend = {'dates': [], 'values': array('d'), 'values2': array('d')}
+        for recorded_at, value, value2 in rows:
+            trend['dates'].append(recorded_at)
+            trend['values'].append(value)
+            if value2 is not None:
+                trend['values2'].append(value2)
+        return trend
+
+    def load_summary(self, patient_id: str, visit: Optional[int] = None) -> Optional[Dict]:
+        """Full summary for one visit (default: the latest), rebuilt from its deltas"""
+        with self._lock:
+            if visit is None:
+                (visit,) = self._conn.execute(
+                    "SELECT MAX(visit) FROM summaries WHERE patient_id = ?", (patient_id,)
+                ).fetchone()
+                if visit is None:
+                    return None
+            return self._rebuild(patient_id, visit)
+
+    def summary_delta(self, patient_id: str, visit: int) -> Optional[Dict]:
+        """
+        What to send a client that already has the previous visit's summary
+
+        Returns:
+            The stored delta, or None when the visit was stored in full (send load_summary instead)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT is_full, payload FROM summaries WHERE patient_id = ? AND visit = ?", (patient_id, visit)
+            ).fetchone()
+            if row is None:
+                raise KeyError(f"No summary for {patient_id} visit {visit}")
+            return None if row[0] else self._decode(row[1])
+
+    def _rebuild(self, patient_id: str, visit: int) -> Dict:
+        """Latest full summary at or before visit, with the deltas after it applied (caller holds the lock)"""
+        rows = self._conn.execute(
+            "SELECT is_full, payload FROM summaries WHERE patient_id = ? AND visit <= ? "
+            "AND visit >= (SELECT MAX(visit) FROM summaries WHERE patient_id = ? AND visit <= ? AND is_full = 1) "
+            "ORDER BY visit",
+            (patient_id, visit, patient_id, visit)
+        ).fetchall()
+        if not rows:
+            raise KeyError(f"No summary for {patient_id} visit {visit}")
+        summary = self._decode(rows[0][1])
+        for _, payload in rows[1:]:
+            summary = apply_delta(summary, self._decode(payload))
+        return summary
+
+    def bp_trend(self, patient_id: str, since: Optional[str] = None) -> Dict:
+        """Blood pressure history: values = systolic, values2 = diastolic"""
+        return self.test_trend(patient_id, 'Blood Pressure', since=since)
+
+    def format_patient_overview(self, patient_id: str) -> str:
+        """Human-readable current meds + BP trend"""
+        output = [f"🗂️  PATIENT RECORD: {patient_id}"]
+        meds = self.current_medications(patient_id)
+        output.append("💊 CURRENT MEDICATIONS:")
+        for med in meds:
+            changes = self.dose_history(patient_id, med['name'])
+            note = f" (changed from {changes[-1]['from']} on {changes[-1]['changed_at'][:10]})" if changes else ""
+            output.append(f"   • {med['name']} - {med['dosage']}{note}")
+
+        trend = self.bp_trend(patient_id)
+        if trend['dates']:
+            output.append("📈 BLOOD PRESSURE TREND:")
+            for date, sys_bp, dia_bp in zip(trend['dates'], trend['values'], trend['values2']):
+                output.append(f"   • {date[:10]}: {sys_bp:.0f}/{dia_bp:.0f}")
+        return "\n".join(output)
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    store = PatientRecordStore()
+
+    store.add_extraction("mary-johnson", {
+        'diagnoses': ['Hypertension'],
+        'medications': [{'name': 'Lisinopril', 'dosage': '10mg'}],
+        'test_results': [{'test': 'Blood Pressure', 'value': '152/94'}]
+    }, recorded_at="2025-10-01")
+    store.add_extraction("mary-johnson", {
+        'diagnoses': ['Hypertension', 'Type 2 Diabetes'],
+        'medications': [{'name': 'Lisinopril', 'dosage': '20mg'}, {'name': 'Metformin', 'dosage': '500mg'}],
+        'test_results': [{'test': 'Blood Pressure', 'value': '142/88'}],
+        'instructions': ['Do not stop taking lisinopril or metformin without talking to your doctor']
+    }, recorded_at="2025-11-25")
+
+    print("Testing Patient Record Store\n")
+    print(store.format_patient_overview("mary-johnson"))
@@ -7,13 +7,36 @@ Course: ITAI 2376 - Boomer Health Summary Project
 """
 
 import json
-from typing import Dict, Optional
+import os
+import sys
+import threading
+from collections import deque
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, Optional
 from datetime import datetime
 
-# Import our agents
-from agent1_extractor import MedicalExtractor
-from agent2_educator import HealthExplainer
-from agent3_organizer import LifestyleCoach
+# Agents (and the optional cache/profiler modules) are imported on first use
+# so that importing the pipeline stays cheap for CLI and short-lived workers
+if TYPE_CHECKING:
+    from agent1_extractor import MedicalExtractor
+    from agent2_educator import HealthExplainer
+    from agent3_organizer import LifestyleCoach
+    from summary_cache import SummaryCache
+    from profiling import PipelineProfiler
+    from ocr_ingestion import OCRIngestion, Upload
+    from patient_store import PatientRecordStore
+    from feedback_store import FeedbackStore
+    from records import Extraction, TriageResult
+    from triage import TriageScanner
+    from deadline import Deadline
+
+# Newest history entries kept for collect_feedback (older summary IDs expire)
+HISTORY_LIMIT = 10000
+
+
+def gil_enabled() -> bool:
+    """False only on free-threaded CPython builds running without the GIL"""
+    check = getattr(sys, '_is_gil_enabled', None)
+    return check() if check is not None else True
 
 
 class BoomerHealthPipeline:
@@ -22,28 +45,144 @@ class BoomerHealthPipeline:
     medical documents into patient-friendly health summaries
     """
     
-    def __init__(self):
-        """Initialize all three agents"""
-        print("🚀 Initializing Boomer Health Summary System...")
-        
-        self.agent1 = MedicalExtractor()
-        print("   ✅ Agent 1 (Medical Extractor) ready")
-        
-        self.agent2 = HealthExplainer()
-        print("   ✅ Agent 2 (Health Explainer) ready")
+    def __init__(self,
+                 cache: Optional['SummaryCache'] = None,
+                 profiler: Optional['PipelineProfiler'] = None,
+                 ocr: Optional['OCRIngestion'] = None,
+                 records: Optional['PatientRecordStore'] = None,
+                 feedback_store: Optional['FeedbackStore'] = None,
+                 verbose: bool = True,
+                 history_limit: Optional[int] = HISTORY_LIMIT):
+        """
+        Set up the pipeline; each agent is built the first time it is needed
         
-        self.agent3 = LifestyleCoach()
-        print("   ✅ Agent 3 (Lifestyle Coach) ready")
+        One instance can be shared by many threads: the agents only hold
+        frozen knowledge tables, each request keeps its state in locals, and
+        history/feedback updates are made under a lock.
         
-        print("✨ System ready to process medical documents!\n")
+        Args:
+            cache: Optional SummaryCache so repeat documents skip agent work
+            profiler: Optional PipelineProfiler (defaults to BOOMER_PROFILE* env settings)
+            ocr: OCR stage for photo uploads (defaults to Tesseract on first upload)
+            records: Optional PatientRecordStore for patient_id-tagged documents
+            feedback_store: Optional FeedbackStore aggregating rewards across users
+            verbose: Print stage-by-stage progress (turn off for batch/threaded use)
+            history_limit: History entries kept for feedback (None = keep all; 0 = keep none)
+        """
+        self.verbose = verbose
+        self._log("🚀 Boomer Health Summary System ready (agents load on first use)\n")
+        
+        self._agent1 = None
+        self._agent2 = None
+        self._agent3 = None
+        self._triage_scanner = None
+        self._setup_lock = threading.Lock()  # lazy agent / OCR construction
+        
+        # Track processing history for feedback loop (RL component); the
+        # summary ID of processing_history[i] is _history_offset + i
+        self.processing_history = deque(maxlen=history_limit)
+        self._history_offset = 0
+        self._history_lock = threading.Lock()
+        
+        # Content-addressed cache of agent outputs (None = always recompute)
+        self.cache = cache
+        
+        # OCR stage in front of Agent 1 for photo uploads
+        self.ocr = ocr
+        
+        # Per-patient longitudinal store (None = documents are independent)
+        self.records = records
+        
+        # Cross-user reward aggregation (None = rewards stay on history entries)
+        self.feedback_store = feedback_store
+        
+        # Sampled profiling hooks (None = disabled, no overhead)
+        self.profiler = None
+        if profiler is None and os.environ.get('BOOMER_PROFILE'):
+            from profiling import PipelineProfiler
+            profiler = PipelineProfiler.from_env()
+        if profiler is not None:
+            self.attach_profiler(profiler)
+    
+    @property
+    def agent1(self) -> 'MedicalExtractor':
+        """Agent 1 (Medical Extractor), built on first access"""
+        if self._agent1 is None:
+            with self._setup_lock:
+                if self._agent1 is None:
+                    from agent1_extractor import MedicalExtractor
+                    self._agent1 = MedicalExtractor()
+                    self._log("   ✅ Agent 1 (Medical Extractor) ready")
+        return self._agent1
+    
+    @property
+    def agent2(self) -> 'HealthExplainer':
+        """Agent 2 (Health Explainer), built on first access"""
+        if self._agent2 is None:
+            with self._setup_lock:
+                if self._agent2 is None:
+                    from agent2_educator import HealthExplainer
+                    self._agent2 = HealthExplainer()
+                    self._log("   ✅ Agent 2 (Health Explainer) ready")
+        return self._agent2
+    
+    @property
+    def agent3(self) -> 'LifestyleCoach':
+        """Agent 3 (Lifestyle Coach), built on first access"""
+        if self._agent3 is None:
+            with self._setup_lock:
+                if self._agent3 is None:
+                    from agent3_organizer import LifestyleCoach
+                    self._agent3 = LifestyleCoach()
+                    self._log("   ✅ Agent 3 (Lifestyle Coach) ready")
+        return self._agent3
+    
+    @property
+    def triage_scanner(self) -> 'TriageScanner':
+        """Emergency pre-scan, built on first access"""
+        if self._triage_scanner is None:
+            with self._setup_lock:
+                if self._triage_scanner is None:
+                    from triage import TriageScanner
+                    self._triage_scanner = TriageScanner()
+        return self._triage_scanner
+    
+    def triage(self, text: str) -> 'TriageResult':
+        """
+        Emergency pre-scan of raw text, before (and without) any agent work
         
-        # Track processing history for feedback loop (RL component)
-        self.processing_history = []
+        Returns:
+            TriageResult - when urgent, show its message right away
+        """
+        return self.triage_scanner.scan(text)
+    
+    def attach_profiler(self, profiler: 'PipelineProfiler'):
+        """Turn on sampled profiling and per-extractor counters"""
+        self.detach_profiler()
+        profiler.instrument(self.agent1)
+        self.profiler = profiler
+    
+    def enable_profiling(self, mode: str = "cprofile", sample_rate: float = 0.01,
+                         output_dir: str = "profiles") -> 'PipelineProfiler':
+        """Convenience wrapper: build a PipelineProfiler and attach it"""
+        from profiling import PipelineProfiler
+        profiler = PipelineProfiler(mode=mode, sample_rate=sample_rate, output_dir=output_dir)
+        self.attach_profiler(profiler)
+        return profiler
+    
+    def detach_profiler(self):
+        """Turn profiling off and restore the uninstrumented extractor"""
+        if self.profiler is not None:
+            self.profiler.uninstrument(self.agent1)
+            self.profiler = None
     
     def process_document(self, 
                         document_text: str, 
                         input_method: str = "free_text",
-                        patient_name: Optional[str] = None) -> Dict:
+                        patient_name: Optional[str] = None,
+                        patient_id: Optional[str] = None,
+                        deadline: Optional[float] = None,
+                        triage: Optional['TriageResult'] = None) -> Dict:
         """
         Main pipeline: Process a medical document through all three agents
         
@@ -51,71 +190,401 @@ class BoomerHealthPipeline:
             document_text: Raw text from discharge paper, prescription, or user input
             input_method: "photo_ocr", "free_text", or "guided_form"
             patient_name: Optional patient name for personalization
+            patient_id: Optional ID - merges this document into the patient's longitudinal record
+            deadline: Optional total seconds for this document - stages that start
+                      behind schedule skip optional work (glossary, lifestyle plan,
+                      long lists) and metadata['degraded'] lists what was skipped
+            triage: self.triage(document_text) if the caller already ran it
+            
+        Returns:
+            Complete health summary with all agent outputs
+            (the emergency pre-scan result is in summary['triage'])
+        """
+        budget = self._budget(deadline)
+        return self._process_text(document_text, input_method, patient_name, patient_id,
+                                  triage or self.triage(document_text), budget)
+    
+    def stream_document(self,
+                        document_text: str,
+                        input_method: str = "free_text",
+                        patient_name: Optional[str] = None,
+                        patient_id: Optional[str] = None,
+                        fmt: str = "text",
+                        deadline: Optional[float] = None) -> Iterator[str]:
+        """
+        Service mode: process a document and yield the rendered summary
+        chunk by chunk
+        
+        The emergency pre-scan runs first, and when it is urgent the 911
+        banner is the first chunk out - sent before any agent has run.
+        """
+        from renderer import SummaryRenderer
+        renderer = SummaryRenderer(fmt)
+        budget = self._budget(deadline)
+        triage = self.triage(document_text)
+        
+        def events():
+            yield from renderer.triage_events(triage)
+            summary = self._process_text(document_text, input_method, patient_name, patient_id, triage, budget)
+            yield from renderer.summary_events(summary, include_triage=False)
+        
+        return renderer.stream(events())
+    
+    @staticmethod
+    def _budget(deadline: Optional[float]) -> Optional['Deadline']:
+        """Start the clock for a deadline given in seconds (None = no deadline)"""
+        if deadline is None:
+            return None
+        from deadline import Deadline
+        return Deadline(deadline)
+    
+    def _process_text(self, document_text: str, input_method: str, patient_name: Optional[str],
+                      patient_id: Optional[str], triage: 'TriageResult',
+                      budget: Optional['Deadline'] = None) -> Dict:
+        return self._process(
+            input_method,
+            patient_name,
+            patient_id,
+            lambda: self.cache.extraction_key(document_text, input_method),
+            lambda: self.agent1.extract_all(document_text, input_method),
+            lambda: triage,
+            budget,
+            document_text
+        )
+    
+    def process_form(self,
+                     form_fields: Dict,
+                     patient_name: Optional[str] = None,
+                     patient_id: Optional[str] = None,
+                     deadline: Optional[float] = None) -> Dict:
+        """
+        Process guided-form input (Diagnosis / Medications / Instructions / Follow-up)
+        
+        Uses Agent 1's structured fast path instead of flattening the form
+        into text and running every full-text scan.
+        
+        Args:
+            form_fields: Field name -> typed value (string or list of strings)
+            patient_name: Optional patient name for personalization
+            patient_id: Optional ID - merges this document into the patient's longitudinal record
+            deadline: Optional total seconds (see process_document)
+            
+        Returns:
+            Complete health summary with all agent outputs
+        """
+        budget = self._budget(deadline)
+        typed_text = "\n".join(value if isinstance(value, str) else "\n".join(value)
+                               for value in form_fields.values())
+        triage = self.triage(typed_text)
+        return self._process(
+            "guided_form",
+            patient_name,
+            patient_id,
+            lambda: self.cache.form_key(form_fields),
+            lambda: self.agent1.extract_structured(form_fields),
+            lambda: triage,
+            budget
+        )
+    
+    def process_upload(self,
+                       upload: 'Upload',
+                       patient_name: Optional[str] = None,
+                       patient_id: Optional[str] = None,
+                       deadline: Optional[float] = None) -> Dict:
+        """
+        Process photographed paperwork: OCR every page, then run the agents
+        
+        Pages are OCR'd in parallel and each page is sent to Agent 1 as soon
+        as its text is ready; Agents 2 and 3 run on the merged extraction.
+        
+        Args:
+            upload: One image file (multi-page allowed) or a list of page images
+            patient_name: Optional patient name for personalization
+            patient_id: Optional ID - merges this document into the patient's longitudinal record
+            deadline: Optional total seconds, OCR included (see process_document)
             
         Returns:
             Complete health summary with all agent outputs
+            
+        Raises:
+            OCRError: No readable text - ask the user to re-upload or type it in
+        """
+        budget = self._budget(deadline)
+        if self.ocr is None:
+            with self._setup_lock:
+                if self.ocr is None:
+                    from ocr_ingestion import OCRIngestion
+                    self.ocr = OCRIngestion()
+        
+        # Each page is pre-scanned as its text arrives, before Agent 1 reads it
+        page_triage = []
+        
+        def scan_page(index: int, text: str):
+            result = self.triage(text)
+            if result.urgent and not any(earlier.urgent for earlier in page_triage):
+                self._log(f"   🚨 Emergency language on page {index + 1}: {', '.join(result.findings)}")
+            page_triage.append(result)
+        
+        def extract_pages() -> 'Extraction':
+            extracted_data = None
+            for extracted_data in self.ocr.extract_streaming(upload, self.agent1, on_page_text=scan_page):
+                self._log(f"   📄 Page text ready ({extracted_data.pages} page(s) read)")
+            return extracted_data
+        
+        def triage() -> 'TriageResult':
+            if not page_triage:
+                # Cached extraction without a cached scan (evicted): read the pages again
+                return self.triage_scanner.scan_all(text for _, text in self.ocr.iter_page_texts(upload))
+            return self.triage_scanner.merge(page_triage)
+        
+        return self._process(
+            "photo_ocr",
+            patient_name,
+            patient_id,
+            lambda: self.cache.upload_key(upload),
+            extract_pages,
+            lambda: self._run_cached_stage('triage', lambda: self.cache.upload_key(upload), triage),
+            budget
+        )
+    
+    def _process(self, input_method: str, patient_name: Optional[str], patient_id: Optional[str],
+                 extraction_key, extract, triage, budget: Optional['Deadline'] = None,
+                 document_text: Optional[str] = None) -> Dict:
+        """Run the stages, under a sampled profiler capture when one is attached"""
+        args = (input_method, patient_name, patient_id, extraction_key, extract, triage, budget, document_text)
+        profiler = self.profiler
+        if profiler is not None and profiler.should_sample():
+            return profiler.capture(self._process_document, *args)
+        return self._process_document(*args)
+    
+    def _process_document(self,
+                          input_method: str,
+                          patient_name: Optional[str],
+                          patient_id: Optional[str],
+                          extraction_key,
+                          extract,
+                          triage,
+                          budget: Optional['Deadline'] = None,
+                          document_text: Optional[str] = None) -> Dict:
         """
+        Run the three agents and assemble the summary (see process_document)
         
-        print("="*70)
-        print(f"📄 PROCESSING MEDICAL DOCUMENT")
-        print(f"   Input Method: {input_method}")
-        print(f"   Patient: {patient_name or 'Anonymous'}")
-        print(f"   Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("="*70)
-        print()
+        Args:
+            extraction_key: Callable returning the cache key for Stage 1
+            extract: Callable producing Agent 1's output
+            triage: Callable returning the emergency pre-scan (for uploads, the pages' scans made during Stage 1)
+            budget: Deadline for this document (None = run every stage in full)
+            document_text: Text the extraction key was normalized from (typed/OCR'd text
+                           input) - a cached extraction's spans are moved onto it
+        """
+        self._log("="*70)
+        self._log(f"📄 PROCESSING MEDICAL DOCUMENT")
+        self._log(f"   Input Method: {input_method}")
+        self._log(f"   Patient: {patient_name or 'Anonymous'}")
+        self._log(f"   Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        self._log("="*70)
+        self._log()
         
         # STAGE 1: Extract medical information
-        print("🔍 STAGE 1: Extracting medical information...")
-        extracted_data = self.agent1.extract_all(document_text, input_method)
-        print(f"   ✅ Found {len(extracted_data['diagnoses'])} diagnoses")
-        print(f"   ✅ Found {len(extracted_data['medications'])} medications")
-        print(f"   ✅ Extraction quality: {extracted_data['extraction_quality'].upper()}")
-        print()
+        self._log("🔍 STAGE 1: Extracting medical information...")
+        extracted_data = self._run_cached_stage('extraction', extraction_key, extract, document_text=document_text)
+        self._log(f"   ✅ Found {len(extracted_data.diagnoses)} diagnoses")
+        self._log(f"   ✅ Found {len(extracted_data.medications)} medications")
+        self._log(f"   ✅ Extraction quality: {extracted_data.extraction_quality.upper()}")
+        self._log()
+        
+        triage_result = triage()
+        if triage_result.urgent:
+            self._log(f"🚨 EMERGENCY LANGUAGE: {', '.join(triage_result.findings)}")
+            self._log()
         
         # STAGE 2: Explain in plain language
-        print("💡 STAGE 2: Translating medical terms to plain language...")
-        explained_data = self.agent2.explain_all(extracted_data)
-        print(f"   ✅ Explained {len(explained_data['diagnoses_explained'])} diagnoses")
-        print(f"   ✅ Explained {len(explained_data['medications_explained'])} medications")
-        print()
+        self._log("💡 STAGE 2: Translating medical terms to plain language...")
+        explained_data = self._run_cached_stage(
+            'explanation',
+            lambda: self.cache.explanation_key(extracted_data),
+            lambda: self.agent2.explain_all(extracted_data),
+            lambda: self.agent2.explain_all(extracted_data, include_glossary=False),
+            budget
+        )
+        explained_data.original_extraction = extracted_data
+        self._log(f"   ✅ Explained {len(explained_data.diagnoses_explained)} diagnoses")
+        self._log(f"   ✅ Explained {len(explained_data.medications_explained)} medications")
+        self._log()
         
         # STAGE 3: Generate action plan
-        print("📋 STAGE 3: Creating personalized action plan...")
-        action_plan = self.agent3.generate_action_plan(explained_data)
-        print(f"   ✅ Generated {len(action_plan['diet_recommendations'])} diet tips")
-        print(f"   ✅ Generated {len(action_plan['exercise_recommendations'])} exercise tips")
-        print(f"   ✅ Generated {len(action_plan['questions_for_doctor'])} questions for doctor")
-        print()
+        self._log("📋 STAGE 3: Creating personalized action plan...")
+        action_plan = self._run_cached_stage(
+            'action_plan',
+            lambda: self.cache.action_plan_key(extracted_data),
+            lambda: self.agent3.generate_action_plan(explained_data),
+            lambda: self.agent3.generate_action_plan(explained_data, include_lifestyle=False),
+            budget
+        )
+        self._log(f"   ✅ Generated {len(action_plan.diet_recommendations)} diet tips")
+        self._log(f"   ✅ Generated {len(action_plan.exercise_recommendations)} exercise tips")
+        self._log(f"   ✅ Generated {len(action_plan.questions_for_doctor)} questions for doctor")
+        self._log()
         
         # STAGE 4: Assemble final summary
-        print("📦 STAGE 4: Assembling final health summary...")
+        self._log("📦 STAGE 4: Assembling final health summary...")
         final_summary = self.assemble_final_summary(
             extracted_data,
             explained_data,
             action_plan,
-            patient_name
+            patient_name,
+            budget
         )
-        print("   ✅ Health summary complete!")
-        print()
+        final_summary['triage'] = triage_result.to_dict()
+        if budget is not None:
+            self._record_degradation(final_summary['metadata'], budget)
+        self._log("   ✅ Health summary complete!")
+        self._log()
+        
+        # Merge into the patient's longitudinal record
+        if patient_id is not None and self.records is not None:
+            self.records.add_extraction(patient_id, extracted_data)
+            stored = self.records.store_summary(patient_id, final_summary)
+            final_summary['metadata']['visit'] = stored['visit']
+            if stored['changes']:
+                final_summary['metadata']['changes_since_last_visit'] = stored['changes']
         
         # Store in history for RL feedback
-        self.processing_history.append({
+        final_summary['metadata']['summary_id'] = self._record_history({
             'timestamp': datetime.now().isoformat(),
             'input_method': input_method,
-            'extraction_quality': extracted_data['extraction_quality'],
+            'extraction_quality': extracted_data.extraction_quality,
             'summary': final_summary
         })
         
         return final_summary
     
+    def _record_history(self, entry: Dict) -> int:
+        """Append a history entry and return its summary ID"""
+        with self._history_lock:
+            if len(self.processing_history) == self.processing_history.maxlen:
+                self._history_offset += 1  # the oldest entry drops out
+            self.processing_history.append(entry)
+            return self._history_offset + len(self.processing_history) - 1
+    
+    def clear_history(self):
+        """Drop all history entries (summary IDs keep counting up)"""
+        with self._history_lock:
+            self._history_offset += len(self.processing_history)
+            self.processing_history.clear()
+    
+    def _log(self, message: str = ""):
+        if self.verbose:
+            print(message)
+    
+    def process_batch(self,
+                      documents: Iterable[str],
+                      input_method: str = "free_text",
+                      max_workers: Optional[int] = None,
+                      columnar: bool = False,
+                      deadline: Optional[float] = None):
+        """
+        Process many documents on a thread pool sharing this pipeline
+        
+        On free-threaded CPython the agents run truly in parallel; with the
+        GIL, threads still overlap OCR and disk-cache I/O.
+        
+        Args:
+            documents: Document texts
+            input_method: Applied to every document
+            max_workers: Threads to use (default: one per CPU)
+            columnar: Return per-entity tables (columnar_export.BatchTables)
+                      instead of the list of summaries
+            deadline: Optional seconds per document (see process_document)
+            
+        Returns:
+            Summaries in input order (summary IDs are in metadata['summary_id']),
+            or BatchTables keyed by each summary's position when columnar
+        """
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+        from itertools import islice
+        
+        # Build the agents up front so workers never wait on first-use setup
+        _ = (self.agent1, self.agent2, self.agent3)
+        max_workers = max_workers or os.cpu_count() or 1
+        
+        def process(text: str) -> Dict:
+            return self.process_document(text, input_method, deadline=deadline)
+        
+        if not columnar:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                return list(pool.map(process, documents))
+        
+        # Columnar: each summary goes into the tables as it finishes and is then
+        # dropped (the feedback history still keeps up to history_limit of them)
+        from columnar_export import BatchTableBuilder
+        builder = BatchTableBuilder()
+        pending_documents = enumerate(documents)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            in_flight = {pool.submit(process, text): index
+                         for index, text in islice(pending_documents, 2 * max_workers)}
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = in_flight.pop(future)
+                    for next_index, text in islice(pending_documents, 1):
+                        in_flight[pool.submit(process, text)] = next_index
+                    builder.add(index, future.result())
+        return builder.build()
+    
+    def _run_cached_stage(self, stage: str, make_key, compute, compute_partial=None,
+                          budget: Optional['Deadline'] = None, document_text: Optional[str] = None):
+        """
+        Serve a stage from the cache when possible, otherwise compute and store it
+        
+        When the stage starts behind budget's schedule, compute_partial runs
+        instead. A cached full result is still used, and partial results are
+        never cached. With document_text, the key covers every copy that
+        normalizes the same, so the entry is stored and served with its
+        spans and preview relative to the copy at hand.
+        """
+        key = None
+        if self.cache is not None:
+            key = make_key()
+            cached = self.cache.get(stage, key)
+            if cached is not None:
+                from records import STAGE_RECORDS
+                self._log(f"   ♻️  Reused cached {stage.replace('_', ' ')}")
+                if document_text is not None:
+                    cached = self.cache.from_entry(cached, document_text)
+                return STAGE_RECORDS[stage].from_dict(cached)
+        
+        if compute_partial is not None and budget is not None and not budget.allow(stage):
+            self._log(f"   ⏱️  Behind schedule - skipped the {budget.degraded[-1].replace('_', ' ')}")
+            return compute_partial()
+        
+        result = compute()
+        if self.cache is not None:
+            self.cache.put(stage, key, result if document_text is None else self.cache.to_entry(result, document_text))
+        return result
+    
+    @staticmethod
+    def _record_degradation(metadata: Dict, budget: 'Deadline'):
+        """Deadline metadata; extraction_quality gets a "-partial" suffix when anything was skipped"""
+        metadata.update(budget.metadata())
+        if budget.degraded:
+            metadata['extraction_quality'] = f"{metadata['extraction_quality']}-partial"
+    
     def assemble_final_summary(self,
                               extracted_data: Dict,
                               explained_data: Dict,
                               action_plan: Dict,
-                              patient_name: Optional[str] = None) -> Dict:
+                              patient_name: Optional[str] = None,
+                              budget: Optional['Deadline'] = None) -> Dict:
         """
         Assemble all agent outputs into one comprehensive summary
+        (plain dicts - this is where records become JSON)
+        
+        With a budget that has run late, follow-ups and medication reminders
+        are cut to their first few items.
         """
+        from records import to_plain
+        from deadline import truncate
         
         summary = {
             'patient_name': patient_name or "Patient",
@@ -125,14 +594,15 @@ class BoomerHealthPipeline:
             # Section 1: What the Doctor Found
             'section_1_diagnoses': {
                 'title': 'What Your Doctor Found',
-                'diagnoses': explained_data['diagnoses_explained'],
-                'test_results': explained_data['test_results_explained']
+                'diagnoses': to_plain(explained_data['diagnoses_explained']),
+                'test_results': to_plain(explained_data['test_results_explained'])
             },
             
             # Section 2: Your Medications
             'section_2_medications': {
                 'title': 'Your Medications Explained',
-                'medications': explained_data['medications_explained']
+                'medications': to_plain(explained_data['medications_explained']),
+                'interactions': to_plain(action_plan.get('medication_interactions', []))
             },
             
             # Section 3: What You Should Do
@@ -141,7 +611,8 @@ class BoomerHealthPipeline:
                 'diet': action_plan['diet_recommendations'],
                 'exercise': action_plan['exercise_recommendations'],
                 'daily_habits': action_plan['daily_habits'],
-                'medication_reminders': action_plan['medication_reminders']
+                'medication_reminders': truncate(action_plan['medication_reminders'], budget),
+                'followups': truncate(list(extracted_data.get('followups', [])), budget)
             },
             
             # Section 4: When to Get Help
@@ -159,7 +630,7 @@ class BoomerHealthPipeline:
             # Section 6: Medical Terms Glossary
             'section_6_glossary': {
                 'title': 'Medical Terms Explained',
-                'abbreviations': explained_data['abbreviations_explained']
+                'abbreviations': to_plain(explained_data['abbreviations_explained'])
             },
             
             # Metadata
@@ -179,124 +650,27 @@ class BoomerHealthPipeline:
         Format the complete summary for human-readable display
         (This is what gets shown to the patient)
         """
+        return "".join(self.stream_summary(summary))
+    
+    def stream_summary(self, summary: Dict, fmt: str = "text") -> Iterator[str]:
+        """
+        Yield the patient-facing summary chunk by chunk ("text" or "html")
+        so large summaries can be sent without building the full string
+        """
+        from renderer import SummaryRenderer
+        renderer = SummaryRenderer(fmt)
+        return renderer.stream(renderer.summary_events(summary))
+    
+    def write_summary(self, summary: Dict, target, fmt: str = "text") -> int:
+        """
+        Stream the summary straight into a file-like object or socket
         
-        output = []
-        
-        # Header
-        output.append("╔" + "═"*68 + "╗")
-        output.append("║" + " "*68 + "║")
-        output.append("║" + "        🏥 YOUR HEALTH SUMMARY - EASY TO UNDERSTAND        ".center(68) + "║")
-        output.append("║" + " "*68 + "║")
-        output.append("╚" + "═"*68 + "╝")
-        output.append("")
-        
-        output.append(f"Patient: {summary['patient_name']}")
-        output.append(f"Date: {summary['generated_date']} at {summary['generated_time']}")
-        output.append("")
-        output.append("─"*70)
-        
-        # SECTION 1: Diagnoses
-        section1 = summary['section_1_diagnoses']
-        output.append("")
-        output.append(f"📋 {section1['title'].upper()}")
-        output.append("─"*70)
-        
-        for dx in section1['diagnoses']:
-            output.append(f"\n✓ {dx['diagnosis']} (also called: {dx['simple_name']})")
-            output.append(f"  {dx['explanation']}")
-            if dx['analogy']:
-                output.append(f"  💡 Think of it like: {dx['analogy']}")
-        
-        if section1['test_results']:
-            output.append("\n📊 YOUR TEST RESULTS:")
-            for test in section1['test_results']:
-                output.append(f"  • {test['test']}: {test['your_value']}")
-                output.append(f"    {test['what_it_means']}")
-                output.append(f"    (Normal range: {test['normal_range']})")
-        
-        # SECTION 2: Medications
-        section2 = summary['section_2_medications']
-        output.append("\n")
-        output.append("─"*70)
-        output.append(f"💊 {section2['title'].upper()}")
-        output.append("─"*70)
-        
-        for med in section2['medications']:
-            output.append(f"\n✓ {med['medication']} ({med['dosage']})")
-            output.append(f"  What it does: {med['what_it_does']}")
-            output.append(f"  ⚠️  {med['reminder']}")
-        
-        # SECTION 3: Action Plan
-        section3 = summary['section_3_action_plan']
-        output.append("\n")
-        output.append("─"*70)
-        output.append(f"📝 {section3['title'].upper()}")
-        output.append("─"*70)
-        
-        if section3['diet']:
-            output.append("\n🥗 DIET & NUTRITION:")
-            for i, tip in enumerate(section3['diet'], 1):
-                output.append(f"  {i}. {tip}")
-        
-        if section3['exercise']:
-            output.append("\n🏃 EXERCISE & ACTIVITY:")
-            for i, tip in enumerate(section3['exercise'], 1):
-                output.append(f"  {i}. {tip}")
-        
-        if section3['daily_habits']:
-            output.append("\n📅 DAILY HABITS TO TRACK:")
-            for i, habit in enumerate(section3['daily_habits'], 1):
-                output.append(f"  {i}. {habit}")
-        
-        if section3['medication_reminders']:
-            output.append("\n💊 MEDICATION REMINDERS:")
-            for i, reminder in enumerate(section3['medication_reminders'], 1):
-                output.append(f"  {i}. {reminder}")
-        
-        # SECTION 4: Warning Signs
-        section4 = summary['section_4_warning_signs']
-        output.append("\n")
-        output.append("─"*70)
-        output.append(f"⚠️  {section4['title'].upper()}")
-        output.append("─"*70)
-        
-        for sign in section4['warning_signs']:
-            output.append(f"  • {sign}")
-        
-        # SECTION 5: Questions for Doctor
-        section5 = summary['section_5_questions']
-        output.append("\n")
-        output.append("─"*70)
-        output.append(f"❓ {section5['title'].upper()}")
-        output.append("─"*70)
-        
-        for i, question in enumerate(section5['questions'], 1):
-            output.append(f"  {i}. {question}")
-        
-        # SECTION 6: Glossary
-        if summary['section_6_glossary']['abbreviations']:
-            section6 = summary['section_6_glossary']
-            output.append("\n")
-            output.append("─"*70)
-            output.append(f"📖 {section6['title'].upper()}")
-            output.append("─"*70)
-            
-            for abbrev in section6['abbreviations']:
-                output.append(f"  • {abbrev['abbreviation']} = {abbrev['meaning']}")
-        
-        # Disclaimer
-        output.append("\n")
-        output.append("─"*70)
-        output.append(summary['disclaimer'])
-        output.append("─"*70)
-        
-        # Footer
-        output.append("\n")
-        output.append("Generated by Boomer Health Summary System")
-        output.append(f"Team: Oyinade Balogun, Hilary C Bruton, Glen Sam, Kaleb")
-        output.append("ITAI 2376 - AI Agents Final Project")
-        
-        return "\n".join(output)
+        Returns:
+            Number of characters written
+        """
+        from renderer import SummaryRenderer
+        renderer = SummaryRenderer(fmt)
+        return renderer.write(renderer.summary_events(summary), target)
     
     def save_summary_to_file(self, summary: Dict, filename: str = None):
         """Save summary to JSON file"""
@@ -315,12 +689,12 @@ class BoomerHealthPipeline:
         Collect user feedback for reinforcement learning
         
         Args:
-            summary_id: Index in processing_history
+            summary_id: metadata['summary_id'] of the summary (one of the last history_limit)
             feedback: Dict with 'clarity', 'helpfulness', 'completeness' ratings
+                      (rating a summary again replaces its earlier feedback)
         """
-        if summary_id < len(self.processing_history):
-            self.processing_history[summary_id]['feedback'] = feedback
-            
+        index = summary_id - self._history_offset
+        if 0 <= index < len(self.processing_history):
             # Simple reward calculation
             reward = (
                 feedback.get('clarity', 0) * 0.4 +
@@ -328,12 +702,22 @@ class BoomerHealthPipeline:
                 feedback.get('completeness', 0) * 0.2
             )
             
-            self.processing_history[summary_id]['reward'] = reward
-            
-            print(f"📊 Feedback recorded! Reward score: {reward:.2f}/5.0")
+            # Replace the entry in one step so readers never see feedback without its reward
+            with self._history_lock:
+                index = summary_id - self._history_offset
+                if index < 0:
+                    print("❌ Summary ID has expired from the history")
+                    return None
+                entry = self.processing_history[index]
+                self.processing_history[index] = dict(entry, feedback=feedback, reward=reward)
+                
+                # Credit the reward to the explanations and tips this summary showed;
+                # a second rating of the same summary replaces the first
+                if self.feedback_store is not None:
+                    self.feedback_store.record_summary(entry['summary'], reward, entry.get('reward'))
             
-            # In a real system, this would update agent policies
-            # For this project, we just log it
+            action = "updated" if 'reward' in entry else "recorded"
+            print(f"📊 Feedback {action}! Reward score: {reward:.2f}/5.0")
             return reward
         else:
             print("❌ Invalid summary ID")
@@ -435,4 +819,4 @@ if __name__ == "__main__":
         'helpfulness': 5,
         'completeness': 4
     }
-    pipeline.collect_feedback(0, feedback)
+    pipeline.collect_feedback(summary['metadata']['summary_id'], feedback)
@@ -0,0 +1,261 @@
+"""
+Profiling Hooks - Opt-in, sampled hot-path analysis for production requests
+Captures cProfile or tracemalloc data for a fraction of documents and writes flame-graph stacks
+
+Team: Oyinade Balogun, Hilary C Bruton, Glen Sam, Kaleb
+Course: ITAI 2376 - Boomer Health Summary Project
+
+Enable with environment variables (read by BoomerHealthPipeline on startup):
+    BOOMER_PROFILE=cprofile|tracemalloc   capture mode
+    BOOMER_PROFILE_RATE=0.05              fraction of requests to capture (default 0.01)
+    BOOMER_PROFILE_DIR=profiles           where capture files are written
+or call pipeline.enable_profiling(...) at runtime.
+"""
+
+import cProfile
+import functools
+import os
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+PROFILE_MODES = ('cprofile', 'tracemalloc')
+
+# Deepest call stack written to collapsed output
+MAX_STACK_DEPTH = 64
+
+
+def text_bytes(value) -> int:
+    """UTF-8 size of a string argument (cheap path for ASCII)"""
+    if not isinstance(value, str):
+        return 0
+    return len(value) if value.isascii() else len(value.encode('utf-8'))
+
+
+def frame_label(func_key) -> str:
+    """Flame-graph frame name for a pstats (file, line, function) key"""
+    filename, line, name = func_key
+    if filename == '~':
+        return name  # built-in
+    return f"{os.path.basename(filename)}:{name}:{line}"
+
+
+def pstats_to_collapsed(stats: pstats.Stats) -> List[str]:
+    """
+    Convert cProfile stats into collapsed stacks ("a;b;c microseconds").
+
+    cProfile only records caller -> callee edges, so each function's time is
+    split across its call paths in proportion to the edge's cumulative time.
+    """
+    raw = stats.stats
+    callees: Dict = {}
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    totals: Dict[str, float] = {}
+
+    def expand(func, path: List[str], time_on_path: float):
+        _, _, tottime, cumtime, _ = raw[func]
+        if cumtime <= 0 or time_on_path <= 0:
+            return
+        stack = path + [frame_label(func)]
+        share = time_on_path / cumtime
+        key = ";".join(stack)
+        totals[key] = totals.get(key, 0.0) + tottime * share
+        if len(stack) >= MAX_STACK_DEPTH:
+            return
+        for callee, edge_cumtime in callees.get(func, []):
+            if frame_label(callee) in stack:
+                continue  # recursion - already counted on this path
+            expand(callee, stack, edge_cumtime * share)
+
+    roots = [func for func, row in raw.items() if not row[4]]
+    for root in roots:
+        expand(root, [], raw[root][3])
+
+    return [f"{stack} {int(seconds * 1e6)}" for stack, seconds in totals.items()
+            if int(seconds * 1e6) > 0]
+
+
+def tracemalloc_to_collapsed(snapshot: tracemalloc.Snapshot) -> List[str]:
+    """Convert a tracemalloc snapshot into collapsed stacks weighted by bytes"""
+    lines = []
+    for stat in snapshot.statistics('traceback'):
+        frames = [f"{os.path.basename(frame.filename)}:{frame.lineno}"
+                  for frame in reversed(stat.traceback)]
+        lines.append(f"{';'.join(frames)} {stat.size}")
+    return lines
+
+
+class PipelineProfiler:
+    """
+    Samples a fraction of requests for cProfile or tracemalloc capture and
+    counts calls and input bytes for every instrumented extractor method.
+
+    When the pipeline has no profiler attached nothing here runs at all.
+    """
+
+    def __init__(self,
+                 mode: str = "cprofile",
+                 sample_rate: float = 0.01,
+                 output_dir: str = "profiles",
+                 seed: Optional[int] = None):
+        """
+        Args:
+            mode: "cprofile" (time) or "tracemalloc" (allocations)
+            sample_rate: Fraction of requests captured (0-1)
+            output_dir: Directory for .prof/.txt and .collapsed files
+            seed: Optional seed for the sampling decision
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self.output_dir = output_dir
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._capture_count = 0
+        self._capturing = False  # cProfile/tracemalloc are process-wide: one capture at a time
+
+        # method name -> {'calls': n, 'bytes': n}
+        self.counters: Dict[str, Dict[str, int]] = {}
+        self.captures: List[str] = []
+
+    @classmethod
+    def from_env(cls, environ=None) -> Optional['PipelineProfiler']:
+        """Build a profiler from BOOMER_PROFILE* variables, or None if unset"""
+        environ = os.environ if environ is None else environ
+        mode = environ.get('BOOMER_PROFILE', '').strip().lower()
+        if not mode or mode in ('0', 'off', 'false'):
+            return None
+        return cls(
+            mode=mode,
+            sample_rate=float(environ.get('BOOMER_PROFILE_RATE', 0.01)),
+            output_dir=environ.get('BOOMER_PROFILE_DIR', 'profiles')
+        )
+
+    # ------------------------------------------------------------------
+    # Per-extractor counters
+    # ------------------------------------------------------------------
+
+    def instrument(self, agent, prefix: str = "extract_"):
+        """Wrap every agent method starting with prefix to count calls and bytes"""
+        for name in dir(type(agent)):
+            if not name.startswith(prefix):
+                continue
+            method = getattr(agent, name)
+            if callable(method) and not hasattr(method, '__profiled__'):
+                setattr(agent, name, self._counting_wrapper(name, method))
+
+    def uninstrument(self, agent, prefix: str = "extract_"):
+        """Restore the original methods on an instrumented agent"""
+        for name in list(vars(agent)):
+            if name.startswith(prefix) and hasattr(vars(agent)[name], '__profiled__'):
+                delattr(agent, name)
+
+    def _counting_wrapper(self, name: str, method: Callable) -> Callable:
+        counter = self.counters.setdefault(name, {'calls': 0, 'bytes': 0})
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            size = text_bytes(args[0]) if args else 0
+            with self._lock:
+                counter['calls'] += 1
+                counter['bytes'] += size
+            return method(*args, **kwargs)
+
+        wrapper.__profiled__ = True
+        return wrapper
+
+    # ------------------------------------------------------------------
+    # Sampled capture
+    # ------------------------------------------------------------------
+
+    def should_sample(self) -> bool:
+        """Decide whether the current request gets a full capture"""
+        with self._lock:
+            return self._rng.random() < self.sample_rate
+
+    def capture(self, func: Callable, *args, **kwargs):
+        """
+        Run func under the configured profiler and write the capture files
+
+        If another thread is already capturing, func just runs unprofiled.
+        """
+        with self._lock:
+            busy = self._capturing
+            if not busy:
+                self._capturing = True
+                self._capture_count += 1
+                index = self._capture_count
+        if busy:
+            return func(*args, **kwargs)
+        try:
+            return self._capture(index, func, *args, **kwargs)
+        finally:
+            with self._lock:
+                self._capturing = False
+
+    def _capture(self, index: int, func: Callable, *args, **kwargs):
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, f"{self.mode}_{time.strftime('%Y%m%d_%H%M%S')}_{index}")
+
+        if self.mode == 'cprofile':
+            profile = cProfile.Profile()
+            try:
+                return profile.runcall(func, *args, **kwargs)
+            finally:
+                profile.dump_stats(base + '.prof')
+                self._write_collapsed(base, pstats_to_collapsed(pstats.Stats(profile)))
+
+        already_tracing = tracemalloc.is_tracing()
+        if not already_tracing:
+            tracemalloc.start(MAX_STACK_DEPTH)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            snapshot = tracemalloc.take_snapshot()
+            if not already_tracing:
+                tracemalloc.stop()
+            with open(base + '.txt', 'w') as f:
+                for stat in snapshot.statistics('lineno')[:50]:
+                    f.write(f"{stat}\n")
+            self._write_collapsed(base, tracemalloc_to_collapsed(snapshot))
+
+    def _write_collapsed(self, base: str, lines: List[str]):
+        path = base + '.collapsed'
+        with open(path, 'w') as f:
+            f.write("\n".join(lines) + "\n")
+        with self._lock:
+            self.captures.append(path)
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def format_report(self) -> str:
+        """Human-readable counter report"""
+        output = [f"🔬 PROFILING ({self.mode}, sampling {self.sample_rate:.1%}):"]
+        for name, counter in sorted(self.counters.items()):
+            output.append(f"   • {name}: {counter['calls']} calls, {counter['bytes']:,} bytes")
+        output.append(f"   Captures written: {len(self.captures)}")
+        return "\n".join(output)
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    from agent1_extractor import MedicalExtractor
+
+    profiler = PipelineProfiler(mode="cprofile", sample_rate=1.0, output_dir="profiles")
+    extractor = MedicalExtractor()
+    profiler.instrument(extractor)
+
+    print("Testing Pipeline Profiler\n")
+    profiler.capture(extractor.extract_all, "Hypertension. Lisinopril 10mg daily. BP: 140/90")
+    print(profiler.format_report())
+    print(f"Flame-graph input: {profiler.captures[-1]}")
@@ -0,0 +1,264 @@
+"""
+Records - Slotted data model passed between the agents
+Compact typed records for extractions, explanations and action plans
+
+Team: Oyinade Balogun, Hilary C Bruton, Glen Sam, Kaleb
+Course: ITAI 2376 - Boomer Health Summary Project
+"""
+
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Optional
+
+
+class Record:
+    """
+    Base for the slotted records below.
+
+    Records are converted with to_dict() only where data leaves Python
+    (JSON files, the cache, the final summary). Inside the pipeline they are
+    read by attribute, and they still answer record['field'] and
+    record.get('field', default) so code written against the old dicts keeps working.
+    """
+
+    __slots__ = ()
+
+    # field name -> Record type of the field's value (or of each list item)
+    _nested: Dict[str, type] = {}
+    # fields left out of to_dict() while they are None
+    _omit_if_none = ()
+
+    def to_dict(self) -> Dict:
+        """Plain nested dicts/lists, in field order (the JSON shape)"""
+        output = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if value is None and name in self._omit_if_none:
+                continue
+            output[name] = to_plain(value)
+        return output
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a record (and its nested records) from to_dict() output"""
+        if isinstance(data, cls):
+            return data
+        values = {}
+        for name in cls.__slots__:
+            if name not in data:
+                continue
+            value = data[name]
+            nested = cls._nested.get(name)
+            if nested is not None and value is not None:
+                value = [nested.from_dict(item) for item in value] if isinstance(value, list) else nested.from_dict(value)
+            values[name] = value
+        return cls(**values)
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default) if key in self.__dataclass_fields__ else default
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__dataclass_fields__
+
+
+def slotted(cls):
+    """
+    @dataclass that stores its fields in __slots__ (what dataclass(slots=True)
+    does on Python 3.10+; kept by hand for 3.8 and 3.9)
+    """
+    cls = dataclass(cls)
+    names = tuple(item.name for item in fields(cls))
+    # Field defaults live in the generated __init__, so the class attributes can go
+    namespace = {key: value for key, value in cls.__dict__.items()
+                 if key not in names and key not in ('__dict__', '__weakref__')}
+    namespace['__slots__'] = names
+    slotted_cls = type(cls)(cls.__name__, cls.__bases__, namespace)
+    slotted_cls.__qualname__ = cls.__qualname__
+    return slotted_cls
+
+
+def to_plain(value: Any) -> Any:
+    """Convert records anywhere inside value to plain dicts (lists and dicts are copied)"""
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [to_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {key: to_plain(item) for key, item in value.items()}
+    return value
+
+
+# ----------------------------------------------------------------------
+# Triage pre-scan
+# ----------------------------------------------------------------------
+
+@slotted
+class TriageResult(Record):
+    """Emergency pre-scan of the raw text (runs before Agent 1)"""
+    urgent: bool
+    findings: List[str]  # emergency phrases found, lowercased
+    categories: List[str]  # category of each finding
+    message: str = ""
+
+
+# ----------------------------------------------------------------------
+# Agent 1
+# ----------------------------------------------------------------------
+
+@slotted
+class Medication(Record):
+    name: str
+    dosage: str = "See prescription"
+    span: Optional[List[int]] = None  # [start, end) of the name in the original text
+
+    _omit_if_none = ('span',)
+
+
+@slotted
+class TestResult(Record):
+    test: str
+    value: str
+    span: Optional[List[int]] = None  # [start, end) of the reading in the original text
+
+    _omit_if_none = ('span',)
+
+
+@slotted
+class ScopedFinding(Record):
+    """A diagnosis or symptom mentioned in the text but not as a current finding"""
+    finding: str
+    category: str  # "diagnosis" or "symptom"
+    context: str  # "negated", "resolved", "family_history" or "conditional"
+    cue: str  # the trigger phrase, e.g. "denies"
+
+
+@slotted
+class Extraction(Record):
+    """Agent 1's output"""
+    input_method: str
+    diagnoses: List[str]
+    medications: List[Medication]
+    symptoms: List[str]
+    instructions: List[str]
+    followups: List[str]
+    test_results: List[TestResult]
+    flagged_terms: List[str]
+    raw_text_preview: str
+    extraction_quality: Optional[str] = None
+    pages: Optional[int] = None  # photo uploads only
+    scoped_findings: Optional[List[ScopedFinding]] = None  # not current findings (kept out of the lists above)
+
+    _nested = {'medications': Medication, 'test_results': TestResult, 'scoped_findings': ScopedFinding}
+    _omit_if_none = ('pages', 'scoped_findings')
+
+
+# Characters of the document kept in Extraction.raw_text_preview
+PREVIEW_CHARS = 200
+
+
+def text_preview(text: str) -> str:
+    """Extraction.raw_text_preview for a document"""
+    return text[:PREVIEW_CHARS] + "..." if len(text) > PREVIEW_CHARS else text
+
+
+# ----------------------------------------------------------------------
+# Agent 2
+# ----------------------------------------------------------------------
+
+@slotted
+class ExplainedDiagnosis(Record):
+    diagnosis: str
+    simple_name: str
+    explanation: str
+    analogy: str = ''
+
+
+@slotted
+class ExplainedMedication(Record):
+    medication: str
+    dosage: str
+    what_it_does: str
+    reminder: str
+
+
+@slotted
+class ExplainedAbbreviation(Record):
+    abbreviation: str
+    meaning: str
+
+
+@slotted
+class ExplainedTestResult(Record):
+    test: str
+    your_value: str
+    what_it_means: str
+    normal_range: str
+
+
+@slotted
+class Explanation(Record):
+    """Agent 2's output"""
+    diagnoses_explained: List[ExplainedDiagnosis]
+    medications_explained: List[ExplainedMedication]
+    abbreviations_explained: List[ExplainedAbbreviation]
+    test_results_explained: List[ExplainedTestResult]
+    disclaimer: str
+    original_extraction: Optional[Extraction] = None
+
+    _nested = {
+        'diagnoses_explained': ExplainedDiagnosis,
+        'medications_explained': ExplainedMedication,
+        'abbreviations_explained': ExplainedAbbreviation,
+        'test_results_explained': ExplainedTestResult,
+        'original_extraction': Extraction
+    }
+
+
+# ----------------------------------------------------------------------
+# Agent 3
+# ----------------------------------------------------------------------
+
+@slotted
+class MedicationInteraction(Record):
+    medications: List[str]
+    severity: str  # "major", "moderate" or "minor"
+    warning: str
+    question: str
+
+
+@slotted
+class ActionPlan(Record):
+    """Agent 3's output"""
+    diet_recommendations: List[str]
+    exercise_recommendations: List[str]
+    daily_habits: List[str]
+    warning_signs: List[str]
+    questions_for_doctor: List[str]
+    medication_reminders: List[str]
+    encouragement: str
+    medication_interactions: List[MedicationInteraction] = field(default_factory=list)
+
+    _nested = {'medication_interactions': MedicationInteraction}
+
+
+# Record type each pipeline stage produces (used to rebuild cached stage outputs)
+STAGE_RECORDS = {'extraction': Extraction, 'triage': TriageResult,
+                 'explanation': Explanation, 'action_plan': ActionPlan}
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    import json
+    import sys
+
+    med = Medication("Lisinopril", "20mg")
+    print("Testing Records\n")
+    print(f"Attribute and key access: {med.name} / {med['dosage']}")
+    print(f"Record size: {sys.getsizeof(med)} bytes vs dict {sys.getsizeof(med.to_dict())} bytes")
+    print(json.dumps(med.to_dict()))
+    print(f"Round trip equal: {Medication.from_dict(med.to_dict()) == med}")
@@ -0,0 +1,431 @@
+"""
+Summary Renderer
+Shared streaming renderer behind every format_for_display method
+
+Team: Oyinade Balogun, Hilary C Bruton, Glen Sam, Kaleb
+Course: ITAI 2376 - Boomer Health Summary Project
+"""
+
+import html
+from typing import Dict, Iterable, Iterator, Tuple
+
+# Fixed-width rules used by the plain-text layouts
+BANNER_RULE = "=" * 60
+SECTION_RULE = "─" * 70
+
+# Plain-text section templates, one per kind of line the layouts emit
+TEXT_TEMPLATES = {
+    'banner_rule': BANNER_RULE,
+    'section_rule': SECTION_RULE,
+    'box_top': "╔" + "═" * 68 + "╗",
+    'box_blank': "║" + " " * 68 + "║",
+    'box_title': "║{text}║",
+    'box_bottom': "╚" + "═" * 68 + "╝",
+    'title': "{text}",
+    'field': "{label}: {value}",
+    'heading': "{text}",
+    'subheading': "\n{text}",
+    'entry': "\n✓ {text}",
+    'item': "📌 {text}",
+    'bullet': "{indent}• {text}",
+    'numbered': "{indent}{n}. {text}",
+    'indent': "{indent}{text}",
+    'paragraph': "{text}",
+    'blank': "",
+    'gap': "\n",
+}
+
+# HTML section templates - same line kinds, semantic markup instead of layout
+HTML_TEMPLATES = {
+    'banner_rule': "<hr>",
+    'section_rule': "<hr>",
+    'box_top': "",
+    'box_blank': "",
+    'box_title': "<h1>{text}</h1>",
+    'box_bottom': "",
+    'title': "<h1>{text}</h1>",
+    'field': "<p><strong>{label}:</strong> {value}</p>",
+    'heading': "<h2>{text}</h2>",
+    'subheading': "<h3>{text}</h3>",
+    'entry': "<h3>✓ {text}</h3>",
+    'item': "<h3>📌 {text}</h3>",
+    'bullet': "<p class=\"bullet\">• {text}</p>",
+    'numbered': "<p class=\"numbered\">{n}. {text}</p>",
+    'indent': "<p>{text}</p>",
+    'paragraph': "<p class=\"paragraph\">{text}</p>",
+    'blank': "",
+    'gap': "",
+}
+
+# Precompile every template once: a bound str.format per line kind
+_COMPILED = {
+    'text': {kind: template.format for kind, template in TEXT_TEMPLATES.items()},
+    'html': {kind: template.format for kind, template in HTML_TEMPLATES.items()},
+}
+
+# How scoped (not current) findings are labelled in the extraction layout
+SCOPE_LABELS = {
+    'negated': "not present",
+    'resolved': "resolved",
+    'family_history': "family history",
+    'conditional': "only if it happens",
+}
+
+Event = Tuple[str, Dict]
+
+
+class SummaryRenderer:
+    """
+    Turns agent outputs into display text one chunk at a time.
+
+    Each layout method yields (line_kind, fields) events; stream() maps
+    them through the precompiled templates for the chosen format, so a
+    large summary can be written out without building the whole string.
+    """
+
+    def __init__(self, fmt: str = "text"):
+        """Pick the template set ("text" or "html")"""
+        if fmt not in _COMPILED:
+            raise ValueError(f"Unknown display format: {fmt}")
+        self.fmt = fmt
+        self.templates = _COMPILED[fmt]
+
+    def stream(self, events: Iterable[Event]) -> Iterator[str]:
+        """Yield rendered chunks; joining them gives the full display text"""
+        escape = self.fmt == "html"
+        separator = ""
+        for kind, fields in events:
+            if escape:
+                fields = {key: html.escape(str(value)).replace("\n", "<br>")
+                          for key, value in fields.items()}
+            yield separator + self.templates[kind](**fields)
+            separator = "\n"
+
+    def render(self, events: Iterable[Event]) -> str:
+        """Render events into a single string"""
+        return "".join(self.stream(events))
+
+    def write(self, events: Iterable[Event], target) -> int:
+        """
+        Write rendered chunks straight to a file-like object or socket
+
+        Returns:
+            Number of characters written
+        """
+        written = 0
+        send = getattr(target, 'sendall', None)
+        for chunk in self.stream(events):
+            if send is not None:
+                send(chunk.encode('utf-8'))
+            else:
+                target.write(chunk)
+            written += len(chunk)
+        return written
+
+    # ------------------------------------------------------------------
+    # Layouts
+    # ------------------------------------------------------------------
+
+    def extraction_events(self, extracted_data: Dict) -> Iterator[Event]:
+        """Layout for Agent 1's extracted data"""
+        yield 'banner_rule', {}
+        yield 'title', {'text': "AGENT 1: MEDICAL INFORMATION EXTRACTED"}
+        yield 'banner_rule', {}
+        yield 'field', {'label': "Input Method", 'value': extracted_data['input_method']}
+        yield 'field', {'label': "Extraction Quality",
+                        'value': extracted_data['extraction_quality'].upper()}
+        yield 'blank', {}
+
+        if extracted_data['diagnoses']:
+            yield 'heading', {'text': "📋 DIAGNOSES FOUND:"}
+            for dx in extracted_data['diagnoses']:
+                yield 'bullet', {'indent': "   ", 'text': dx}
+            yield 'blank', {}
+
+        if extracted_data['medications']:
+            yield 'heading', {'text': "💊 MEDICATIONS:"}
+            for med in extracted_data['medications']:
+                yield 'bullet', {'indent': "   ", 'text': f"{med['name']} - {med['dosage']}"}
+            yield 'blank', {}
+
+        if extracted_data['test_results']:
+            yield 'heading', {'text': "🔬 TEST RESULTS:"}
+            for test in extracted_data['test_results']:
+                yield 'bullet', {'indent': "   ", 'text': f"{test['test']}: {test['value']}"}
+            yield 'blank', {}
+
+        if extracted_data['symptoms']:
+            yield 'heading', {'text': "🤒 SYMPTOMS NOTED:"}
+            for symptom in extracted_data['symptoms']:
+                yield 'bullet', {'indent': "   ", 'text': symptom}
+            yield 'blank', {}
+
+        if extracted_data.get('scoped_findings'):
+            yield 'heading', {'text': "🚫 MENTIONED, BUT NOT CURRENT:"}
+            for finding in extracted_data['scoped_findings']:
+                label = SCOPE_LABELS.get(finding['context'], finding['context'])
+                yield 'bullet', {'indent': "   ", 'text': f"{finding['finding']} ({label}: \"{finding['cue']}\")"}
+            yield 'blank', {}
+
+        if extracted_data['instructions']:
+            yield 'heading', {'text': "📝 INSTRUCTIONS:"}
+            for instruction in extracted_data['instructions'][:5]:  # Limit to 5
+                yield 'bullet', {'indent': "   ", 'text': instruction}
+            yield 'blank', {}
+
+        if extracted_data['followups']:
+            yield 'heading', {'text': "📅 FOLLOW-UP NEEDED:"}
+            for followup in extracted_data['followups']:
+                yield 'bullet', {'indent': "   ", 'text': followup}
+            yield 'blank', {}
+
+        if extracted_data['flagged_terms']:
+            yield 'heading', {'text': "⚠️  MEDICAL TERMS TO EXPLAIN (for Agent 2):"}
+            yield 'indent', {'indent': "   ", 'text': ', '.join(extracted_data['flagged_terms'])}
+            yield 'blank', {}
+
+        yield 'banner_rule', {}
+        yield 'title', {'text': "Ready to send to Agent 2 (Health Explainer)"}
+        yield 'banner_rule', {}
+
+    def explanation_events(self, explained_data: Dict) -> Iterator[Event]:
+        """Layout for Agent 2's plain-language explanations"""
+        yield 'banner_rule', {}
+        yield 'title', {'text': "AGENT 2: PLAIN-LANGUAGE HEALTH EXPLANATION"}
+        yield 'banner_rule', {}
+        yield 'blank', {}
+
+        if explained_data['diagnoses_explained']:
+            yield 'heading', {'text': "🏥 YOUR DIAGNOSES EXPLAINED:"}
+            yield 'blank', {}
+            for dx in explained_data['diagnoses_explained']:
+                yield 'item', {'text': f"{dx['diagnosis']} (also called: {dx['simple_name']})"}
+                yield 'indent', {'indent': "   ", 'text': dx['explanation']}
+                if dx['analogy']:
+                    yield 'indent', {'indent': "   ", 'text': f"💡 Think of it like: {dx['analogy']}"}
+                yield 'blank', {}
+
+        if explained_data['medications_explained']:
+            yield 'heading', {'text': "💊 YOUR MEDICATIONS EXPLAINED:"}
+            yield 'blank', {}
+            for med in explained_data['medications_explained']:
+                yield 'item', {'text': f"{med['medication']} ({med['dosage']})"}
+                yield 'indent', {'indent': "   ", 'text': f"What it does: {med['what_it_does']}"}
+                yield 'indent', {'indent': "   ", 'text': f"⚠️  {med['reminder']}"}
+                yield 'blank', {}
+
+        if explained_data['test_results_explained']:
+            yield 'heading', {'text': "🔬 YOUR TEST RESULTS EXPLAINED:"}
+            yield 'blank', {}
+            for test in explained_data['test_results_explained']:
+                yield 'item', {'text': f"{test['test']}: {test['your_value']}"}
+                yield 'indent', {'indent': "   ", 'text': test['what_it_means']}
+                yield 'indent', {'indent': "   ", 'text': f"Normal range: {test['normal_range']}"}
+                yield 'blank', {}
+
+        if explained_data['abbreviations_explained']:
+            yield 'heading', {'text': "📖 MEDICAL TERMS TRANSLATED:"}
+            for abbrev in explained_data['abbreviations_explained']:
+                yield 'bullet', {'indent': "   ",
+                                 'text': f"{abbrev['abbreviation']} = {abbrev['meaning']}"}
+            yield 'blank', {}
+
+        yield 'paragraph', {'text': explained_data['disclaimer']}
+        yield 'blank', {}
+        yield 'banner_rule', {}
+        yield 'title', {'text': "Ready to send to Agent 3 (Lifestyle Coach)"}
+        yield 'banner_rule', {}
+
+    def action_plan_events(self, action_plan: Dict) -> Iterator[Event]:
+        """Layout for Agent 3's action plan"""
+        yield 'banner_rule', {}
+        yield 'title', {'text': "AGENT 3: YOUR PERSONALIZED ACTION PLAN"}
+        yield 'banner_rule', {}
+        yield 'blank', {}
+
+        numbered_sections = [
+            ('diet_recommendations', "🥗 DIET & NUTRITION TIPS:"),
+            ('exercise_recommendations', "🏃 EXERCISE & ACTIVITY:"),
+            ('daily_habits', "📅 DAILY HABITS TO TRACK:"),
+            ('medication_reminders', "💊 MEDICATION REMINDERS:"),
+        ]
+        for key, heading in numbered_sections:
+            if action_plan[key]:
+                yield 'heading', {'text': heading}
+                for i, tip in enumerate(action_plan[key], 1):
+                    yield 'numbered', {'indent': "   ", 'n': i, 'text': tip}
+                yield 'blank', {}
+
+        interactions = action_plan.get('medication_interactions')
+        if interactions:
+            yield 'heading', {'text': "💊 MEDICATION COMBINATIONS TO ASK ABOUT:"}
+            for hit in interactions:
+                yield 'bullet', {'indent': "   ", 'text': f"[{hit['severity'].upper()}] {hit['warning']}"}
+            yield 'blank', {}
+
+        if action_plan['warning_signs']:
+            yield 'heading', {'text': "⚠️  WARNING SIGNS - WHEN TO GET HELP:"}
+            for sign in action_plan['warning_signs']:
+                yield 'bullet', {'indent': "   ", 'text': sign}
+            yield 'blank', {}
+
+        if action_plan['questions_for_doctor']:
+            yield 'heading', {'text': "QUESTIONS TO ASK YOUR DOCTOR:"}
+            for i, question in enumerate(action_plan['questions_for_doctor'], 1):
+                yield 'numbered', {'indent': "   ", 'n': i, 'text': question}
+            yield 'blank', {}
+
+        yield 'paragraph', {'text': "💙 " + action_plan['encouragement']}
+        yield 'blank', {}
+        yield 'banner_rule', {}
+        yield 'title', {'text': "Ready for final assembly by Agent 4 (Report Builder)"}
+        yield 'banner_rule', {}
+
+    def _section_header(self, title: str) -> Iterator[Event]:
+        """Gap, rule, title, rule - shared by summary sections 2 to 6"""
+        yield 'gap', {}
+        yield 'section_rule', {}
+        yield 'heading', {'text': title}
+        yield 'section_rule', {}
+
+    def triage_events(self, triage: Dict) -> Iterator[Event]:
+        """Emergency banner shown above everything else (nothing when the pre-scan was clear)"""
+        if not triage or not triage['urgent']:
+            return
+        yield 'banner_rule', {}
+        yield 'title', {'text': triage['message']}
+        yield 'field', {'label': "Your document mentions", 'value': ", ".join(triage['findings'])}
+        yield 'banner_rule', {}
+        yield 'blank', {}
+
+    def summary_events(self, summary: Dict, include_triage: bool = True) -> Iterator[Event]:
+        """Layout for the final patient-facing summary (include_triage=False when the banner was already sent)"""
+        if include_triage:
+            yield from self.triage_events(summary.get('triage'))
+        yield 'box_top', {}
+        yield 'box_blank', {}
+        yield 'box_title', {'text': "        🏥 YOUR HEALTH SUMMARY - EASY TO UNDERSTAND        ".center(68)}
+        yield 'box_blank', {}
+        yield 'box_bottom', {}
+        yield 'blank', {}
+
+        yield 'field', {'label': "Patient", 'value': summary['patient_name']}
+        yield 'field', {'label': "Date",
+                        'value': f"{summary['generated_date']} at {summary['generated_time']}"}
+        degraded = summary.get('metadata', {}).get('degraded')
+        if degraded:
+            yield 'field', {'label': "Note",
+                            'value': "Shortened to finish on time - left out or cut: "
+                                     + ", ".join(item.replace('_', ' ') for item in degraded)}
+        changes = summary.get('metadata', {}).get('changes_since_last_visit')
+        if changes:
+            yield 'subheading', {'text': "🔄 WHAT CHANGED SINCE YOUR LAST VISIT:"}
+            for change in changes:
+                yield 'bullet', {'indent': "  ", 'text': change}
+        yield 'blank', {}
+        yield 'section_rule', {}
+
+        # SECTION 1: Diagnoses
+        section1 = summary['section_1_diagnoses']
+        yield 'blank', {}
+        yield 'heading', {'text': f"📋 {section1['title'].upper()}"}
+        yield 'section_rule', {}
+
+        for dx in section1['diagnoses']:
+            yield 'entry', {'text': f"{dx['diagnosis']} (also called: {dx['simple_name']})"}
+            yield 'indent', {'indent': "  ", 'text': dx['explanation']}
+            if dx['analogy']:
+                yield 'indent', {'indent': "  ", 'text': f"💡 Think of it like: {dx['analogy']}"}
+
+        if section1['test_results']:
+            yield 'subheading', {'text': "📊 YOUR TEST RESULTS:"}
+            for test in section1['test_results']:
+                yield 'bullet', {'indent': "  ", 'text': f"{test['test']}: {test['your_value']}"}
+                yield 'indent', {'indent': "    ", 'text': test['what_it_means']}
+                yield 'indent', {'indent': "    ", 'text': f"(Normal range: {test['normal_range']})"}
+
+        # SECTION 2: Medications
+        section2 = summary['section_2_medications']
+        yield from self._section_header(f"💊 {section2['title'].upper()}")
+
+        for med in section2['medications']:
+            yield 'entry', {'text': f"{med['medication']} ({med['dosage']})"}
+            yield 'indent', {'indent': "  ", 'text': f"What it does: {med['what_it_does']}"}
+            yield 'indent', {'indent': "  ", 'text': f"⚠️  {med['reminder']}"}
+
+        if section2.get('interactions'):
+            yield 'subheading', {'text': "⚠️  MEDICATION COMBINATIONS TO ASK ABOUT:"}
+            for hit in section2['interactions']:
+                yield 'bullet', {'indent': "  ", 'text': f"{' + '.join(hit['medications'])}: {hit['warning']}"}
+
+        # SECTION 3: Action Plan
+        section3 = summary['section_3_action_plan']
+        yield from self._section_header(f"📝 {section3['title'].upper()}")
+
+        plan_lists = [
+            ('diet', "🥗 DIET & NUTRITION:"),
+            ('exercise', "🏃 EXERCISE & ACTIVITY:"),
+            ('daily_habits', "📅 DAILY HABITS TO TRACK:"),
+            ('medication_reminders', "💊 MEDICATION REMINDERS:"),
+        ]
+        for key, heading in plan_lists:
+            if section3[key]:
+                yield 'subheading', {'text': heading}
+                for i, tip in enumerate(section3[key], 1):
+                    yield 'numbered', {'indent': "  ", 'n': i, 'text': tip}
+
+        # SECTION 4: Warning Signs
+        section4 = summary['section_4_warning_signs']
+        yield from self._section_header(f"⚠️  {section4['title'].upper()}")
+
+        for sign in section4['warning_signs']:
+            yield 'bullet', {'indent': "  ", 'text': sign}
+
+        # SECTION 5: Questions for Doctor
+        section5 = summary['section_5_questions']
+        yield from self._section_header(f"❓ {section5['title'].upper()}")
+
+        for i, question in enumerate(section5['questions'], 1):
+            yield 'numbered', {'indent': "  ", 'n': i, 'text': question}
+
+        # SECTION 6: Glossary
+        if summary['section_6_glossary']['abbreviations']:
+            section6 = summary['section_6_glossary']
+            yield from self._section_header(f"📖 {section6['title'].upper()}")
+
+            for abbrev in section6['abbreviations']:
+                yield 'bullet', {'indent': "  ",
+                                 'text': f"{abbrev['abbreviation']} = {abbrev['meaning']}"}
+
+        # Disclaimer
+        yield 'gap', {}
+        yield 'section_rule', {}
+        yield 'paragraph', {'text': summary['disclaimer']}
+        yield 'section_rule', {}
+
+        # Footer
+        yield 'gap', {}
+        yield 'title', {'text': "Generated by Boomer Health Summary System"}
+        yield 'title', {'text': "Team: Oyinade Balogun, Hilary C Bruton, Glen Sam, Kaleb"}
+        yield 'title', {'text': "ITAI 2376 - AI Agents Final Project"}
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    import sys
+
+    sample_plan = {
+        'diet_recommendations': ["Limit sodium to 2,000mg or less per day"],
+        'exercise_recommendations': ["Build up slowly - even 5 minutes helps"],
+        'daily_habits': ["Weigh yourself every morning"],
+        'medication_reminders': [],
+        'warning_signs': ["Sudden weight gain (3+ pounds in a day)"],
+        'questions_for_doctor': ["What weight change should worry me?"],
+        'encouragement': "Small changes add up!"
+    }
+
+    print("Testing Summary Renderer (streamed to stdout)\n")
+    SummaryRenderer("text").write(SummaryRenderer("text").action_plan_events(sample_plan), sys.stdout)
+    print("\n")
+    html_renderer = SummaryRenderer("html")
+    print(html_renderer.render(html_renderer.action_plan_events(sample_plan)))
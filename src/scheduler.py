@@ -0,0 +1,303 @@
+"""
+Priority Scheduler - Weighted fair queuing in front of the pipeline
+Urgent documents jump routine backlogs; aging keeps low-priority work moving
+
+Team: Oyinade Balogun, Hilary C Bruton, Glen Sam, Kaleb
+Course: ITAI 2376 - Boomer Health Summary Project
+"""
+
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import field
+from typing import Dict, Iterable, List, Optional
+
+from pipeline import BoomerHealthPipeline
+from records import TriageResult, slotted
+
+# Priority classes, most important first
+PRIORITY_CLASSES = ('urgent', 'discharge', 'routine')
+
+# Share of worker time each class gets while all three are backlogged
+DEFAULT_WEIGHTS = {'urgent': 8.0, 'discharge': 3.0, 'routine': 1.0}
+
+# Seconds a job may wait before aging moves it ahead of fair-queue order
+DEFAULT_MAX_WAIT = {'urgent': 0.5, 'discharge': 10.0, 'routine': 30.0}
+
+# "Call if weight increases by 3 pounds", "sudden weight gain (3+ lbs in a day)"
+WEIGHT_GAIN_INSTRUCTION = re.compile(
+    r'\bweight\s+(?:gain|increases?|goes\s+up|up)\b[^\n.]{0,40}?\d+\+?\s*(?:pounds|lbs?)\b',
+    re.IGNORECASE
+)
+
+# Wait-time samples kept per class for the percentiles
+WAIT_SAMPLES = 10000
+
+
+@slotted
+class _Job:
+    priority: str
+    text: str
+    options: Dict
+    future: Future
+    finish_tag: float
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class PriorityScheduler:
+    """
+    Job queue and worker threads in front of BoomerHealthPipeline.process_document.
+
+    Each priority class has its own FIFO queue. Workers take the job with the
+    smallest weighted-fair-queuing finish tag (size / class weight, added to
+    the class's last tag), so a backlogged class gets its weighted share of
+    workers and never all of them. A queue head that has waited past its
+    class's max_wait is served first (aging), so routine notes cannot starve.
+    """
+
+    def __init__(self,
+                 pipeline: Optional[BoomerHealthPipeline] = None,
+                 max_workers: Optional[int] = None,
+                 weights: Optional[Dict[str, float]] = None,
+                 max_wait: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            pipeline: Shared pipeline (a quiet one is built if None)
+            max_workers: Worker threads (default: one per CPU)
+            weights: Class -> WFQ weight (defaults to DEFAULT_WEIGHTS)
+            max_wait: Class -> seconds before aging promotes a job (defaults to DEFAULT_MAX_WAIT)
+        """
+        self.pipeline = pipeline or BoomerHealthPipeline(verbose=False)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.max_wait = dict(DEFAULT_MAX_WAIT, **(max_wait or {}))
+
+        self._queues = {priority: deque() for priority in PRIORITY_CLASSES}
+        self._last_tag = {priority: 0.0 for priority in PRIORITY_CLASSES}
+        self._virtual_time = 0.0
+        self._ready = threading.Condition()
+        self._workers: List[threading.Thread] = []
+        self._closed = False
+
+        # Metrics (updated under self._ready)
+        self._max_depth = {priority: 0 for priority in PRIORITY_CLASSES}
+        self._waits = {priority: deque(maxlen=WAIT_SAMPLES) for priority in PRIORITY_CLASSES}
+        self._counts = {'submitted': 0, 'completed': 0, 'failed': 0, 'aged': 0}
+
+    def classify(self, document_text: str) -> str:
+        """
+        Priority class for a document
+
+        urgent: emergency language (triage pre-scan)
+        discharge: discharge paperwork, or a weight-gain call-in instruction
+                   as on heart failure discharge papers (time-sensitive at home)
+        routine: everything else (after-visit notes, prescriptions)
+        """
+        return self._classify(document_text, self.pipeline.triage(document_text))
+
+    @staticmethod
+    def _classify(document_text: str, triage: TriageResult) -> str:
+        if triage.urgent:
+            return 'urgent'
+        if 'discharge' in document_text[:2000].lower() or WEIGHT_GAIN_INSTRUCTION.search(document_text):
+            return 'discharge'
+        return 'routine'
+
+    def submit(self,
+               document_text: str,
+               input_method: str = "free_text",
+               patient_name: Optional[str] = None,
+               patient_id: Optional[str] = None,
+               priority: Optional[str] = None,
+               deadline: Optional[float] = None) -> Future:
+        """
+        Queue a document for process_document
+
+        Args:
+            priority: "urgent", "discharge" or "routine" (classified from the text if None)
+            deadline: Optional seconds for processing once a worker picks the job up
+                      (see BoomerHealthPipeline.process_document)
+
+        Returns:
+            Future resolving to the summary
+        """
+        # The pre-scan that classifies the job rides along so the worker doesn't repeat it
+        triage = None
+        if priority is None:
+            triage = self.pipeline.triage(document_text)
+            priority = self._classify(document_text, triage)
+        if priority not in self._queues:
+            raise ValueError(f"Unknown priority class: {priority}")
+
+        future = Future()
+        cost = 1.0 + len(document_text) / 4096  # bigger documents use more of the class's share
+        with self._ready:
+            if self._closed:
+                raise RuntimeError("Scheduler has been shut down")
+            self._start_workers()
+            finish_tag = max(self._virtual_time, self._last_tag[priority]) + cost / self.weights[priority]
+            self._last_tag[priority] = finish_tag
+            queue = self._queues[priority]
+            queue.append(_Job(priority, document_text,
+                              {'input_method': input_method, 'patient_name': patient_name,
+                               'patient_id': patient_id, 'deadline': deadline, 'triage': triage},
+                              future, finish_tag))
+            self._max_depth[priority] = max(self._max_depth[priority], len(queue))
+            self._counts['submitted'] += 1
+            self._ready.notify()
+        return future
+
+    def process(self, document_text: str, **options) -> Dict:
+        """Service mode: submit one document and wait for its summary"""
+        return self.submit(document_text, **options).result()
+
+    def process_batch(self, documents: Iterable[str], input_method: str = "free_text") -> List[Dict]:
+        """
+        Queue many documents by priority
+
+        Returns:
+            Summaries in input order (processing order follows priority)
+        """
+        futures = [self.submit(text, input_method) for text in documents]
+        return [future.result() for future in futures]
+
+    def shutdown(self, wait: bool = True):
+        """Stop taking jobs; workers finish what is already queued"""
+        with self._ready:
+            self._closed = True
+            self._ready.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def __enter__(self) -> 'PriorityScheduler':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def _start_workers(self):
+        """Start the worker threads on first submit (called under self._ready)"""
+        if self._workers:
+            return
+        # Build the agents up front so workers never wait on first-use setup
+        _ = (self.pipeline.agent1, self.pipeline.agent2, self.pipeline.agent3)
+        for index in range(self.max_workers):
+            worker = threading.Thread(target=self._work, name=f"boomer-scheduler-{index}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def _next_job(self) -> Optional[_Job]:
+        """Pop the next job (called under self._ready)"""
+        now = time.perf_counter()
+        heads = [queue[0] for queue in self._queues.values() if queue]
+        if not heads:
+            return None
+
+        overdue = [job for job in heads if now - job.enqueued_at > self.max_wait[job.priority]]
+        if overdue:
+            job = min(overdue, key=lambda j: j.enqueued_at)
+            if job is not min(heads, key=lambda j: j.finish_tag):
+                self._counts['aged'] += 1
+        else:
+            job = min(heads, key=lambda j: j.finish_tag)
+
+        self._queues[job.priority].popleft()
+        self._virtual_time = max(self._virtual_time, job.finish_tag)
+        self._waits[job.priority].append(now - job.enqueued_at)
+        return job
+
+    def _work(self):
+        while True:
+            with self._ready:
+                job = self._next_job()
+                while job is None:
+                    if self._closed:
+                        return
+                    self._ready.wait()
+                    job = self._next_job()
+
+            if not job.future.set_running_or_notify_cancel():
+                continue
+            try:
+                summary = self.pipeline.process_document(job.text, **job.options)
+            except Exception as exc:
+                job.future.set_exception(exc)
+                outcome = 'failed'
+            else:
+                summary['metadata']['priority'] = job.priority
+                job.future.set_result(summary)
+                outcome = 'completed'
+            with self._ready:
+                self._counts[outcome] += 1
+
+    def metrics(self) -> Dict:
+        """
+        Queue-depth and wait-time metrics
+
+        Returns:
+            {'depth': {class: queued now}, 'max_depth': {class: n},
+             'wait_ms': {class: {'jobs', 'mean', 'p50', 'p95', 'max'}},
+             'submitted', 'completed', 'failed', 'aged'}
+        """
+        with self._ready:
+            depth = {priority: len(queue) for priority, queue in self._queues.items()}
+            waits = {priority: sorted(samples) for priority, samples in self._waits.items()}
+            output = dict(self._counts, depth=depth, max_depth=dict(self._max_depth))
+
+        output['wait_ms'] = {}
+        for priority, samples in waits.items():
+            if not samples:
+                output['wait_ms'][priority] = {'jobs': 0, 'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+                continue
+            output['wait_ms'][priority] = {
+                'jobs': len(samples),
+                'mean': 1000 * sum(samples) / len(samples),
+                'p50': 1000 * samples[len(samples) // 2],
+                'p95': 1000 * samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+                'max': 1000 * samples[-1]
+            }
+        return output
+
+    def format_report(self) -> str:
+        """Human-readable queue metrics"""
+        metrics = self.metrics()
+        output = [
+            "🚦 SCHEDULER METRICS",
+            "",
+            f"   Submitted: {metrics['submitted']:,}  Completed: {metrics['completed']:,}  "
+            f"Failed: {metrics['failed']:,}  Aged: {metrics['aged']:,}",
+            "",
+            f"   {'class':<10} {'queued':>7} {'max':>6} {'jobs':>7} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}"
+        ]
+        for priority in PRIORITY_CLASSES:
+            wait = metrics['wait_ms'][priority]
+            output.append(
+                f"   {priority:<10} {metrics['depth'][priority]:>7,} {metrics['max_depth'][priority]:>6,} "
+                f"{wait['jobs']:>7,} {wait['mean']:>9.1f} {wait['p50']:>9.1f} {wait['p95']:>9.1f} {wait['max']:>9.1f}"
+            )
+        return "\n".join(output)
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    from document_generator import DischargeDocumentGenerator
+
+    generator = DischargeDocumentGenerator(seed=11)
+    routine = [f"After-visit note\n{text}" for text in generator.generate_corpus(200, target_bytes=4096)]
+    urgent = "Mom has severe chest pain and is confused. She takes Lisinopril 20mg and Furosemide 40mg."
+
+    print("Testing Priority Scheduler\n")
+    with PriorityScheduler(max_workers=2) as scheduler:
+        futures = [scheduler.submit(text, priority='routine') for text in routine]
+        started = time.perf_counter()
+        urgent_summary = scheduler.submit(urgent).result()
+        print(f"🚨 Urgent document done after {1000 * (time.perf_counter() - started):.0f} ms "
+              f"behind a backlog of {len(routine)} routine notes "
+              f"(priority: {urgent_summary['metadata']['priority']})\n")
+        for future in futures:
+            future.result()
+        print(scheduler.format_report())
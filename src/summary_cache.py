@@ -0,0 +1,330 @@
+"""
+Summary Cache - Content-addressed deduplication across pipeline stages
+Skips re-running agents when the same document (or the same extraction) comes back
+
+Team: Oyinade Balogun, Hilary C Bruton, Glen Sam, Kaleb
+Course: ITAI 2376 - Boomer Health Summary Project
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from records import text_preview, to_plain
+
+# Pipeline stages the cache keeps separate entries for ('triage' only for uploads,
+# whose pages are pre-scanned while they are OCR'd - a cached upload skips OCR)
+STAGES = ('extraction', 'triage', 'explanation', 'action_plan')
+
+# Fields of Agent 1's output that each downstream agent actually reads
+EXPLANATION_INPUT_FIELDS = ('diagnoses', 'medications', 'flagged_terms', 'test_results')
+ACTION_PLAN_INPUT_FIELDS = ('diagnoses', 'medications')
+
+
+# Extraction fields holding [start, end) spans into the document; they are left out
+# of the downstream keys (Agents 2 and 3 never read them)
+SPAN_FIELDS = ('medications', 'test_results')
+
+# Runs of text normalize_document keeps as they are - they come in the same order in
+# every copy of a document and in its normalized form
+WORD = re.compile(r'\S+')
+
+
+def normalize_document(document_text: str) -> str:
+    """
+    Normalize a document so re-typed or re-sent copies hash the same:
+    trims each line, collapses runs of whitespace and runs of blank lines.
+    Case, line breaks and paragraph breaks are kept because extraction
+    depends on them (a blank line ends a negation or "call if" scope).
+    """
+    lines = (re.sub(r'[^\S\n]+', ' ', line).strip() for line in document_text.split('\n'))
+    return re.sub(r'\n{3,}', '\n\n', '\n'.join(lines)).strip('\n')
+
+
+def move_spans(extraction: Dict, source_text: str, target_text: str) -> Dict:
+    """
+    Copy of an extraction (plain dict) with its spans moved from source_text
+    to target_text - two texts with the same normalize_document()
+
+    A span edge is carried over as "word n, offset k"; a span that cannot be
+    placed is dropped. raw_text_preview is rebuilt from target_text.
+    """
+    source, target = _word_bounds(source_text), _word_bounds(target_text)
+    moved = dict(extraction)
+    for field in SPAN_FIELDS:
+        items = []
+        for item in extraction.get(field, []):
+            item = dict(item)
+            if item.get('span') is not None:
+                span = _move_span(item['span'], source, target)
+                if span is None:
+                    del item['span']
+                else:
+                    item['span'] = span
+            items.append(item)
+        moved[field] = items
+    moved['raw_text_preview'] = text_preview(target_text)
+    return moved
+
+
+def _word_bounds(text: str):
+    starts, ends = [], []
+    for match in WORD.finditer(text):
+        starts.append(match.start())
+        ends.append(match.end())
+    return starts, ends
+
+
+def _move_span(span, source, target) -> Optional[list]:
+    (source_starts, source_ends), (target_starts, target_ends) = source, target
+    if len(source_starts) != len(target_starts):
+        return None
+    start, end = span
+    # First word at or after start, and last word before end
+    first = bisect_right(source_starts, start) - 1
+    if first < 0 or start >= source_ends[first]:
+        first, start_offset = first + 1, 0
+    else:
+        start_offset = start - source_starts[first]
+    last = bisect_right(source_starts, max(end - 1, start)) - 1
+    if first >= len(source_starts) or last < first:
+        return None
+    end_offset = min(end, source_ends[last]) - source_starts[last]
+    return [target_starts[first] + start_offset, target_starts[last] + end_offset]
+
+
+def content_hash(payload: str) -> str:
+    """SHA-256 hex digest of a string"""
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SummaryCache:
+    """
+    Two-tier cache for agent outputs:
+    - Memory tier: LRU of serialized entries, bounded by entry count
+    - Disk tier: one JSON file per entry, bounded by total bytes (oldest evicted first)
+
+    Extraction is keyed by the normalized document text (and stored with
+    its spans in that text - see move_spans); explanation and action plan
+    are keyed by the extraction fields they depend on, spans aside, so a
+    different document that extracts the same findings still skips Agents 2 and 3.
+    Lookups and stores are serialized by a lock, so one cache can back a shared pipeline.
+    """
+
+    def __init__(self,
+                 max_memory_entries: int = 512,
+                 cache_dir: Optional[str] = None,
+                 max_disk_bytes: int = 64 * 1024 * 1024):
+        """
+        Args:
+            max_memory_entries: LRU capacity shared by all stages
+            cache_dir: Directory for the on-disk tier (None = memory only)
+            max_disk_bytes: Size budget for the on-disk tier
+        """
+        self.max_memory_entries = max_memory_entries
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory = OrderedDict()  # (stage, key) -> serialized JSON
+        self._disk_index = OrderedDict()  # (stage, key) -> file size, oldest first
+        self._disk_bytes = 0
+        self._lock = threading.Lock()  # one pipeline can be shared by many threads
+
+        self.stats = {stage: {'memory_hits': 0, 'disk_hits': 0, 'misses': 0} for stage in STAGES}
+
+        if cache_dir:
+            self._load_disk_index()
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    def extraction_key(self, document_text: str, input_method: str) -> str:
+        """Key for Agent 1's output"""
+        return content_hash(input_method + '\0' + normalize_document(document_text))
+
+    def form_key(self, form_fields: Dict) -> str:
+        """Key for Agent 1's output on a guided form (its exact fields)"""
+        return content_hash('guided_form\0' + json.dumps(form_fields, sort_keys=True))
+
+    def upload_key(self, upload) -> str:
+        """Key for Agent 1's output on a photo upload (bytes or list of page images)"""
+        pages = [upload] if isinstance(upload, (bytes, bytearray)) else list(upload)
+        digests = [hashlib.sha256(bytes(page)).hexdigest() for page in pages]
+        return content_hash('photo_ocr\0' + ','.join(digests))
+
+    def explanation_key(self, extracted_data: Dict) -> str:
+        """Key for Agent 2's output - only the extraction fields Agent 2 reads"""
+        return self._fields_key(extracted_data, EXPLANATION_INPUT_FIELDS)
+
+    def action_plan_key(self, extracted_data: Dict) -> str:
+        """Key for Agent 3's output - only the extraction fields Agent 3 reads"""
+        return self._fields_key(extracted_data, ACTION_PLAN_INPUT_FIELDS)
+
+    def _fields_key(self, extracted_data: Dict, fields) -> str:
+        subset = {field: to_plain(extracted_data.get(field, [])) for field in fields}
+        for field in SPAN_FIELDS:
+            if field in subset:
+                subset[field] = [{name: value for name, value in item.items() if name != 'span'}
+                                 for item in subset[field]]
+        return content_hash(json.dumps(subset, sort_keys=True))
+
+    def to_entry(self, extraction, document_text: str) -> Dict:
+        """Extraction as stored under extraction_key: spans into the normalized text"""
+        return move_spans(to_plain(extraction), document_text, normalize_document(document_text))
+
+    def from_entry(self, entry: Dict, document_text: str) -> Dict:
+        """Stored extraction with its spans and preview pointing into this copy of the document"""
+        return move_spans(entry, normalize_document(document_text), document_text)
+
+    # ------------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------------
+
+    def get(self, stage: str, key: str) -> Optional[Dict]:
+        """Return a fresh copy of the cached output as plain dicts, or None on a miss"""
+        with self._lock:
+            payload = self._lookup(stage, key)
+        return json.loads(payload) if payload is not None else None
+
+    def _lookup(self, stage: str, key: str) -> Optional[str]:
+        entry_id = (stage, key)
+
+        payload = self._memory.get(entry_id)
+        if payload is not None:
+            self._memory.move_to_end(entry_id)
+            self.stats[stage]['memory_hits'] += 1
+            return payload
+
+        if entry_id in self._disk_index:
+            try:
+                with open(self._entry_path(stage, key), 'r', encoding='utf-8') as f:
+                    payload = f.read()
+            except OSError:
+                self._drop_disk_entry(entry_id)
+            else:
+                self.stats[stage]['disk_hits'] += 1
+                self._remember(entry_id, payload)
+                return payload
+
+        self.stats[stage]['misses'] += 1
+        return None
+
+    def put(self, stage: str, key: str, value: Dict):
+        """Store an agent output (record or dict) in both tiers"""
+        entry_id = (stage, key)
+        payload = json.dumps(value, default=to_plain)
+        with self._lock:
+            self._remember(entry_id, payload)
+            if self.cache_dir:
+                self._write_disk_entry(entry_id, payload)
+
+    def _remember(self, entry_id, payload: str):
+        self._memory[entry_id] = payload
+        self._memory.move_to_end(entry_id)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Disk tier
+    # ------------------------------------------------------------------
+
+    def _entry_path(self, stage: str, key: str) -> str:
+        return os.path.join(self.cache_dir, stage, f"{key}.json")
+
+    def _load_disk_index(self):
+        """Rebuild the size index from files already on disk, oldest first"""
+        entries = []
+        for stage in STAGES:
+            stage_dir = os.path.join(self.cache_dir, stage)
+            os.makedirs(stage_dir, exist_ok=True)
+            for filename in os.listdir(stage_dir):
+                if not filename.endswith('.json'):
+                    continue
+                stat = os.stat(os.path.join(stage_dir, filename))
+                entries.append((stat.st_mtime, stage, filename[:-5], stat.st_size))
+
+        for _, stage, key, size in sorted(entries):
+            self._disk_index[(stage, key)] = size
+            self._disk_bytes += size
+
+    def _write_disk_entry(self, entry_id, payload: str):
+        stage, key = entry_id
+        data = payload.encode('utf-8')
+        if len(data) > self.max_disk_bytes:
+            return
+
+        self._drop_disk_entry(entry_id)
+        path = self._entry_path(stage, key)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        self._disk_index[entry_id] = len(data)
+        self._disk_bytes += len(data)
+
+        while self._disk_bytes > self.max_disk_bytes and self._disk_index:
+            oldest = next(iter(self._disk_index))
+            self._drop_disk_entry(oldest)
+
+    def _drop_disk_entry(self, entry_id):
+        size = self._disk_index.pop(entry_id, None)
+        if size is None:
+            return
+        self._disk_bytes -= size
+        try:
+            os.remove(self._entry_path(*entry_id))
+        except OSError:
+            pass
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def hit_rates(self) -> Dict[str, float]:
+        """Fraction of lookups served from either tier, per stage"""
+        rates = {}
+        for stage, counts in self.stats.items():
+            hits = counts['memory_hits'] + counts['disk_hits']
+            total = hits + counts['misses']
+            rates[stage] = hits / total if total else 0.0
+        return rates
+
+    def format_report(self) -> str:
+        """Human-readable hit-rate report"""
+        rates = self.hit_rates()
+        output = ["📦 CACHE HIT RATES:"]
+        for stage in STAGES:
+            counts = self.stats[stage]
+            output.append(
+                f"   • {stage}: {rates[stage]:.0%} "
+                f"(memory {counts['memory_hits']}, disk {counts['disk_hits']}, misses {counts['misses']})"
+            )
+        output.append(f"   Memory entries: {len(self._memory)}/{self.max_memory_entries}")
+        if self.cache_dir:
+            output.append(f"   Disk usage: {self._disk_bytes:,}/{self.max_disk_bytes:,} bytes")
+        return "\n".join(output)
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    cache = SummaryCache(max_memory_entries=4)
+
+    original = "DIAGNOSES:\n  Hypertension\n\nLisinopril 10mg daily"
+    retyped = "DIAGNOSES:\nHypertension\nLisinopril   10mg daily  "
+
+    print("Testing Summary Cache\n")
+    key = cache.extraction_key(original, "free_text")
+    print(f"Same key for re-typed copy: {key == cache.extraction_key(retyped, 'free_text')}")
+
+    cache.get('extraction', key)
+    cache.put('extraction', key, {'diagnoses': ['Hypertension']})
+    print(f"Cached extraction: {cache.get('extraction', key)}")
+    print()
+    print(cache.format_report())
@@ -0,0 +1,343 @@
+"""
+Summary Codec - Compact storage encoding for summaries and summary deltas
+Swaps canned agent text for IDs from a versioned string table, then zlib with a trained preset dictionary
+
+Team: Oyinade Balogun, Hilary C Bruton, Glen Sam, Kaleb
+Course: ITAI 2376 - Boomer Health Summary Project
+
+Usage:
+    python summary_codec.py                                   # generated discharge documents
+    python summary_codec.py ../data/raw/notes.csv --text-column TEXT --limit 2000
+    python summary_codec.py --build v2                        # train and check in a new default codec
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import threading
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence
+
+# Encoded blob: MAGIC + 16-char codec version (space padded) + zlib stream
+MAGIC = b"BHZ1"
+VERSION_LENGTH = 16
+
+# Default codec, checked in so its version only moves when someone rebuilds it (--build)
+DEFAULT_VERSION = "v1"
+CODEC_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'summary_codec'))
+
+# zlib only looks back 32 KB, so a larger preset dictionary is wasted
+MAX_DICTIONARY_BYTES = 32 * 1024
+
+# A string starting with this character is a table reference; real strings that
+# start with it are stored with it doubled
+REF = "\x00"
+
+# Values that differ on every run and would only add noise to a trained dictionary
+VOLATILE_FIELDS = ('generated_date', 'generated_time', 'summary_id')
+
+# Built-in codecs by version, so decode() finds the one a blob was written with
+_codecs: Dict[str, 'SummaryCodec'] = {}
+_default: Optional['SummaryCodec'] = None
+_default_lock = threading.Lock()
+
+
+def build_string_table() -> List[str]:
+    """
+    Every fixed string the agents put into summaries: disclaimer,
+    encouragement, reminder and question lists, and the explanation /
+    lifestyle tables (sorted, so the same code gives the same table)
+    """
+    from agent2_educator import HealthExplainer
+    from agent3_organizer import LifestyleCoach
+
+    explainer, coach = HealthExplainer(), LifestyleCoach()
+    strings = {explainer.get_disclaimer(), coach.get_encouragement_message()}
+    strings.update(coach.generate_medication_reminders([None]))
+    strings.update(coach.generate_doctor_questions([], []))
+    for table in (explainer.diagnosis_explanations, explainer.medication_explanations,
+                  explainer.abbreviation_explanations, coach.lifestyle_recommendations,
+                  coach.general_doctor_questions):
+        strings.update(_strings_in(table))
+    # Short strings cost about as much as their reference
+    return sorted(s for s in strings if len(s) > 8)
+
+
+def _strings_in(value) -> Iterable[str]:
+    if isinstance(value, str):
+        yield value
+    elif hasattr(value, 'values'):
+        for item in value.values():
+            yield from _strings_in(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _strings_in(item)
+
+
+class SummaryCodec:
+    """
+    Encodes summaries (or deltas - any JSON-like dict) as bytes.
+
+    Strings found in the string table become short references, and the
+    JSON is deflated with a preset dictionary of the field names and
+    values that recur across summaries. Every blob names the codec
+    version it needs - an explicit name for the checked-in default, else a
+    hash of the table and dictionary - and to_json() lets a store keep old
+    codecs so data written before the default is rebuilt still decodes.
+    """
+
+    def __init__(self, table: Sequence[str], dictionary: bytes = b"", level: int = 9,
+                 version: Optional[str] = None):
+        """
+        Args:
+            table: Canned strings, referenced by position
+            dictionary: zlib preset dictionary (see train())
+            level: zlib compression level
+            version: Name for this codec (default: a hash of table and dictionary)
+        """
+        self.table = list(table)
+        self.dictionary = dictionary[-MAX_DICTIONARY_BYTES:]
+        self.level = level
+        self._ids = {text: index for index, text in enumerate(self.table)}
+        if version is None:
+            digest = hashlib.sha256("\n".join(self.table).encode('utf-8') + b"\0" + self.dictionary)
+            version = digest.hexdigest()[:VERSION_LENGTH]
+        if not version or len(version) > VERSION_LENGTH or not version.isascii() or version != version.strip():
+            raise ValueError(f"Codec version must be 1-{VERSION_LENGTH} ASCII characters without edge spaces")
+        self.version = version
+
+    @classmethod
+    def train(cls, samples: Iterable[Dict], table: Optional[Sequence[str]] = None,
+              version: Optional[str] = None) -> 'SummaryCodec':
+        """
+        Build a codec whose dictionary holds the JSON fragments (keys and
+        strings) that recur across the sample summaries
+
+        Fragments are ranked by the bytes they would save; zlib prefers
+        recent matches, so the most valuable ones go at the end.
+        """
+        table = build_string_table() if table is None else table
+        stub = cls(table)
+        documents = 0
+        seen_in = Counter()
+        for sample in samples:
+            documents += 1
+            fragments = set()
+            _fragments(stub._pack(_without_volatile(sample)), fragments)
+            seen_in.update(fragments)
+
+        ranked = sorted((count * len(fragment), fragment) for fragment, count in seen_in.items()
+                        if count > 1 or documents == 1)
+        chosen, size = [], 0
+        for _, fragment in reversed(ranked):
+            size += len(fragment)
+            if size > MAX_DICTIONARY_BYTES:
+                break
+            chosen.append(fragment)
+        return cls(table, b"".join(reversed(chosen)), version=version)
+
+    def encode(self, payload: Dict) -> bytes:
+        """MAGIC + version + deflated JSON with table strings swapped for references"""
+        text = json.dumps(self._pack(payload), separators=(',', ':'), ensure_ascii=False)
+        compressor = zlib.compressobj(self.level, zdict=self.dictionary) if self.dictionary \
+            else zlib.compressobj(self.level)
+        header = MAGIC + self.version.ljust(VERSION_LENGTH).encode('ascii')
+        return header + compressor.compress(text.encode('utf-8')) + compressor.flush()
+
+    def decode_body(self, body: bytes) -> Dict:
+        """Inverse of encode() for the bytes after the header"""
+        decompressor = zlib.decompressobj(zdict=self.dictionary) if self.dictionary else zlib.decompressobj()
+        data = decompressor.decompress(body) + decompressor.flush()
+        return self._unpack(json.loads(data.decode('utf-8')))
+
+    def _pack(self, value):
+        if isinstance(value, str):
+            index = self._ids.get(value)
+            if index is not None:
+                return f"{REF}{index}"
+            return REF + value if value.startswith(REF) else value
+        if isinstance(value, dict):
+            return {key: self._pack(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._pack(item) for item in value]
+        return value
+
+    def _unpack(self, value):
+        if isinstance(value, str):
+            if value.startswith(REF):
+                rest = value[1:]
+                return rest if rest.startswith(REF) else self.table[int(rest)]
+            return value
+        if isinstance(value, dict):
+            return {key: self._unpack(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._unpack(item) for item in value]
+        return value
+
+    def to_json(self) -> str:
+        """Definition a store can keep so this version stays decodable"""
+        return json.dumps({'version': self.version, 'table': self.table,
+                           'dictionary': base64.b64encode(self.dictionary).decode('ascii'), 'level': self.level})
+
+    @classmethod
+    def from_json(cls, definition: str) -> 'SummaryCodec':
+        data = json.loads(definition)
+        # Definitions saved before versions were named carry none; their hash is rebuilt
+        return cls(data['table'], base64.b64decode(data['dictionary']), data['level'], data.get('version'))
+
+
+def _without_volatile(value):
+    if isinstance(value, dict):
+        return {key: _without_volatile(item) for key, item in value.items() if key not in VOLATILE_FIELDS}
+    if isinstance(value, list):
+        return [_without_volatile(item) for item in value]
+    return value
+
+
+def _fragments(value, out: set):
+    """Serialized keys and strings of a packed summary, as they appear in its JSON"""
+    if isinstance(value, str):
+        out.add(json.dumps(value, ensure_ascii=False).encode('utf-8'))
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            out.add(json.dumps(key).encode('utf-8') + b":")
+            _fragments(item, out)
+    elif isinstance(value, list):
+        for item in value:
+            _fragments(item, out)
+
+
+def register(codec: SummaryCodec) -> SummaryCodec:
+    """Make a codec available to decode() by its version"""
+    _codecs[codec.version] = codec
+    return codec
+
+
+def blob_version(data: bytes) -> Optional[str]:
+    """Codec version an encoded blob was written with (None if it is not one)"""
+    if not data.startswith(MAGIC):
+        return None
+    return data[len(MAGIC):len(MAGIC) + VERSION_LENGTH].decode('ascii').rstrip()
+
+
+def decode(data: bytes, codecs: Optional[Dict[str, SummaryCodec]] = None) -> Dict:
+    """
+    Decode a blob from any registered codec (or one in codecs)
+
+    Raises:
+        ValueError: not an encoded summary
+        KeyError: the codec version it needs is unknown
+    """
+    version = blob_version(data)
+    if version is None:
+        raise ValueError("Not an encoded summary")
+    codec = (codecs or {}).get(version) or _codecs.get(version)
+    if codec is None:
+        if version == default_codec().version:
+            codec = default_codec()
+        else:
+            raise KeyError(f"Unknown summary codec version {version}")
+    return codec.decode_body(data[len(MAGIC) + VERSION_LENGTH:])
+
+
+def default_codec() -> SummaryCodec:
+    """Checked-in codec DEFAULT_VERSION (read once from CODEC_DIR)"""
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                with open(codec_path(DEFAULT_VERSION), encoding='utf-8') as f:
+                    _default = register(SummaryCodec.from_json(f.read()))
+    return _default
+
+
+def codec_path(version: str) -> str:
+    """Checked-in definition file of a named codec version"""
+    return os.path.join(CODEC_DIR, f"{version}.json")
+
+
+def build_default(version: str, documents: int = 40) -> SummaryCodec:
+    """
+    Train a codec on generated discharge documents (fixed seed) and write
+    it to CODEC_DIR; point DEFAULT_VERSION at it to make it the default.
+    Worth doing when the agents' canned text has drifted from the table.
+    """
+    from document_generator import DischargeDocumentGenerator
+    from pipeline import BoomerHealthPipeline
+
+    documents = DischargeDocumentGenerator(seed=2376).generate_corpus(documents, target_bytes=2048)
+    samples = BoomerHealthPipeline(verbose=False).process_batch(documents, max_workers=1)
+    codec = SummaryCodec.train(samples, version=version)
+    os.makedirs(CODEC_DIR, exist_ok=True)
+    with open(codec_path(version), 'w', encoding='utf-8') as f:
+        f.write(codec.to_json())
+    return codec
+
+
+def measure(summaries: Iterable[Dict], codec: Optional[SummaryCodec] = None) -> Dict:
+    """
+    Stored size of summaries as compact JSON, plain zlib and this codec
+
+    Returns:
+        {'summaries', 'json_bytes', 'zlib_bytes', 'codec_bytes', 'ratio' (json / codec), 'zlib_ratio'}
+    """
+    codec = codec or default_codec()
+    stats = {'summaries': 0, 'json_bytes': 0, 'zlib_bytes': 0, 'codec_bytes': 0}
+    for summary in summaries:
+        raw = json.dumps(summary, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        encoded = codec.encode(summary)
+        if decode(encoded) != summary:
+            raise ValueError(f"Summary {stats['summaries']} did not round-trip")
+        stats['summaries'] += 1
+        stats['json_bytes'] += len(raw)
+        stats['zlib_bytes'] += len(zlib.compress(raw, 9))
+        stats['codec_bytes'] += len(encoded)
+    stats['ratio'] = round(stats['json_bytes'] / max(stats['codec_bytes'], 1), 2)
+    stats['zlib_ratio'] = round(stats['json_bytes'] / max(stats['zlib_bytes'], 1), 2)
+    return stats
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Report summary compression over a note corpus")
+    parser.add_argument('source', nargs='?', help="CSV/TSV/Parquet export (default: generated documents)")
+    parser.add_argument('--text-column', default='text')
+    parser.add_argument('--limit', type=int, default=500)
+    parser.add_argument('--build', metavar='VERSION',
+                        help="Train a codec and write it to data/summary_codec/VERSION.json")
+    args = parser.parse_args(argv)
+
+    if args.build:
+        if os.path.exists(codec_path(args.build)):
+            parser.error(f"{codec_path(args.build)} exists - a codec version is never overwritten")
+        codec = build_default(args.build)
+        print(f"🗜️  Wrote {codec_path(args.build)} ({len(codec.table):,} table strings, "
+              f"{len(codec.dictionary):,} byte dictionary)")
+        return 0
+
+    from itertools import islice
+    from pipeline import BoomerHealthPipeline
+
+    if args.source:
+        from corpus_loader import ClinicalNoteLoader
+        loader = ClinicalNoteLoader(args.source, args.text_column, None)
+        documents = [text for _, text in islice(loader.iter_notes(), args.limit)]
+    else:
+        from document_generator import DischargeDocumentGenerator
+        documents = DischargeDocumentGenerator(seed=7).generate_corpus(args.limit, target_bytes=4096)
+
+    summaries = BoomerHealthPipeline(verbose=False).process_batch(documents)
+    codec = default_codec()
+    stats = measure(summaries, codec)
+    print(f"🗜️  {stats['summaries']:,} summaries (codec {codec.version}, "
+          f"{len(codec.table):,} table strings, {len(codec.dictionary):,} byte dictionary)")
+    print(f"   JSON:  {stats['json_bytes']:>12,} bytes")
+    print(f"   zlib:  {stats['zlib_bytes']:>12,} bytes ({stats['zlib_ratio']}x)")
+    print(f"   codec: {stats['codec_bytes']:>12,} bytes ({stats['ratio']}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
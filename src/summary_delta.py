@@ -0,0 +1,256 @@
+"""
+Summary Delta - What changed between two summaries for the same patient
+Encodes a repeat visit as a small delta against the previous summary and rebuilds it on demand
+
+Team: Oyinade Balogun, Hilary C Bruton, Glen Sam, Kaleb
+Course: ITAI 2376 - Boomer Health Summary Project
+"""
+
+import copy
+import json
+from typing import Dict, List, Optional
+
+# Field that identifies an item in a list of dicts, first match wins
+# (diagnoses, test results, medications, glossary entries, interaction pairs)
+ITEM_KEYS = ('diagnosis', 'test', 'medication', 'abbreviation', 'medications')
+
+# Delta operations
+#   dict:  {'set': {field: value}, 'del': [field], 'sub': {field: delta}}
+#   list:  {'add': [item], 'del': [key], 'sub': {key: delta}, 'order': [key]}
+# An empty delta ({}) means "unchanged". A list whose items have no usable
+# key is replaced whole through the parent's 'set'.
+
+
+def item_key(item) -> Optional[str]:
+    """Identity of a list item: the item itself for strings, its ITEM_KEYS field for dicts"""
+    if isinstance(item, str):
+        return item
+    if isinstance(item, dict):
+        for field in ITEM_KEYS:
+            if field in item:
+                value = item[field]
+                return " + ".join(value) if isinstance(value, list) else str(value)
+    return None
+
+
+def _keys(items: List) -> Optional[List[str]]:
+    """Item keys, or None if any item has no key or two items share one"""
+    keys = [item_key(item) for item in items]
+    if None in keys or len(set(keys)) != len(keys):
+        return None
+    return keys
+
+
+def diff_summaries(previous: Dict, current: Dict) -> Dict:
+    """
+    Delta that turns previous into current (apply_delta(previous, delta) == current)
+
+    Args:
+        previous: Earlier summary for the patient (any JSON-like dict)
+        current: New summary
+
+    Returns:
+        Nested delta; {} when nothing changed
+    """
+    delta = {}
+    changed, subs = {}, {}
+    for field, value in current.items():
+        if field not in previous:
+            changed[field] = value
+            continue
+        old = previous[field]
+        if old == value:
+            continue
+        if isinstance(old, dict) and isinstance(value, dict):
+            subs[field] = diff_summaries(old, value)
+        elif isinstance(old, list) and isinstance(value, list):
+            sub = _diff_list(old, value)
+            if sub is None:
+                changed[field] = value
+            else:
+                subs[field] = sub
+        else:
+            changed[field] = value
+
+    removed = [field for field in previous if field not in current]
+    if changed:
+        delta['set'] = changed
+    if removed:
+        delta['del'] = removed
+    if subs:
+        delta['sub'] = subs
+    # Field order matters to the renderer; record it only when it moved
+    kept = [field for field in previous if field in current]
+    if kept + [field for field in current if field not in previous] != list(current):
+        delta['order'] = list(current)
+    return delta
+
+
+def _diff_list(previous: List, current: List) -> Optional[Dict]:
+    """Keyed delta between two lists, or None if they cannot be keyed"""
+    old_keys, new_keys = _keys(previous), _keys(current)
+    if old_keys is None or new_keys is None:
+        return None
+
+    old_items = dict(zip(old_keys, previous))
+    new_set = set(new_keys)
+    delta = {}
+    added = [item for key, item in zip(new_keys, current) if key not in old_items]
+    removed = [key for key in old_keys if key not in new_set]
+    subs = {}
+    for key, item in zip(new_keys, current):
+        old = old_items.get(key)
+        if old is None or old == item:
+            continue
+        if isinstance(old, dict) and isinstance(item, dict):
+            subs[key] = diff_summaries(old, item)
+        else:
+            return None
+
+    if added:
+        delta['add'] = added
+    if removed:
+        delta['del'] = removed
+    if subs:
+        delta['sub'] = subs
+    # Default order: surviving items where they were, then the new ones
+    kept = [key for key in old_keys if key in new_set]
+    if kept + [item_key(item) for item in added] != new_keys:
+        delta['order'] = new_keys
+    return delta
+
+
+def apply_delta(previous: Dict, delta: Dict) -> Dict:
+    """
+    Rebuild a summary from the one before it and its delta
+
+    previous is not modified; the result shares no mutable state with it.
+    """
+    return _apply_dict(copy.deepcopy(previous), delta)
+
+
+def _apply_dict(target: Dict, delta: Dict) -> Dict:
+    result = {field: value for field, value in target.items() if field not in delta.get('del', ())}
+    for field, sub in delta.get('sub', {}).items():
+        old = result[field]
+        result[field] = _apply_list(old, sub) if isinstance(old, list) else _apply_dict(old, sub)
+    result.update(delta.get('set', {}))
+    if 'order' in delta:
+        result = {field: result[field] for field in delta['order']}
+    return result
+
+
+def _apply_list(target: List, delta: Dict) -> List:
+    removed = set(delta.get('del', ()))
+    items = {}
+    for item in target:
+        key = item_key(item)
+        if key not in removed:
+            items[key] = item
+    for key, sub in delta.get('sub', {}).items():
+        items[key] = _apply_dict(items[key], sub)
+    for item in delta.get('add', ()):
+        items[item_key(item)] = item
+    if 'order' in delta:
+        return [items[key] for key in delta['order']]
+    return list(items.values())
+
+
+def describe_changes(previous: Dict, delta: Dict) -> List[str]:
+    """
+    Patient-facing list of what changed since the last summary
+
+    Covers diagnoses, medications (new, stopped, dose changes), test
+    values and follow-ups; wording-only changes to explanations are left out.
+    """
+    changes = []
+    sections = delta.get('sub', {})
+
+    diagnoses = sections.get('section_1_diagnoses', {}).get('sub', {})
+    for item in diagnoses.get('diagnoses', {}).get('add', []):
+        changes.append(f"New diagnosis: {item['diagnosis']}")
+    for key in diagnoses.get('diagnoses', {}).get('del', []):
+        changes.append(f"No longer listed: {key}")
+
+    old_tests = previous.get('section_1_diagnoses', {}).get('test_results', [])
+    tests = diagnoses.get('test_results')
+    if tests is not None:
+        old_by_test = {t['test']: t for t in old_tests}
+        for item in tests.get('add', []):
+            changes.append(f"New test result: {item['test']} {item['your_value']}")
+        for key, sub in tests.get('sub', {}).items():
+            if 'your_value' in sub.get('set', {}):
+                changes.append(f"{key}: {old_by_test[key]['your_value']} → {sub['set']['your_value']}")
+    elif 'test_results' in sections.get('section_1_diagnoses', {}).get('set', {}):
+        # Replaced whole (a test listed twice): compare the readings test by test
+        old_values = _grouped(old_tests, 'test', 'your_value')
+        new_values = _grouped(sections['section_1_diagnoses']['set']['test_results'], 'test', 'your_value')
+        for test, values in new_values.items():
+            if test not in old_values:
+                changes.append(f"New test result: {test} {', '.join(values)}")
+            elif values != old_values[test]:
+                changes.append(f"{test}: {', '.join(old_values[test])} → {', '.join(values)}")
+
+    old_meds = previous.get('section_2_medications', {}).get('medications', [])
+    meds = sections.get('section_2_medications', {}).get('sub', {}).get('medications')
+    if meds is not None:
+        old_by_name = {m['medication']: m for m in old_meds}
+        for item in meds.get('add', []):
+            changes.append(f"New medication: {item['medication']} {item['dosage']}")
+        for key in meds.get('del', []):
+            changes.append(f"Medication no longer listed: {key}")
+        for key, sub in meds.get('sub', {}).items():
+            if 'dosage' in sub.get('set', {}):
+                changes.append(f"{key}: dose changed from {old_by_name[key]['dosage']} to {sub['set']['dosage']}")
+    elif 'medications' in sections.get('section_2_medications', {}).get('set', {}):
+        old_doses = _grouped(old_meds, 'medication', 'dosage')
+        new_doses = _grouped(sections['section_2_medications']['set']['medications'], 'medication', 'dosage')
+        for name, doses in new_doses.items():
+            if name not in old_doses:
+                changes.append(f"New medication: {name} {', '.join(doses)}")
+            elif doses != old_doses[name]:
+                changes.append(f"{name}: dose changed from {', '.join(old_doses[name])} to {', '.join(doses)}")
+        for name in old_doses:
+            if name not in new_doses:
+                changes.append(f"Medication no longer listed: {name}")
+
+    followups = sections.get('section_3_action_plan', {}).get('sub', {}).get('followups')
+    if followups is not None:
+        for item in followups.get('add', []):
+            changes.append(f"New follow-up: {item}")
+    elif 'followups' in sections.get('section_3_action_plan', {}).get('set', {}):
+        for item in sections['section_3_action_plan']['set']['followups']:
+            changes.append(f"Follow-up: {item}")
+    return changes
+
+
+def _grouped(items: List[Dict], key_field: str, value_field: str) -> Dict[str, List[str]]:
+    """Values per key, in list order (for lists whose keys repeat)"""
+    grouped: Dict[str, List[str]] = {}
+    for item in items:
+        grouped.setdefault(item[key_field], []).append(item[value_field])
+    return grouped
+
+
+def encoded_size(payload: Dict) -> int:
+    """Bytes of the compact JSON a summary or delta is stored/sent as"""
+    return len(json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    from pipeline import BoomerHealthPipeline
+
+    pipeline = BoomerHealthPipeline(verbose=False)
+    first = pipeline.process_document(
+        "Diagnosis: Hypertension. BP: 152/94. Lisinopril 10mg daily. Follow up in 4 weeks.")
+    second = pipeline.process_document(
+        "Diagnosis: Hypertension. BP: 138/86. Lisinopril 20mg daily. Follow up in 3 months.")
+
+    delta = diff_summaries(first, second)
+    print("Testing Summary Delta\n")
+    print(f"Full summary: {encoded_size(second):,} bytes, delta: {encoded_size(delta):,} bytes")
+    print(f"Rebuilt summary matches: {apply_delta(first, delta) == second}")
+    print("\nWhat changed:")
+    for line in describe_changes(first, delta):
+        print(f"   • {line}")
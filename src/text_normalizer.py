@@ -0,0 +1,167 @@
+"""
+Text Normalizer - One cleanup pass over OCR and typed text before extraction
+Produces a cleaned view for the extractors plus an offset map back to the original
+
+Team: Oyinade Balogun, Hilary C Bruton, Glen Sam, Kaleb
+Course: ITAI 2376 - Boomer Health Summary Project
+"""
+
+import re
+from array import array
+from bisect import bisect_right
+from typing import List
+
+# Characters OCR and word processors substitute for plain ones, one for one
+# (applied with str.translate - offsets do not move)
+SAME_LENGTH = str.maketrans({
+    '‘': "'", '’': "'", '‚': "'", '‛': "'", '“': '"', '”': '"', '„': '"', '‟': '"',
+    '\u00a0': ' ',  # non-breaking space
+})
+
+# ... and the ones whose replacement has a different length
+REPLACEMENTS = {
+    'ﬀ': 'ff', 'ﬁ': 'fi', 'ﬂ': 'fl', 'ﬃ': 'ffi', 'ﬄ': 'ffl', 'ﬅ': 'st', 'ﬆ': 'st',
+    '\u00ad': '',  # soft hyphen
+}
+
+# One alternation over everything the pass rewrites; the text between matches is copied as is.
+# Branches are told apart by their first character - named groups would stop the
+# engine from skipping ahead to candidate characters, which is most of its speed.
+ASCII_CLEANUP = (
+    r'-(?<=[^\W\d_]-)[ \t]*\r?\n[ \t]*(?=[^\W\d_])'  # "Metfor-\nmin" -> "Metformin"
+    r'|\|'                                              # "high | blood" -> "high blood"
+    r'|\r\n?'                                           # Windows / old Mac line ends
+)
+ASCII_CLEANUP_PATTERN = re.compile(ASCII_CLEANUP)
+CLEANUP_PATTERN = re.compile(ASCII_CLEANUP + r'|[' + ''.join(REPLACEMENTS) + r']')
+
+
+class NormalizedText:
+    """
+    Cleaned view of a document and the map from its offsets to the original.
+
+    text keeps the original case (abbreviations are case-sensitive) and
+    lower is the same text lowercased, position for position. Only
+    rewrites that change length add a breakpoint to the map, so a clean
+    document carries an empty one.
+    """
+
+    __slots__ = ('original', 'text', 'lower', '_clean_at', '_original_at', '_replaced')
+
+    def __init__(self, original: str, text: str, clean_at: array, original_at: array, replaced: array):
+        self.original = original
+        self.text = text
+        lower = text.lower()
+        if len(lower) != len(text):
+            # A few characters lowercase to two ("İ" -> "i̇"); keep one so offsets still line up
+            lower = "".join(char.lower()[0] for char in text)
+        self.lower = lower
+        self._clean_at = clean_at        # breakpoint positions in text, ascending
+        self._original_at = original_at  # matching positions in original
+        self._replaced = replaced        # 1 where the run starting there is a rewrite
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def to_original(self, position: int) -> int:
+        """Offset in the original text of the cleaned character at position"""
+        index = bisect_right(self._clean_at, position) - 1
+        if index < 0:
+            return position
+        if self._replaced[index]:
+            return self._original_at[index]
+        return self._original_at[index] + position - self._clean_at[index]
+
+    def span(self, start: int, end: int) -> List[int]:
+        """[start, end) in the cleaned text -> [start, end) in the original"""
+        if end <= start:
+            position = self.to_original(start)
+            return [position, position]
+        return [self.to_original(start), self.to_original(end - 1) + 1]
+
+
+def normalize_text(text: str) -> NormalizedText:
+    """
+    Clean a document in one pass (plus a translate() for one-for-one characters)
+
+    Joins words broken across lines by a hyphen, expands ligatures, turns
+    smart quotes into plain ones, drops stray table pipes and unifies line
+    endings.
+
+    Args:
+        text: Original document or OCR text
+
+    Returns:
+        NormalizedText (extract from .text / .lower, report spans with .span())
+    """
+    original = text or ""
+    text = original if original.isascii() else original.translate(SAME_LENGTH)
+    clean_at, original_at, replaced = array('q'), array('q'), array('b')
+    pieces = []
+    copied = 0   # original position copied up to
+    length = 0   # cleaned length so far
+
+    pattern = ASCII_CLEANUP_PATTERN if original.isascii() else CLEANUP_PATTERN
+    for match in pattern.finditer(text):
+        start, end = match.span()
+        first = text[start]
+        if first == '-':
+            replacement = ''
+        elif first == '|':
+            # Take the spaces around the pipe too; a table border at either end of a line leaves nothing
+            while start > copied and text[start - 1] in ' \t':
+                start -= 1
+            while end < len(text) and text[end] in ' \t':
+                end += 1
+            at_edge = (start == 0 or text[start - 1] == '\n') or (end == len(text) or text[end] in '\r\n')
+            replacement = '' if at_edge else ' '
+        elif first == '\r':
+            replacement = '\n'
+        else:
+            replacement = REPLACEMENTS[first]
+
+        if replacement == text[start:end]:
+            continue
+        pieces.append(text[copied:start])
+        length += start - copied
+        pieces.append(replacement)
+        copied = end
+
+        if len(replacement) != end - start:
+            if replacement:
+                _breakpoint(clean_at, original_at, replaced, length, start, 1)
+            length += len(replacement)
+            _breakpoint(clean_at, original_at, replaced, length, end, 0)
+        else:
+            length += len(replacement)
+
+    if not pieces:
+        return NormalizedText(original, text, clean_at, original_at, replaced)
+    pieces.append(text[copied:])
+    return NormalizedText(original, "".join(pieces), clean_at, original_at, replaced)
+
+
+def _breakpoint(clean_at: array, original_at: array, replaced: array, clean: int, original: int, flag: int):
+    """Append a map entry, overwriting the previous one if it starts at the same cleaned position"""
+    if clean_at and clean_at[-1] == clean:
+        original_at[-1] = original
+        replaced[-1] = flag
+        return
+    clean_at.append(clean)
+    original_at.append(original)
+    replaced.append(flag)
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    sample = "MEDICATIONS | \r\n- Metfor-\nmin 500mg | twice daily\n- “Lasix” 40mg (ﬁrst thing)"
+    normalized = normalize_text(sample)
+
+    print("Testing Text Normalizer\n")
+    print(normalized.text)
+    print()
+    for word in ('metformin', 'lasix', 'first'):
+        start = normalized.lower.find(word)
+        original_start, original_end = normalized.span(start, start + len(word))
+        print(f"{word!r}: cleaned [{start}, {start + len(word)}) -> "
+              f"original [{original_start}, {original_end}) {sample[original_start:original_end]!r}")
@@ -0,0 +1,275 @@
+"""
+Emergency Triage - Pre-scan raw text for emergency language before the agents run
+Flags "call 911" situations in one pass over a compiled phrase set
+
+Team: Oyinade Balogun, Hilary C Bruton, Glen Sam, Kaleb
+Course: ITAI 2376 - Boomer Health Summary Project
+"""
+
+import re
+from typing import Dict, Iterable, Optional, Tuple
+
+from records import TriageResult
+
+# Emergency phrase -> category (matched case-insensitively, any whitespace between words)
+EMERGENCY_PHRASES = {
+    'severe chest pain': 'chest pain', 'crushing chest pain': 'chest pain',
+    'chest pain radiating': 'chest pain', 'chest pain spreading': 'chest pain',
+    'difficulty breathing': 'breathing', 'trouble breathing': 'breathing',
+    "can't breathe": 'breathing', 'cannot breathe': 'breathing', 'unable to breathe': 'breathing',
+    'struggling to breathe': 'breathing', 'gasping for air': 'breathing',
+    'severe shortness of breath': 'breathing', 'extreme shortness of breath': 'breathing',
+    'lips turning blue': 'breathing', 'blue lips': 'breathing', 'choking': 'breathing',
+    # Longer than the 'no' / 'not' cues, so the trie matches these whole instead of as a negation
+    'not breathing': 'breathing', "isn't breathing": 'breathing', "wasn't breathing": 'breathing',
+    "aren't breathing": 'breathing', 'stopped breathing': 'breathing', 'quit breathing': 'breathing',
+    'no longer breathing': 'breathing',
+    'confusion': 'stroke or confusion', 'confused': 'stroke or confusion',
+    'altered mental status': 'stroke or confusion', 'slurred speech': 'stroke or confusion',
+    'face drooping': 'stroke or confusion', 'facial droop': 'stroke or confusion',
+    'sudden weakness': 'stroke or confusion', 'sudden numbness': 'stroke or confusion',
+    'worst headache of my life': 'stroke or confusion',
+    'unresponsive': 'fainting or seizure', 'passed out': 'fainting or seizure',
+    'fainted': 'fainting or seizure', 'fainting': 'fainting or seizure', 'seizure': 'fainting or seizure',
+    'severe bleeding': 'bleeding', "bleeding that won't stop": 'bleeding',
+    'coughing up blood': 'bleeding', 'vomiting blood': 'bleeding', 'black tarry stool': 'bleeding',
+    'throat swelling': 'allergic reaction', 'throat closing': 'allergic reaction',
+    'severe allergic reaction': 'allergic reaction', 'anaphylaxis': 'allergic reaction',
+    'overdose': 'overdose', 'took too many pills': 'overdose',
+    'suicidal': 'self-harm', 'kill myself': 'self-harm', 'end my life': 'self-harm', 'want to die': 'self-harm',
+}
+
+# Context cue -> words it may reach past to the emergency phrase it covers: conditional
+# instructions ("call 911 if ..."), history ("presented with ...") and negation ("denies ...").
+# 'no' / 'not' only cover the phrase right after them ("no appetite and severe chest pain" counts)
+CONTEXT_CUES = {
+    'if': 5, 'call 911 for': 2, 'seek': 5, 'watch for': 3, 'warning signs': 3, 'signs of': 2,
+    'go to': 5, 'return to': 5, 'report': 3,
+    'history of': 2, 'hx of': 2, 'presented with': 2, 'admitted with': 2, 'admitted for': 2, 'on admission': 3,
+    'no': 0, 'not': 0, 'denies': 2, 'denied': 2, 'without': 2, 'negative for': 2, 'free of': 2
+}
+
+# Between a cue and its first phrase, a comma or "and" starts something else
+CUE_BREAK = re.compile(r',|\band\b')
+
+# After a covered phrase the cue carries on only through a list of phrases
+# ("denies chest pain, fainting or confusion"), each item ending the list or its clause
+LIST_GAP = re.compile(r'\s*(?:,\s*)?(?:(?:or|and|nor)\s+)?')
+LIST_END = re.compile(r'[ \t]*(?:[,.;!?:)\n]|(?:or|and|nor)\b|\Z)')
+
+# Section headers whose lists are instructions or history rather than what is happening now
+CONTEXT_HEADER = re.compile(
+    r'call|911|emergency|warning|signs|seek|\bif\b|\bwhen\b|admission|history|course|complaint|diagnos|prior|past',
+    re.IGNORECASE
+)
+
+URGENT_MESSAGE = ("🚨 This may be an emergency. If this is happening now, call 911 "
+                  "or go to the nearest emergency room.")
+SELF_HARM_MESSAGE = " If you are thinking about harming yourself, call or text 988 (Suicide & Crisis Lifeline)."
+
+# Words that end a context cue's scope without starting a new one
+PIVOTS = ['but', 'however']
+
+# How trie characters are written in the regex
+TRIE_TOKENS = {' ': r'\s+', "'": "['’]?"}
+
+
+def _trie_regex(phrases: Iterable[str]) -> str:
+    """
+    One regex for a phrase set, factored into a character trie
+
+    "chest pain|choking|confused" becomes "c(?:hest\\s+pain|hoking|onfused)", so
+    the engine follows one branch per character instead of retrying every
+    phrase at every position. Spaces match any whitespace and apostrophes
+    are optional ("can't", "can’t", "cant").
+    """
+    trie: Dict = {}
+    for phrase in phrases:
+        node = trie
+        for char in " ".join(phrase.lower().split()):
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def emit(node: Dict) -> str:
+        branches = [TRIE_TOKENS.get(char, re.escape(char)) + emit(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            body = f'(?:{body})?' if len(branches) == 1 else body + '?'
+        return body
+
+    return emit(trie)
+
+
+def _normalize(phrase: str) -> str:
+    """Lookup key for a matched phrase: lowercase, single spaces, no apostrophes"""
+    return " ".join(phrase.lower().replace("’", "").replace("'", "").split())
+
+
+def _compile(phrases: Iterable[str]) -> Tuple[re.Pattern, re.Pattern]:
+    """(emergency phrase search, context scan) patterns - both run on lowercased text"""
+    phrases = list(phrases)
+    phrase_pattern = re.compile(r'\b(?:' + _trie_regex(phrases) + r')\b')
+    # One alternation: each match is a scope boundary, a context cue or an emergency phrase
+    scan_pattern = re.compile(
+        r'^[ \t]*(?P<header>[a-z][^\n:]{0,60}):[ \t]*$'      # "seek emergency care (call 911) if:"
+        r'|(?P<gap>\n[ \t]*\n)'                                # blank line ends a section
+        r'|(?P<item>\n[ \t]*(?:[-•*]|\d+[.)])[ \t])'           # list item starts a new clause
+        r'|(?P<stop>[.!?;])'                                   # clause boundary
+        r'|\b(?P<word>' + _trie_regex(phrases + list(CONTEXT_CUES) + PIVOTS) + r')\b',
+        re.MULTILINE
+    )
+    return phrase_pattern, scan_pattern
+
+
+DEFAULT_PATTERNS = _compile(EMERGENCY_PHRASES)
+
+
+class TriageScanner:
+    """
+    Emergency pre-scan that runs on the raw text before Agent 1.
+
+    The lowercased text is searched once for any emergency phrase; most
+    documents have none and are cleared right there. Otherwise the context
+    pass starts at the section holding the first hit, and a phrase only
+    counts when it is not inside a conditional instruction, a history or
+    diagnosis section, or a negation - discharge papers list "severe
+    chest pain" under "call 911 if" on almost every page.
+
+    A cue only covers a phrase a few words after it in the same clause,
+    and the list of phrases that directly follows; anything else in the
+    sentence still counts, so a stray "no" or "if" cannot hide an emergency.
+    """
+
+    def __init__(self, phrases: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            phrases: Phrase -> category map (defaults to EMERGENCY_PHRASES)
+        """
+        self.phrases = phrases or EMERGENCY_PHRASES
+        self.phrase_pattern, self.scan_pattern = DEFAULT_PATTERNS if phrases is None else _compile(phrases)
+
+        # Normalized match -> (phrase, category); cues and pivots map to None
+        self._words = {_normalize(word): None for word in list(CONTEXT_CUES) + PIVOTS}
+        self._words.update({_normalize(phrase): (phrase, category) for phrase, category in self.phrases.items()})
+        self._reach = {_normalize(cue): reach for cue, reach in CONTEXT_CUES.items()}
+
+    def scan(self, text: str) -> TriageResult:
+        """
+        Check raw document or patient text for emergency language
+
+        Returns:
+            TriageResult - urgent=True with the phrases found and the 911 message
+        """
+        text = (text or "").lower()
+        first = self.phrase_pattern.search(text)
+        if first is None:
+            return self._result({})
+
+        findings: Dict[str, str] = {}  # phrase -> category
+        section_out_of_scope = False
+        scope = None  # open cue: [words it may still reach past, end of cue or last covered phrase, in a list]
+
+        for match in self.scan_pattern.finditer(text, self._section_start(text, first.start())):
+            kind = match.lastgroup
+            if kind == 'word':
+                word = _normalize(match.group('word'))
+                found = self._words.get(word)
+                if found is None:
+                    # A cue opens a scope; a pivot ("but") just closes it
+                    scope = [self._reach[word], match.end(), False] if word in self._reach else None
+                    continue
+                covered = scope is not None and self._in_scope(text, scope, match.start(), match.end())
+                # Either way the scope moves past this phrase, so no gap is measured twice
+                scope = [0, match.end(), True] if covered else None
+                if not (section_out_of_scope or covered):
+                    findings.setdefault(*found)
+            elif kind == 'header':
+                header = match.group('header')
+                section_out_of_scope = bool(CONTEXT_HEADER.search(header))
+                scope = None
+                if not section_out_of_scope:
+                    for phrase in self.phrase_pattern.finditer(header):
+                        findings.setdefault(*self._words[_normalize(phrase.group())])
+            elif kind == 'gap':
+                section_out_of_scope = False
+                scope = None
+            else:  # item / stop
+                scope = None
+
+        return self._result(findings)
+
+    def scan_all(self, texts: Iterable[str]) -> TriageResult:
+        """One result across several texts (e.g. the pages of an upload)"""
+        return self.merge(self.scan(text) for text in texts)
+
+    def merge(self, results: Iterable[TriageResult]) -> TriageResult:
+        """Combine scans of separate texts (pages already scanned as they arrived)"""
+        findings: Dict[str, str] = {}
+        for result in results:
+            findings.update(zip(result.findings, result.categories))
+        return self._result(findings)
+
+    @staticmethod
+    def _in_scope(text: str, scope: list, start: int, end: int) -> bool:
+        """Whether the open cue covers the phrase at text[start:end]"""
+        reach, edge, in_list = scope
+        if in_list:
+            return LIST_GAP.fullmatch(text, edge, start) is not None and LIST_END.match(text, end) is not None
+        gap = text[edge:start]
+        return CUE_BREAK.search(gap) is None and len(gap.split()) <= reach
+
+    @staticmethod
+    def _section_start(text: str, position: int) -> int:
+        """Newline ending the last blank line before position (0 if none) - scan state resets there"""
+        end = text.rfind('\n', 0, position)
+        while end > 0:
+            start = text.rfind('\n', 0, end)
+            if not text[start + 1:end].strip():
+                return end
+            end = start
+        return 0
+
+    def _result(self, findings: Dict[str, str]) -> TriageResult:
+        if not findings:
+            return TriageResult(urgent=False, findings=[], categories=[], message="")
+        message = URGENT_MESSAGE
+        if 'self-harm' in findings.values():
+            message += SELF_HARM_MESSAGE
+        return TriageResult(urgent=True, findings=list(findings), categories=list(findings.values()),
+                            message=message)
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    import time
+
+    scanner = TriageScanner()
+
+    # (text, expected urgent) - the last group are cues that must not hide a later emergency
+    samples = [
+        ("My dad has severe chest pain and he's confused. What do we do?", True),
+        ("SEEK EMERGENCY CARE (CALL 911) IF:\n- Severe chest pain\n- Confusion", False),
+        ("Patient is now able to lie flat without difficulty breathing.", False),
+        ("Diagnosis: Hypertension\nTake lisinopril 20mg daily", False),
+        ("Call 911 if you have severe chest pain, confusion, or fainting.", False),
+        ("Denies severe chest pain, fainting or confusion.", False),
+        ("He has no appetite and severe chest pain right now", True),
+        ("Call me back, my husband has severe chest pain", True),
+        ("Patient is not eating, confused and has slurred speech", True),
+        ("Denies headache and is confused", True),
+        ("He is not breathing", True),
+        ("Call 911 if he stops breathing or is not breathing", False),
+    ]
+
+    print("Testing Emergency Triage Scanner\n")
+    for text, expected in samples:
+        started = time.perf_counter()
+        result = scanner.scan(text)
+        elapsed = (time.perf_counter() - started) * 1e6
+        flag = "" if result.urgent == expected else "   ❌ expected " + ("urgent" if expected else "clear")
+        print(f"{'🚨 URGENT' if result.urgent else '✅ clear '} ({elapsed:.0f} µs) {text[:50]!r}{flag}")
+        if result.urgent:
+            print(f"   Found: {', '.join(result.findings)}")
@@ -0,0 +1,243 @@
+"""
+Worker Pool - Pre-forked worker processes sharing one copy of the knowledge tables
+The master builds the agents once, freezes them out of the garbage collector, then forks
+
+Team: Oyinade Balogun, Hilary C Bruton, Glen Sam, Kaleb
+Course: ITAI 2376 - Boomer Health Summary Project
+
+Usage:
+    with PreforkPool(max_workers=8) as pool:
+        summaries = pool.process_batch(documents)
+        print(pool.format_memory_report())
+"""
+
+import gc
+import multiprocessing
+import os
+from itertools import islice
+from typing import Dict, Iterable, List, Optional
+
+from pipeline import BoomerHealthPipeline
+
+# Warm-up document: touches every agent so lazily built state exists before the fork
+WARMUP_DOCUMENT = ("Diagnosis: Hypertension, Type 2 Diabetes. BP: 140/90. A1C: 7.2%. Weight: 180 lbs.\n"
+                   "Lisinopril 20mg daily. Metformin 500mg twice daily. Warfarin 5mg. Aspirin 81mg.\n"
+                   "Follow up in 2 weeks. Call if chest pain.")
+
+# smaps_rollup fields reported per process, in kB
+MEMORY_FIELDS = ('Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty', 'Private_Clean', 'Private_Dirty')
+
+
+def _serve(pipeline: Optional[BoomerHealthPipeline], tasks, results):
+    """Worker loop: process (index, text, options) tasks until a None arrives"""
+    if pipeline is None:
+        # Spawned (not forked) workers have nothing to share and build their own
+        pipeline = BoomerHealthPipeline(verbose=False)
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        index, text, options = task
+        try:
+            summary = pipeline.process_document(text, **options)
+        except Exception as exc:
+            results.put((index, None, exc))
+        else:
+            results.put((index, summary, None))
+        # Feedback history lives in the master; keep the worker's from growing
+        pipeline.clear_history()
+
+
+def process_memory(pid: int) -> Dict[str, int]:
+    """MEMORY_FIELDS for one process in bytes (Linux /proc; empty elsewhere)"""
+    usage = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                name, _, value = line.partition(':')
+                if name in MEMORY_FIELDS:
+                    usage[name] = int(value.split()[0]) * 1024
+    except OSError:
+        pass
+    return usage
+
+
+class PreforkPool:
+    """
+    Fixed set of worker processes forked from a warmed-up master.
+
+    The master builds the agents (knowledge tables, compiled patterns,
+    interaction index) and runs one warm-up document, then calls
+    gc.freeze() so the collector never walks - and never writes to - those
+    objects again. Workers forked after that share the master's pages
+    copy-on-write, so adding a worker adds its private working set, not
+    another copy of every table and imported module.
+
+    CPython before 3.12 still writes reference counts when a worker reads
+    an object, which copies the page holding it; the tables a document
+    never touches, and all module code, stay shared.
+    """
+
+    def __init__(self,
+                 max_workers: Optional[int] = None,
+                 pipeline: Optional[BoomerHealthPipeline] = None,
+                 start_method: str = "fork"):
+        """
+        Args:
+            max_workers: Worker processes (default: one per CPU)
+            pipeline: Pipeline whose agents the workers share (a quiet one is built if None)
+            start_method: "fork" (shared tables) or "spawn" (each worker builds its own - for comparison)
+        """
+        if start_method not in multiprocessing.get_all_start_methods():
+            raise RuntimeError(f"Start method '{start_method}' is not available on this platform; "
+                               "use BoomerHealthPipeline.process_batch (threads) instead")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.pipeline = pipeline or BoomerHealthPipeline(verbose=False)
+        self.start_method = start_method
+        self._context = multiprocessing.get_context(start_method)
+        self._workers: List[multiprocessing.Process] = []
+        self._tasks = None
+        self._results = None
+
+    def start(self) -> 'PreforkPool':
+        """Warm up, freeze and fork the workers (called on first use)"""
+        if self._workers:
+            return self
+        shared = None
+        if self.start_method == "fork":
+            self.pipeline.process_document(WARMUP_DOCUMENT)
+            self.pipeline.clear_history()
+            # Everything alive now moves to the permanent generation: collections
+            # in the workers skip it, so they do not dirty the shared pages
+            gc.collect()
+            gc.freeze()
+            shared = self.pipeline
+
+        self._tasks = self._context.SimpleQueue()
+        self._results = self._context.SimpleQueue()
+        for index in range(self.max_workers):
+            worker = self._context.Process(target=_serve, args=(shared, self._tasks, self._results),
+                                           name=f"boomer-worker-{index}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+        return self
+
+    def process_batch(self,
+                      documents: Iterable[str],
+                      input_method: str = "free_text",
+                      deadline: Optional[float] = None) -> List[Dict]:
+        """
+        Process documents across the workers
+
+        Returns:
+            Summaries in input order; each is recorded in the master's
+            processing history, so metadata['summary_id'] works with
+            collect_feedback on this pool's pipeline
+        """
+        self.start()
+        options = {'input_method': input_method}
+        if deadline is not None:
+            options['deadline'] = deadline
+
+        # Keep a bounded number of tasks in flight: both queues are pipes, and a
+        # master that only wrote would block once the workers' results filled theirs
+        pending = enumerate(documents)
+        in_flight = 0
+        for task in islice(pending, 2 * len(self._workers)):
+            self._tasks.put(task + (options,))
+            in_flight += 1
+
+        summaries: Dict[int, Dict] = {}
+        error = None
+        while in_flight:
+            index, summary, exc = self._results.get()
+            in_flight -= 1
+            for task in islice(pending, 1):
+                self._tasks.put(task + (options,))
+                in_flight += 1
+            if exc is not None:
+                error = error or exc
+                continue
+            summary['metadata']['summary_id'] = self.pipeline._record_history({
+                'input_method': summary['metadata']['input_method'],
+                'extraction_quality': summary['metadata']['extraction_quality'],
+                'summary': summary
+            })
+            summaries[index] = summary
+        if error is not None:
+            raise error
+        return [summaries[index] for index in range(len(summaries))]
+
+    def process_document(self, document_text: str, input_method: str = "free_text") -> Dict:
+        """Process one document on a worker"""
+        return self.process_batch([document_text], input_method)[0]
+
+    def memory_usage(self) -> Dict:
+        """
+        Memory of the master and every worker (Linux only)
+
+        Returns:
+            {'master': {field: bytes}, 'workers': [{field: bytes}],
+             'total_pss': bytes, 'total_rss': bytes}
+            PSS splits each shared page across the processes sharing it, so
+            total_pss is the pool's real footprint; total_rss counts shared pages once per process.
+        """
+        master = process_memory(os.getpid())
+        workers = [process_memory(worker.pid) for worker in self._workers]
+        everyone = [master] + workers
+        return {
+            'master': master,
+            'workers': workers,
+            'total_pss': sum(usage.get('Pss', 0) for usage in everyone),
+            'total_rss': sum(usage.get('Rss', 0) for usage in everyone)
+        }
+
+    def format_memory_report(self) -> str:
+        """Per-process memory table"""
+        usage = self.memory_usage()
+        mb = 1024 * 1024
+        output = [
+            f"🧠 WORKER POOL MEMORY ({len(self._workers)} workers, {self.start_method})",
+            "",
+            f"   {'process':<10} {'RSS MB':>8} {'PSS MB':>8} {'shared MB':>10} {'private MB':>11}"
+        ]
+        rows = [('master', usage['master'])] + [(f"worker {i}", u) for i, u in enumerate(usage['workers'])]
+        for name, u in rows:
+            shared = u.get('Shared_Clean', 0) + u.get('Shared_Dirty', 0)
+            private = u.get('Private_Clean', 0) + u.get('Private_Dirty', 0)
+            output.append(f"   {name:<10} {u.get('Rss', 0) / mb:>8.1f} {u.get('Pss', 0) / mb:>8.1f} "
+                          f"{shared / mb:>10.1f} {private / mb:>11.1f}")
+        output.append("")
+        output.append(f"   Total PSS: {usage['total_pss'] / mb:,.1f} MB   (RSS summed: {usage['total_rss'] / mb:,.1f} MB)")
+        return "\n".join(output)
+
+    def shutdown(self):
+        """Stop the workers after the tasks already queued"""
+        for _ in self._workers:
+            self._tasks.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+        if self.start_method == "fork":
+            gc.unfreeze()
+
+    def __enter__(self) -> 'PreforkPool':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    from document_generator import DischargeDocumentGenerator
+
+    documents = DischargeDocumentGenerator(seed=5).generate_corpus(400, target_bytes=4096)
+
+    print("Testing Pre-forked Worker Pool\n")
+    for start_method in ("fork", "spawn"):
+        with PreforkPool(max_workers=4, start_method=start_method) as pool:
+            summaries = pool.process_batch(documents)
+            print(f"{len(summaries)} summaries processed")
+            print(pool.format_memory_report())
+            print()
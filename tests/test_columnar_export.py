@@ -0,0 +1,47 @@
+"""Tests for the columnar batch tables"""
+
+import numpy as np
+import pytest
+
+from columnar_export import BatchTableBuilder, BatchTables
+from document_generator import DischargeDocumentGenerator
+from pipeline import BoomerHealthPipeline
+
+
+@pytest.fixture(scope="module")
+def documents():
+    return DischargeDocumentGenerator(seed=7).generate_corpus(12, target_bytes=2048)
+
+
+def assert_same_tables(left: BatchTables, right: BatchTables, skip=()):
+    assert left.table_names == right.table_names
+    for table in left.table_names:
+        for column, values in left.arrays[table].items():
+            if column in skip:
+                continue
+            other = right.arrays[table][column]
+            if values.dtype == object:
+                assert list(values) == list(other), (table, column)
+            else:
+                np.testing.assert_array_equal(values, other, err_msg=f"{table}.{column}")
+
+
+def test_builder_matches_from_summaries_in_any_order(documents):
+    summaries = BoomerHealthPipeline(verbose=False).process_batch(documents, max_workers=1)
+    builder = BatchTableBuilder()
+    for index in reversed(range(len(summaries))):
+        builder.add(index, summaries[index])
+    assert_same_tables(builder.build(), BatchTables.from_summaries(summaries))
+
+
+def test_columnar_batch_streams_the_same_tables(documents):
+    streamed = BoomerHealthPipeline(verbose=False).process_batch(documents, max_workers=4, columnar=True)
+    summaries = BoomerHealthPipeline(verbose=False).process_batch(documents, max_workers=1)
+    # summary IDs follow completion order on the thread pool
+    assert_same_tables(streamed, BatchTables.from_summaries(summaries), skip={'summary_id'})
+    assert sorted(streamed.arrays['documents']['summary_id']) == list(range(len(documents)))
+
+
+def test_empty_batch():
+    tables = BoomerHealthPipeline(verbose=False).process_batch([], columnar=True)
+    assert all(len(tables.frame(table)) == 0 for table in tables.table_names)
@@ -0,0 +1,53 @@
+"""Tests for Agent 1's negation / resolution / family-history / conditional scoping"""
+
+import time
+
+import pytest
+
+from agent1_extractor import MedicalExtractor
+
+
+@pytest.fixture(scope="module")
+def extractor():
+    return MedicalExtractor()
+
+
+def scope_of(extractor, text):
+    diagnoses, symptoms, scoped = extractor.extract_findings(text.lower())
+    return diagnoses, symptoms, {finding.finding: finding.context for finding in scoped}
+
+
+def test_negation_covers_a_list(extractor):
+    _, symptoms, scoped = scope_of(extractor, "Patient denies fever, chills or cough.")
+    assert symptoms == []
+    assert scoped == {'Fever': 'negated', 'Cough': 'negated'}
+
+
+def test_terminator_ends_the_scope(extractor):
+    _, symptoms, scoped = scope_of(extractor, "Denies fever but has cough")
+    assert symptoms == ['Cough']
+    assert scoped == {'Fever': 'negated'}
+
+
+def test_resolved_and_family_history(extractor):
+    diagnoses, symptoms, scoped = scope_of(
+        extractor, "Shortness of breath resolved. Has cough. Family history of diabetes. Diagnosis: Hypertension")
+    assert diagnoses == ['Hypertension']
+    assert symptoms == ['Cough']
+    assert scoped == {'Shortness Of Breath': 'resolved', 'Diabetes': 'family_history'}
+
+
+def test_cue_past_the_window_does_not_apply(extractor):
+    _, symptoms, scoped = scope_of(extractor, "fever " + "x x x x x x absent " * 3)
+    assert symptoms == ['Fever']
+    assert scoped == {}
+
+
+def test_lapsed_after_cues_scan_in_linear_time(extractor):
+    # Each "absent" lies past the window; re-measuring the gap back to "fever"
+    # made this quadratic (about 17 s at this size)
+    text = ("fever " + "x x x x x x absent " * 16000).lower()
+    started = time.perf_counter()
+    _, symptoms, _ = extractor.extract_findings(text)
+    assert time.perf_counter() - started < 1.0
+    assert symptoms == ['Fever']
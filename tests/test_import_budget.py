@@ -0,0 +1,15 @@
+"""Cold-start budget: a fresh interpreter importing the pipeline stays cheap"""
+
+from benchmark import IMPORT_BUDGET_MS, measure_cold_start
+
+
+def test_import_pipeline_within_budget():
+    # Each run is a new subprocess, so nothing is already imported
+    cold = measure_cold_start(runs=5)
+    assert cold['best_ms'] <= IMPORT_BUDGET_MS, (
+        f"import pipeline + BoomerHealthPipeline() took {cold['best_ms']:.1f} ms "
+        f"(budget {IMPORT_BUDGET_MS:.1f} ms)")
+
+
+def test_agents_are_not_imported_at_startup():
+    assert measure_cold_start(runs=1)['eager_modules'] == []
@@ -0,0 +1,46 @@
+"""Tests for the memory-mapped note corpus"""
+
+import os
+
+import pytest
+
+from mapped_corpus import MappedCorpus, ids_path, index_path, write_corpus
+
+
+def test_documents_and_ids_read_back_by_position(tmp_path):
+    path = str(tmp_path / "notes.corpus")
+    notes = [("a-1", "BP 152/94"), ("b\n2", ""), ("c-3", "Metformin 500mg – twice daily")]
+    assert write_corpus(notes, path, buffer_rows=2) == 3
+
+    with MappedCorpus(path) as corpus:
+        assert list(corpus) == ["BP 152/94", "", "Metformin 500mg – twice daily"]
+        assert list(corpus.iter_note_ids()) == ["a-1", "b 2", "c-3"]
+        assert list(corpus.iter_note_ids(1)) == ["b 2", "c-3"]
+        assert corpus.note_id(2) == corpus.note_id(-1) == "c-3"
+
+
+def test_corpus_without_ids_numbers_rows(tmp_path):
+    path = str(tmp_path / "notes.corpus")
+    write_corpus([("old", "x")], path)
+    write_corpus(["first", "second"], path)
+    assert not os.path.exists(ids_path(path))
+    with MappedCorpus(path) as corpus:
+        assert list(corpus.iter_note_ids()) == ["0", "1"]
+        assert corpus.note_id(1) == "1"
+
+
+def test_ids_file_without_index_is_streamed(tmp_path):
+    path = str(tmp_path / "notes.corpus")
+    write_corpus([("a", "x"), ("b", "y")], path)
+    os.remove(index_path(ids_path(path)))
+    with MappedCorpus(path) as corpus:
+        assert list(corpus.iter_note_ids()) == ["a", "b"]
+        assert corpus.note_id(1) == "b"
+
+
+@pytest.mark.parametrize("documents", [["text", ("id", "text")], [("id", "text"), "text"]])
+def test_mixed_documents_and_pairs_are_rejected(tmp_path, documents):
+    path = str(tmp_path / "notes.corpus")
+    with pytest.raises(ValueError):
+        write_corpus(documents, path)
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,62 @@
+"""Tests for the longitudinal patient record store"""
+
+import pytest
+
+from patient_store import PatientRecordStore, stopped_medications
+
+MEDS = ['lisinopril', 'metformin', 'aspirin', 'warfarin']
+
+
+@pytest.mark.parametrize("instruction, stopped", [
+    ("Stop aspirin; continue metformin", ['aspirin']),
+    ("Stop taking aspirin and warfarin.", ['aspirin', 'warfarin']),
+    ("Discontinue warfarin until your procedure", ['warfarin']),
+    ("Discontinued aspirin.", ['aspirin']),
+    ("Aspirin discontinued, continue metformin", ['aspirin']),
+    ("Aspirin was stopped", ['aspirin']),
+    ("Stopped warfarin", ['warfarin']),
+    ("No longer take aspirin", ['aspirin']),
+    ("You no longer need to take aspirin", ['aspirin']),
+    ("Take lisinopril daily, aspirin discontinued", ['aspirin']),
+])
+def test_stop_instructions(instruction, stopped):
+    assert stopped_medications(instruction, MEDS) == stopped
+
+
+@pytest.mark.parametrize("instruction", [
+    "Do not stop taking lisinopril or metformin without talking to your doctor",
+    "Don't suddenly stop metformin",
+    "Never stop lisinopril",
+    "Aspirin should not be stopped",
+    "If you stop metformin call us",
+    "Talk to your doctor before you stop aspirin",
+])
+def test_negated_and_conditional_stops_stop_nothing(instruction):
+    assert stopped_medications(instruction, MEDS) == []
+
+
+def test_keep_taking_instruction_leaves_medications_active():
+    store = PatientRecordStore()
+    store.add_extraction('p1', {
+        'medications': [{'name': 'Lisinopril', 'dosage': '10mg'}, {'name': 'Metformin', 'dosage': '500mg'}],
+        'instructions': ["Do not stop taking lisinopril or metformin without talking to your doctor"]
+    })
+    assert [med['name'] for med in store.current_medications('p1')] == ['Lisinopril', 'Metformin']
+
+
+def test_discontinued_medication_leaves_the_active_list():
+    store = PatientRecordStore()
+    store.add_extraction('p1', {'medications': [{'name': 'Aspirin', 'dosage': '81mg'},
+                                                {'name': 'Metformin', 'dosage': '500mg'}]},
+                         recorded_at="2025-10-01")
+    store.add_extraction('p1', {'instructions': ["Aspirin discontinued. Continue metformin."]},
+                         recorded_at="2025-11-01")
+    assert [med['name'] for med in store.current_medications('p1')] == ['Metformin']
+
+
+def test_dose_change_is_tracked():
+    store = PatientRecordStore()
+    store.add_extraction('p1', {'medications': [{'name': 'Lisinopril', 'dosage': '10mg'}]}, recorded_at="2025-10-01")
+    store.add_extraction('p1', {'medications': [{'name': 'Lisinopril', 'dosage': '20mg'}]}, recorded_at="2025-11-01")
+    assert store.current_medications('p1')[0]['dosage'] == '20mg'
+    assert len(store.dose_history('p1', 'Lisinopril')) == 1
@@ -0,0 +1,54 @@
+"""Tests for the pipeline's feedback history"""
+
+import pytest
+
+from pipeline import BoomerHealthPipeline
+
+NOTE = "Diagnosis: Hypertension. Lisinopril 10mg daily. Follow up in 4 weeks."
+RATING = {'clarity': 5, 'helpfulness': 4, 'completeness': 3}
+
+
+def test_history_is_bounded_and_ids_keep_counting():
+    pipeline = BoomerHealthPipeline(verbose=False, history_limit=3)
+    ids = [pipeline.process_document(NOTE)['metadata']['summary_id'] for _ in range(5)]
+    assert ids == [0, 1, 2, 3, 4]
+    assert len(pipeline.processing_history) == 3
+    assert pipeline.collect_feedback(1, RATING) is None  # expired
+    assert pipeline.collect_feedback(4, RATING) == 4.2
+    assert pipeline.processing_history[-1]['summary']['metadata']['summary_id'] == 4
+    assert pipeline.processing_history[-1]['reward'] == 4.2
+
+
+def test_clear_history_never_reuses_ids():
+    pipeline = BoomerHealthPipeline(verbose=False)
+    first = pipeline.process_document(NOTE)['metadata']['summary_id']
+    pipeline.clear_history()
+    second = pipeline.process_document(NOTE)['metadata']['summary_id']
+    assert (first, second) == (0, 1)
+    assert pipeline.collect_feedback(first, RATING) is None
+    assert pipeline.collect_feedback(second, RATING) is not None
+
+
+def test_history_can_be_turned_off():
+    pipeline = BoomerHealthPipeline(verbose=False, history_limit=0)
+    ids = [pipeline.process_document(NOTE)['metadata']['summary_id'] for _ in range(3)]
+    assert ids == [0, 1, 2] and not pipeline.processing_history
+
+
+def test_rating_a_summary_again_replaces_the_first_rating():
+    from feedback_store import FeedbackStore
+
+    store = FeedbackStore()
+    pipeline = BoomerHealthPipeline(verbose=False, feedback_store=store)
+    summary = pipeline.process_document(NOTE)
+    summary_id = summary['metadata']['summary_id']
+    other = pipeline.process_document(NOTE)['metadata']['summary_id']
+
+    assert pipeline.collect_feedback(summary_id, {'clarity': 1, 'helpfulness': 1, 'completeness': 1}) == 1.0
+    assert pipeline.collect_feedback(other, RATING) == 4.2
+    assert pipeline.collect_feedback(summary_id, {'clarity': 5, 'helpfulness': 5, 'completeness': 5}) == 5.0
+
+    stats = store.stats('diagnosis', 'hypertension')
+    assert stats['count'] == 2
+    assert stats['mean'] == pytest.approx((5.0 + 4.2) / 2)
+    assert pipeline.processing_history[0]['reward'] == 5.0
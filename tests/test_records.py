@@ -0,0 +1,25 @@
+"""Tests for the slotted records passed between agents"""
+
+import pickle
+
+import records
+from records import ActionPlan, Extraction, Medication
+
+
+def test_records_are_slotted_without_instance_dicts():
+    med = Medication("Lisinopril", "20mg")
+    assert Medication.__slots__ == ('name', 'dosage', 'span')
+    assert not hasattr(med, '__dict__')
+    assert med.span is None and med['dosage'] == "20mg" and med.get('missing', 1) == 1
+
+
+def test_defaults_and_round_trips():
+    plan = ActionPlan([], [], [], [], [], [], "You've got this")
+    assert plan.medication_interactions == [] and plan.medication_interactions is not \
+        ActionPlan([], [], [], [], [], [], "").medication_interactions
+    extraction = Extraction("text", ["Hypertension"], [Medication("Lisinopril", "20mg", [0, 10])], [], [], [],
+                            [records.TestResult("BP", "140/90")], [], "preview")
+    data = extraction.to_dict()
+    assert 'pages' not in data and 'span' not in data['test_results'][0]
+    assert Extraction.from_dict(data) == extraction
+    assert pickle.loads(pickle.dumps(extraction)) == extraction
@@ -0,0 +1,32 @@
+"""Tests for the priority scheduler"""
+
+from pipeline import BoomerHealthPipeline
+from scheduler import PriorityScheduler
+
+URGENT = "Mom has severe chest pain and is confused. She takes Lisinopril 20mg."
+ROUTINE = "After-visit note. Diagnosis: Hypertension. Lisinopril 10mg daily."
+
+
+def test_classify_triage_is_not_repeated_by_the_worker():
+    pipeline = BoomerHealthPipeline(verbose=False)
+    scans = []
+    scan = pipeline.triage
+    pipeline.triage = lambda text: scans.append(text) or scan(text)
+
+    with PriorityScheduler(pipeline, max_workers=1) as scheduler:
+        urgent = scheduler.submit(URGENT).result()
+        routine = scheduler.submit(ROUTINE).result()
+    assert scans == [URGENT, ROUTINE]
+    assert urgent['metadata']['priority'] == 'urgent' and urgent['triage']['urgent']
+    assert routine['metadata']['priority'] == 'routine' and not routine['triage']['urgent']
+
+
+def test_deadline_reaches_the_pipeline():
+    pipeline = BoomerHealthPipeline(verbose=False)
+    calls = []
+    process = pipeline.process_document
+    pipeline.process_document = lambda text, **options: calls.append(options) or process(text, **options)
+
+    with PriorityScheduler(pipeline, max_workers=1) as scheduler:
+        scheduler.process(ROUTINE, priority='routine', deadline=5.0)
+    assert calls[0]['deadline'] == 5.0 and calls[0]['triage'] is None
@@ -0,0 +1,23 @@
+"""Latency ceiling for triage + extraction on pathological inputs"""
+
+import gc
+
+from benchmark import STRESS_CEILING_MS, build_stress_corpus, measure_stress
+
+
+def test_stress_corpus_p999_within_ceiling():
+    # Objects left by earlier test modules would otherwise slow every full collection
+    gc.collect()
+    gc.freeze()
+    try:
+        stats = measure_stress(samples=1000)
+    finally:
+        gc.unfreeze()
+    slowest = sorted(stats['worst'].items(), key=lambda item: -item[1])[:3]
+    assert stats['p999_ms'] <= STRESS_CEILING_MS, (
+        f"p99.9 {stats['p999_ms']:.1f} ms over {STRESS_CEILING_MS:.1f} ms; slowest cases: {slowest}")
+
+
+def test_stress_corpus_inputs_are_full_size():
+    corpus = build_stress_corpus(4096)
+    assert all(len(text) >= 4000 for text in corpus.values())
@@ -0,0 +1,80 @@
+"""Tests for the content-addressed summary cache"""
+
+from pipeline import BoomerHealthPipeline
+from summary_cache import SummaryCache, normalize_document
+
+WATCH_LIST = "Discharge note.\nWatch for signs of:\n- Pneumonia\n- Chest pain"
+WATCH_LIST_WITH_BREAK = "Discharge note.\nWatch for signs of:\n\n- Pneumonia\n- Chest pain"
+
+
+def test_blank_line_changes_the_extraction_key():
+    # A blank line ends a "watch for" scope, so the two extract differently
+    cache = SummaryCache()
+    assert (cache.extraction_key(WATCH_LIST, "free_text")
+            != cache.extraction_key(WATCH_LIST_WITH_BREAK, "free_text"))
+
+
+def test_runs_of_blank_lines_and_spaces_still_share_a_key():
+    cache = SummaryCache()
+    retyped = "  Discharge   note.\nWatch for signs of:\n \n\n\t\n- Pneumonia\n- Chest  pain\n\n"
+    assert normalize_document(retyped) == normalize_document(WATCH_LIST_WITH_BREAK)
+    assert cache.extraction_key(retyped, "free_text") == cache.extraction_key(WATCH_LIST_WITH_BREAK, "free_text")
+
+
+def test_cached_pipeline_matches_uncached_across_a_blank_line():
+    cached = BoomerHealthPipeline(cache=SummaryCache(), verbose=False)
+    uncached = BoomerHealthPipeline(verbose=False)
+    for text in (WATCH_LIST, WATCH_LIST_WITH_BREAK):
+        assert (cached.process_document(text)['section_1_diagnoses']['diagnoses']
+                == uncached.process_document(text)['section_1_diagnoses']['diagnoses'])
+
+
+def test_round_trip_and_lru_bound():
+    cache = SummaryCache(max_memory_entries=2)
+    for key in ('a', 'b', 'c'):
+        cache.put('extraction', key, {'diagnoses': [key]})
+    assert cache.get('extraction', 'a') is None
+    assert cache.get('extraction', 'c') == {'diagnoses': ['c']}
+    assert cache.stats['extraction'] == {'memory_hits': 1, 'disk_hits': 0, 'misses': 1}
+
+
+def test_disk_tier_survives_a_new_instance_and_stays_in_budget(tmp_path):
+    cache = SummaryCache(max_memory_entries=1, cache_dir=str(tmp_path), max_disk_bytes=200)
+    for index in range(10):
+        cache.put('explanation', f"k{index}", {'text': "x" * 40, 'index': index})
+    reopened = SummaryCache(cache_dir=str(tmp_path), max_disk_bytes=200)
+    assert reopened.get('explanation', 'k9') == {'text': "x" * 40, 'index': 9}
+    assert reopened.get('explanation', 'k0') is None
+    assert reopened._disk_bytes <= 200
+
+
+def test_repeat_document_skips_every_agent():
+    cache = SummaryCache()
+    pipeline = BoomerHealthPipeline(cache=cache, verbose=False)
+    document = "Diagnosis: Hypertension. Lisinopril 10mg daily. BP: 140/90"
+    first = pipeline.process_document(document)
+    second = pipeline.process_document("Diagnosis:  Hypertension.   Lisinopril 10mg daily. BP: 140/90 ")
+    assert second['section_2_medications'] == first['section_2_medications']
+    assert cache.hit_rates() == {'extraction': 0.5, 'triage': 0.0, 'explanation': 0.5, 'action_plan': 0.5}
+
+
+def test_different_document_with_same_findings_reuses_agents_2_and_3():
+    cache = SummaryCache()
+    pipeline = BoomerHealthPipeline(cache=cache, verbose=False)
+    pipeline.process_document("Diagnosis: Hypertension. Lisinopril 10mg daily. BP: 140/90")
+    pipeline.process_document("Lisinopril 10mg daily.\nBP: 140/90\nDiagnosis: Hypertension")
+    assert cache.stats['extraction']['misses'] == 2
+    assert cache.stats['explanation']['memory_hits'] == 1
+    assert cache.stats['action_plan']['memory_hits'] == 1
+
+
+def test_cached_spans_point_into_the_retyped_copy():
+    cache = SummaryCache()
+    pipeline = BoomerHealthPipeline(cache=cache, verbose=False)
+    pipeline.process_document("Diagnosis: Hypertension\nLisinopril 10mg daily")
+    retyped = "Diagnosis:   Hypertension\n   Lisinopril   10mg daily"
+    extraction = pipeline._run_cached_stage('extraction', lambda: cache.extraction_key(retyped, "free_text"),
+                                            lambda: None, document_text=retyped)
+    start, end = extraction.medications[0].span
+    assert retyped[start:end] == "Lisinopril"
+    assert extraction.raw_text_preview == retyped
@@ -0,0 +1,57 @@
+"""Tests for the summary codec and its checked-in default"""
+
+import json
+
+import pytest
+
+import summary_codec
+from pipeline import BoomerHealthPipeline
+from summary_codec import (DEFAULT_VERSION, SummaryCodec, blob_version, codec_path, decode,
+                           default_codec)
+
+
+@pytest.fixture(scope="module")
+def summary():
+    return BoomerHealthPipeline(verbose=False).process_document(
+        "Diagnosis: Type 2 Diabetes. HbA1c: 8.2. Metformin 500mg twice daily. Follow up in 3 months.")
+
+
+def test_default_codec_is_the_checked_in_version(summary):
+    codec = default_codec()
+    assert codec.version == DEFAULT_VERSION
+    with open(codec_path(DEFAULT_VERSION), encoding='utf-8') as f:
+        assert json.loads(f.read())['version'] == DEFAULT_VERSION
+    blob = codec.encode(summary)
+    assert blob_version(blob) == DEFAULT_VERSION
+    assert decode(blob) == json.loads(json.dumps(summary))
+
+
+def test_definition_round_trip_keeps_the_version(summary):
+    codec = SummaryCodec.train([summary], version="test-1")
+    copy = SummaryCodec.from_json(codec.to_json())
+    assert copy.version == "test-1"
+    assert decode(codec.encode(summary), {copy.version: copy}) == json.loads(json.dumps(summary))
+
+
+def test_unnamed_definition_falls_back_to_the_hash(summary):
+    codec = SummaryCodec.train([summary])
+    legacy = json.loads(codec.to_json())
+    del legacy['version']
+    copy = SummaryCodec.from_json(json.dumps(legacy))
+    assert copy.version == codec.version
+    assert len(copy.version) == summary_codec.VERSION_LENGTH
+    assert decode(codec.encode(summary), {copy.version: copy}) == json.loads(json.dumps(summary))
+
+
+def test_unknown_version_raises_key_error(summary):
+    blob = SummaryCodec([], version="nowhere").encode(summary)
+    with pytest.raises(KeyError):
+        decode(blob)
+    with pytest.raises(ValueError):
+        decode(b"not a summary")
+
+
+@pytest.mark.parametrize("version", ["", " v1", "x" * 17, "vé"])
+def test_bad_versions_are_rejected(version):
+    with pytest.raises(ValueError):
+        SummaryCodec([], version=version)
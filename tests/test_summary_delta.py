@@ -0,0 +1,71 @@
+"""Tests for repeat-visit summary deltas"""
+
+import pytest
+
+from pipeline import BoomerHealthPipeline
+from summary_delta import apply_delta, describe_changes, diff_summaries, encoded_size
+
+
+@pytest.fixture(scope="module")
+def pipeline():
+    return BoomerHealthPipeline(verbose=False)
+
+
+def test_round_trip_and_smaller_than_full(pipeline):
+    first = pipeline.process_document(
+        "Diagnosis: Hypertension. BP: 152/94. Lisinopril 10mg daily. Follow up in 4 weeks.")
+    second = pipeline.process_document(
+        "Diagnosis: Hypertension. BP: 138/86. Lisinopril 20mg daily. Follow up in 3 months.")
+    delta = diff_summaries(first, second)
+    assert apply_delta(first, delta) == second
+    assert encoded_size(delta) < encoded_size(second)
+    assert describe_changes(first, delta) == [
+        "Blood Pressure: 152/94 → 138/86",
+        "Lisinopril: dose changed from 10mg to 20mg",
+        "New follow-up: Follow up in 3 months",
+    ]
+
+
+def test_apply_does_not_modify_the_previous_summary():
+    previous = {'a': {'items': [{'test': 'BP', 'your_value': '1'}]}}
+    current = {'a': {'items': [{'test': 'BP', 'your_value': '2'}]}}
+    apply_delta(previous, diff_summaries(previous, current))
+    assert previous['a']['items'][0]['your_value'] == '1'
+
+
+def test_repeated_test_readings_are_reported(pipeline):
+    # Two Blood Pressure items cannot be keyed, so the list is replaced whole
+    first = pipeline.process_document("Diagnosis: Hypertension. BP: 152/94. BP: 150/92. Lisinopril 10mg daily.")
+    second = pipeline.process_document("Diagnosis: Hypertension. BP: 138/86. BP: 136/84. Lisinopril 10mg daily.")
+    delta = diff_summaries(first, second)
+    assert 'test_results' in delta['sub']['section_1_diagnoses']['set']
+    assert apply_delta(first, delta) == second
+    assert describe_changes(first, delta) == ["Blood Pressure: 152/94, 150/92 → 138/86, 136/84"]
+
+
+def test_repeated_medication_names_are_reported():
+    first = {'section_2_medications': {'medications': [
+        {'medication': 'Insulin', 'dosage': '10 units'}, {'medication': 'Insulin', 'dosage': '5 units'},
+        {'medication': 'Aspirin', 'dosage': '81mg'}]}}
+    second = {'section_2_medications': {'medications': [
+        {'medication': 'Insulin', 'dosage': '12 units'}, {'medication': 'Insulin', 'dosage': '5 units'},
+        {'medication': 'Metformin', 'dosage': '500mg'}]}}
+    assert describe_changes(first, diff_summaries(first, second)) == [
+        "Insulin: dose changed from 10 units, 5 units to 12 units, 5 units",
+        "New medication: Metformin 500mg",
+        "Medication no longer listed: Aspirin",
+    ]
+
+
+def test_patient_store_rebuilds_every_visit():
+    from patient_store import FULL_SUMMARY_INTERVAL, PatientRecordStore
+
+    pipeline = BoomerHealthPipeline(records=PatientRecordStore(), verbose=False)
+    summaries = [pipeline.process_document(f"Diagnosis: Hypertension. BP: {130 + visit}/85. Lisinopril 10mg daily.",
+                                           patient_id='p1')
+                 for visit in range(FULL_SUMMARY_INTERVAL + 2)]
+    for summary in summaries:
+        stored = pipeline.records.load_summary('p1', summary['metadata']['visit'])
+        # metadata gains visit / summary_id after the summary is stored
+        assert {k: v for k, v in stored.items() if k != 'metadata'} == \
+            {k: v for k, v in summary.items() if k != 'metadata'}
@@ -0,0 +1,43 @@
+"""Tests for the emergency pre-scan"""
+
+import pytest
+
+from triage import TriageScanner
+
+
+@pytest.fixture(scope="module")
+def scanner():
+    return TriageScanner()
+
+
+@pytest.mark.parametrize("text, finding", [
+    ("He is not breathing", "not breathing"),
+    ("Mom isn't breathing!", "isn't breathing"),
+    ("he isnt breathing right now", "isn't breathing"),
+    ("My husband stopped breathing", "stopped breathing"),
+    ("She is no longer breathing", "no longer breathing"),
+    ("Patient not breathing, no pulse", "not breathing"),
+])
+def test_not_breathing_is_urgent(scanner, text, finding):
+    result = scanner.scan(text)
+    assert result.urgent
+    assert result.findings == [finding] and result.categories == ['breathing']
+
+
+@pytest.mark.parametrize("text", [
+    "Call 911 if he stops breathing or is not breathing",
+    "SEEK EMERGENCY CARE (CALL 911) IF:\n- Not breathing\n- Severe chest pain",
+    "No fever. Not eating well.",
+])
+def test_instructions_and_plain_negations_stay_clear(scanner, text):
+    assert not scanner.scan(text).urgent
+
+
+@pytest.mark.parametrize("text, urgent", [
+    ("Denies severe chest pain, fainting or confusion.", False),
+    ("Call 911 if you have severe chest pain, confusion, or fainting.", False),
+    ("He has no appetite and severe chest pain right now", True),
+    ("Patient is not eating, confused and has slurred speech", True),
+])
+def test_cue_scope(scanner, text, urgent):
+    assert scanner.scan(text).urgent is urgent